@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+mide el tiempo de la api publica de chibi_git sobre repos sinteticos
+
+todo se ejecuta local sin red, el resultado se guarda como json para
+comparar entre versiones
+
+    python -m benchmarks.run --commits 5000 --output bench.json
+    python -m benchmarks.run --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import chibi_git
+from chibi.file import Chibi_path
+from chibi_git import Git, Tracer
+
+from benchmarks.synthetic import build_repo
+
+
+def bench_log( repo ):
+    list( repo.log() )
+
+
+def bench_log_with_info( repo ):
+    list( repo.log( with_info=True ) )
+
+
+def bench_commit_info( repo, limit=200 ):
+    for i, commit in enumerate( repo.log() ):
+        if i >= limit:
+            break
+        commit.info
+
+
+def bench_status( repo ):
+    repo.status
+
+
+def bench_is_dirty( repo ):
+    repo.is_dirty
+
+
+def bench_branches_local( repo ):
+    for branch in repo.branches.local:
+        branch.commit
+
+
+def bench_tags( repo ):
+    for tag in repo.tags:
+        tag.commit
+
+
+def bench_remote( repo ):
+    for remote in repo.remote:
+        remote.url
+
+
+def bench_add( repo, files ):
+    repo.add( files )
+
+
+BENCHMARKS = {
+    'log': bench_log,
+    'log_with_info': bench_log_with_info,
+    'commit_info': bench_commit_info,
+    'status': bench_status,
+    'is_dirty': bench_is_dirty,
+    'branches_local': bench_branches_local,
+    'tags': bench_tags,
+    'remote': bench_remote,
+}
+
+
+def measure( function, repeat, teardown=None ):
+    """
+    ejecuta la funcion `repeat` veces y regresa las estadisticas de los
+    tiempos en segundos, `teardown` se ejecuta despues de cada vez sin
+    medirse
+    """
+    times = []
+    for i in range( repeat ):
+        start = time.perf_counter()
+        function()
+        times.append( time.perf_counter() - start )
+        if teardown is not None:
+            teardown()
+    return {
+        'runs': repeat, 'min': min( times ),
+        'median': statistics.median( times ),
+        'mean': statistics.fmean( times ),
+    }
+
+
+def spawns( function, teardown=None ):
+    """
+    numero de procesos de git que crea la funcion
+    """
+    with Tracer() as tracer:
+        function()
+    if teardown is not None:
+        teardown()
+    return len( tracer.records )
+
+
+def run_benchmarks( path, repeat=5, only=None ):
+    """
+    mide cada benchmark en frio ( un `Git` nuevo en cada ejecucion ) y en
+    caliente ( el mismo `Git` con sus caches )
+
+    Returns
+    -------
+    dict
+    """
+    results = {}
+    path = Chibi_path( str( path ) )
+    for name, function in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        warm_repo = Git( path )
+        function( warm_repo )
+        results[ name ] = {
+            'cold': measure( lambda: function( Git( path ) ), repeat ),
+            'warm': measure( lambda: function( warm_repo ), repeat ),
+            'spawns': spawns( lambda: function( Git( path ) ) ),
+        }
+    if not only or 'add' in only:
+        results[ 'add' ] = _run_add( path, repeat )
+    return results
+
+
+def _run_add( path, repeat, amount=200 ):
+    directory = os.path.join( str( path ), 'bench_add' )
+    os.makedirs( directory, exist_ok=True )
+    files = []
+    for i in range( amount ):
+        name = os.path.join( directory, f'file_{i}.txt' )
+        with open( name, 'w' ) as f:
+            f.write( f'{i}\n' )
+        files.append( Chibi_path( name ) )
+    repo = Git( path )
+    result = {
+        'cold': measure(
+            lambda: bench_add( repo, files ), repeat, teardown=repo.reset ),
+        'spawns': spawns(
+            lambda: bench_add( repo, files ), teardown=repo.reset ),
+    }
+    shutil.rmtree( directory )
+    return result
+
+
+def metadata( options ):
+    git = subprocess.run(
+        [ 'git', '--version' ], capture_output=True, text=True ).stdout
+    return {
+        'chibi_git': chibi_git.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'git': git.strip(),
+        'time': time.strftime( '%Y-%m-%dT%H:%M:%S' ),
+        'repo': {
+            'commits': options.commits, 'files': options.files,
+            'branches': options.branches, 'tags': options.tags,
+            'remotes': options.remotes, 'dirty_files': options.dirty_files,
+        },
+        'repeat': options.repeat,
+    }
+
+
+def compare( previous, current ):
+    """
+    regresa las lineas con el cambio de la mediana de cada benchmark
+    contra un resultado anterior
+    """
+    lines = []
+    for name, result in current[ 'results' ].items():
+        before = previous[ 'results' ].get( name )
+        if before is None:
+            continue
+        for mode in ( 'cold', 'warm' ):
+            if mode not in result or mode not in before:
+                continue
+            ratio = result[ mode ][ 'median' ] / before[ mode ][ 'median' ]
+            lines.append( f'{name:16} {mode:5} {ratio:6.2f}x' )
+    return lines
+
+
+def parse_args( argv=None ):
+    parser = argparse.ArgumentParser(
+        description='benchmarks de chibi_git sobre repos sinteticos' )
+    parser.add_argument( '--commits', type=int, default=2000 )
+    parser.add_argument( '--files', type=int, default=500 )
+    parser.add_argument( '--branches', type=int, default=50 )
+    parser.add_argument( '--tags', type=int, default=200 )
+    parser.add_argument( '--remotes', type=int, default=3 )
+    parser.add_argument( '--dirty-files', type=int, default=50 )
+    parser.add_argument( '--repeat', type=int, default=5 )
+    parser.add_argument(
+        '--only', nargs='*', help='nombres de los benchmarks a ejecutar' )
+    parser.add_argument(
+        '--output', help='archivo json donde se guardan los resultados' )
+    parser.add_argument(
+        '--compare', help='json de una ejecucion anterior para comparar' )
+    parser.add_argument(
+        '--keep', help='directorio donde se crea el repo y no se borra' )
+    return parser.parse_args( argv )
+
+
+def main( argv=None ):
+    options = parse_args( argv )
+    path = options.keep or tempfile.mkdtemp( prefix='chibi_git_bench_' )
+    try:
+        build_repo(
+            path, commits=options.commits, files=options.files,
+            branches=options.branches, tags=options.tags,
+            remotes=options.remotes, dirty_files=options.dirty_files )
+        result = {
+            'meta': metadata( options ),
+            'results': run_benchmarks(
+                path, repeat=options.repeat, only=options.only ),
+        }
+    finally:
+        if not options.keep:
+            shutil.rmtree( path, ignore_errors=True )
+
+    output = json.dumps( result, indent=2 )
+    if options.output:
+        with open( options.output, 'w' ) as f:
+            f.write( output )
+    else:
+        print( output )
+    if options.compare:
+        with open( options.compare ) as f:
+            previous = json.load( f )
+        print( '\n'.join( compare( previous, result ) ), file=sys.stderr )
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+import os
+
+from chibi.file import Chibi_path
+
+from chibi_git import Git
+from chibi_git.command import Git as Git_command
+
+
+EPOCH = 1700000000
+
+
+def fast_import_stream(
+        commits=1000, files=100, branches=10, tags=50,
+        annotated_tags=False ):
+    """
+    genera el stream de `git fast-import` de un repo sintetico, el
+    resultado siempre es el mismo para los mismos parametros por lo que
+    los hash de los commits son reproducibles
+
+    cada commit modifica un archivo, el primero agrega todos, las ramas y
+    tags se reparten a lo largo de la historia
+    """
+    lines = []
+
+    def blob( content ):
+        content = content.encode()
+        lines.append( f'data {len( content )}' )
+        lines.append( content.decode() )
+
+    for i in range( commits ):
+        lines.append( 'commit refs/heads/master' )
+        lines.append( f'mark :{i + 1}' )
+        author = f'author{i % 7} <author{i % 7}@example.com>'
+        lines.append( f'author {author} {EPOCH + i * 60} +0000' )
+        lines.append( f'committer {author} {EPOCH + i * 60} +0000' )
+        blob( f'commit {i}\n\nmensaje del commit {i}\n' )
+        if i:
+            lines.append( f'from :{i}' )
+            changed = [ i % files ]
+        else:
+            changed = range( files )
+        for f in changed:
+            lines.append( f'M 100644 inline dir_{f % 10}/file_{f}.txt' )
+            blob( f'archivo {f} version {i}\n' )
+    for i in range( branches ):
+        mark = max( commits - i * max( commits // max( branches, 1 ), 1 ), 1 )
+        lines.append( f'reset refs/heads/branch_{i}' )
+        lines.append( f'from :{mark}' )
+    for i in range( tags ):
+        mark = max( commits * ( i + 1 ) // max( tags, 1 ), 1 )
+        if annotated_tags and i % 2:
+            lines.append( f'tag v0.{i}.0' )
+            lines.append( f'from :{mark}' )
+            lines.append(
+                f'tagger tagger <tagger@example.com> {EPOCH + mark} +0000' )
+            blob( f'release v0.{i}.0\n' )
+        else:
+            lines.append( f'reset refs/tags/v0.{i}.0' )
+            lines.append( f'from :{mark}' )
+    lines.append( '' )
+    return '\n'.join( lines )
+
+
+def build_repo(
+        path, commits=1000, files=100, branches=10, tags=50,
+        annotated_tags=True, remotes=3, dirty_files=0 ):
+    """
+    crea un repo sintetico sin usar la red
+
+    Parameters
+    ----------
+    path: str
+        directorio vacio donde se creara el repo
+    commits: int
+    files: int
+        archivos seguidos en el work tree
+    branches: int
+    tags: int
+    annotated_tags: bool
+        si la mitad de los tags son anotados
+    remotes: int
+        remotos falsos en `.git/config`
+    dirty_files: int
+        archivos sin seguimiento y modificados para el status
+
+    Returns
+    -------
+    chibi_git.Git
+    """
+    path = str( path )
+    repo = Git( Chibi_path( path ) )
+    repo.init()
+    stream = fast_import_stream(
+        commits=commits, files=files, branches=branches, tags=tags,
+        annotated_tags=annotated_tags )
+    Git_command._build_command( 'fast-import', '--quiet', src=path ).run(
+        stdin=stream )
+    Git_command.checkout( '-f', 'master', src=path ).run()
+    for i in range( remotes ):
+        repo.remote.append( f'remote_{i}', f'file:///nowhere/remote_{i}' )
+    for i in range( dirty_files ):
+        with open( os.path.join( path, f'untracked_{i}.txt' ), 'w' ) as f:
+            f.write( f'sin seguimiento {i}\n' )
+        if i < files:
+            name = os.path.join( path, f'dir_{i % 10}', f'file_{i}.txt' )
+            with open( name, 'a' ) as f:
+                f.write( 'cambio\n' )
+    return repo
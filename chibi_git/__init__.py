@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 from chibi_git.chibi_git import Git
+from chibi_git.async_git import Async_git
+from chibi_git.repo_set import Repo_set
+from chibi_git.trace import Tracer
 
-__all__ = [ 'Git' ]
+__all__ = [ 'Git', 'Async_git', 'Repo_set', 'Tracer' ]
 __author__ = """dem4ply"""
 __email__ = 'dem4ply@gmail.com'
 __version__ = '0.9.1'
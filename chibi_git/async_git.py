@@ -0,0 +1,202 @@
+import asyncio
+import logging
+
+from chibi_command import Command_result, Result_error
+
+from chibi_git import trace
+from chibi_git.chibi_git import Git
+from chibi_git.command import Git as Git_command, Record_reader
+from chibi_git.obj import Branch, Commit, Tag
+
+
+logger = logging.getLogger( 'chibi_git.async_git' )
+
+
+class Async_git:
+    """
+    version asincrona de `chibi_git.Git` que ejecuta git con
+    `asyncio.create_subprocess_exec`
+
+    los comandos y los parsers de los resultados son los mismos que usa
+    `chibi_git.Git` por lo que los resultados son identicos
+
+    Parameters
+    ----------
+    path: str
+        ruta del repo
+    """
+    def __init__( self, path ):
+        if isinstance( path, Git ):
+            self.repo = path
+        else:
+            self.repo = Git( path )
+
+    def __repr__( self ):
+        return f"Async_git( path={self.path} )"
+
+    @property
+    def path( self ):
+        return self.repo.path
+
+    async def run( self, command, stdin=None ):
+        """
+        ejecuta un comando de `chibi_git.command.Git` sin bloquear el
+        event loop
+
+        Returns
+        -------
+        el `result_class` del comando
+        """
+        logger.info( f'ejecutando "{command.preview()}"' )
+        arguments = tuple( map( str, command.build_tuple() ) )
+        record = trace.start( command, kind='async' )
+        pipe = asyncio.subprocess.PIPE if command.captive else None
+        if isinstance( stdin, str ):
+            stdin = stdin.encode()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *arguments, stdin=asyncio.subprocess.PIPE if stdin else None,
+                stdout=pipe, stderr=pipe, env=command.env or None )
+            result, error = await proc.communicate( stdin )
+        finally:
+            # igual que `Git.run` los comandos que modifican el repo
+            # invalidan el cache de `Git.snapshot`
+            command.invalidate_cache()
+        trace.finish(
+            record, proc.returncode, len( result or b'' ),
+            len( error or b'' ) )
+        if result is not None:
+            result = result.decode( 'utf-8' )
+        if error is not None:
+            error = error.decode( 'utf-8' )
+        result = command.result_class(
+            result, error, proc.returncode, command=command )
+        if command.raise_on_fail:
+            result.throw()
+        return result
+
+    async def stream( self, command ):
+        """
+        version asincrona de `chibi_git.command.Git.stream`, regresa los
+        registros conforme git los escribe y mata el proceso si se deja de
+        iterar
+        """
+        logger.info( f'ejecutando "{command.preview()}"' )
+        arguments = tuple( map( str, command.build_tuple() ) )
+        trace_record = trace.start( command, kind='async' )
+        proc = await asyncio.create_subprocess_exec(
+            *arguments, stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE, env=command.env or None )
+        reader = Record_reader( command.result_class )
+        error = asyncio.ensure_future( proc.stderr.read() )
+        size = 0
+        try:
+            while True:
+                chunk = await proc.stdout.read( command.stream_chunk_size )
+                size += len( chunk )
+                for record in reader.feed( chunk ):
+                    yield record
+                if not chunk:
+                    break
+            await proc.wait()
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            command.invalidate_cache()
+        error = await error
+        trace.finish( trace_record, proc.returncode, size, len( error ) )
+        error = error.decode( 'utf-8' )
+        if proc.returncode and command.raise_on_fail:
+            raise Result_error( Command_result(
+                None, error, proc.returncode, command=command ) )
+
+    async def src( self ):
+        """
+        version asincrona de `chibi_git.Git.src`, si los directorios del
+        repo no se pueden leer de `.git` se resuelven con
+        `git rev-parse` sin bloquear el event loop
+
+        Returns
+        -------
+        chibi_git.command.Repo_dirs
+
+        Raises
+        ------
+        chibi_git.exception.Git_not_initiate
+            si la ruta no es un repo de git
+        """
+        repo = self.repo
+        discovery, key = repo._cached_discovery()
+        if discovery is None:
+            discovery = repo._discover_from_files()
+            if discovery is None:
+                result = await self.run(
+                    Git_command.rev_parse__discover( repo._path ) )
+                discovery = repo._discovery_from_rev_parse( result )
+            discovery = repo._save_discovery( discovery, key )
+        return discovery.src
+
+    async def status( self ):
+        """
+        regresa el status del repo igual que `chibi_git.Git.status`
+        """
+        status = await self.run( Git_command.status( src=await self.src() ) )
+        return self.repo._build_status( status.result )
+
+    async def log( self, with_info=False ):
+        """
+        regresa los commits desde HEAD como iterador asincrono
+
+        Parameters
+        ----------
+        with_info: bool
+            si es verdadero los commits regresan con su info ya cargada
+        """
+        src = await self.src()
+        if with_info:
+            command = Git_command.log__info( 'HEAD', src=src )
+            async for record in self.stream( command ):
+                yield self.repo._commit_from_record( record )
+        else:
+            command = Git_command.rev_list( 'HEAD', src=src )
+            async for hash in self.stream( command ):
+                yield Commit( self.repo, hash )
+
+    async def fetch( self ):
+        await self.run( Git_command.fetch( src=await self.src() ) )
+
+    async def pull( self ):
+        await self.run( Git_command.pull( src=await self.src() ) )
+
+    async def push( self, origin, branch, set_upstream=False ):
+        push = Git_command.push(
+            origin, branch, set_upstream=set_upstream, src=await self.src() )
+        result = await self.run( push )
+        return bool( result )
+
+    async def branches( self, remote=False ):
+        """
+        regresa las ramas del repo como lo hace `Branches.local`
+
+        Parameters
+        ----------
+        remote: bool
+            si es verdadero regresa las ramas remotas
+        """
+        command = Git_command.for_each_ref__branches( src=await self.src() )
+        result = await self.run( command )
+        branches = (
+            Branch( self.repo, **record ) for record in result.result
+            if record.is_remote == remote )
+        return { b: b for b in branches }
+
+    async def tags( self ):
+        """
+        regresa la lista de tags del repo con la misma informacion que
+        `Tags.index`
+        """
+        result = await self.run(
+            Git_command.for_each_ref__tags( src=await self.src() ) )
+        return [
+            Tag( repo=self.repo, **record ) for record in result.result ]
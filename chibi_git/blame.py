@@ -0,0 +1,71 @@
+from chibi_atlas import Chibi_atlas
+
+from chibi_git.command import parse_offset
+from chibi_git.obj import Commit, Commit_author
+
+
+def parse_blame( repo, lines ):
+    """
+    parsea la salida de `git blame --incremental` conforme llega
+
+    la informacion de cada commit se parsea una sola vez y se comparte
+    entre todos sus rangos, los commits son los mismos objetos del mapa
+    de identidad del repo
+
+    Parameters
+    ----------
+    repo: chibi_git.Git
+    lines: iterable of str
+
+    Returns
+    -------
+    generator of Chibi_atlas
+        un rango por cada bloque de lineas con `commit`, `author`,
+        `timestamp`, `offset`, `summary`, `path`, `original_line`,
+        `final_line` y `lines`
+    """
+    commits = {}
+    headers = {}
+    current = None
+    for line in lines:
+        if current is None:
+            hash, original, final, count = line.split( ' ' )
+            current = Chibi_atlas(
+                hash=hash, original_line=int( original ),
+                final_line=int( final ), lines=int( count ) )
+            headers = {}
+            continue
+        key, _, value = line.partition( ' ' )
+        if key != 'filename':
+            headers[ key ] = value
+            continue
+        metadata = commits.get( current.hash )
+        if metadata is None:
+            metadata = commits[ current.hash ] = _metadata(
+                repo, current.hash, headers )
+        yield Chibi_atlas(
+            commit=metadata.commit, author=metadata.author,
+            timestamp=metadata.timestamp, offset=metadata.offset,
+            summary=metadata.summary, path=value,
+            original_line=current.original_line,
+            final_line=current.final_line, lines=current.lines )
+        current = None
+
+
+def _metadata( repo, hash, headers ):
+    commit = Commit( repo, hash )
+    info = commit._info
+    if info is not None:
+        return Chibi_atlas(
+            commit=commit, author=info.author, timestamp=info.timestamp,
+            offset=info.offset,
+            summary=info.message.split( '\n', 1 )[0] )
+    email = headers.get( 'author-mail', '' )
+    if email.startswith( '<' ) and email.endswith( '>' ):
+        email = email[ 1:-1 ]
+    return Chibi_atlas(
+        commit=commit,
+        author=Commit_author( headers.get( 'author', '' ), email ),
+        timestamp=int( headers.get( 'author-time', 0 ) ),
+        offset=parse_offset( headers.get( 'author-tz', '+0000' ) ),
+        summary=headers.get( 'summary', '' ) )
@@ -1,8 +1,22 @@
+import os
+import time
+
+from chibi_atlas import Chibi_atlas
+
 from chibi_git.obj import Branch, Commit
 from chibi_git.command import Git
+from chibi_git.refs import _stat
 
 
 class Branches:
+    """
+    manejador de las ramas del repo
+
+    las ramas locales y remotas se leen con un solo `git for-each-ref` que
+    incluye la punta, el upstream con cuantos commits va adelante y atras
+    y la fecha y autor del ultimo commit, el indice se guarda en el repo y
+    solo se recarga cuando cambian las referencias o `.git/config`
+    """
     def __init__( self, repo ):
         self.repo = repo
 
@@ -11,22 +25,90 @@ class Branches:
             f"Branches( repo={self.repo} )"
         )
 
+    @property
+    def index( self ):
+        """
+        lista de todas las ramas locales y remotas
+        """
+        version = (
+            self.repo.refs.version,
+            _stat( os.path.join( self.repo.common_dir, 'config' ) ) )
+        index = self.repo._branch_index
+        if index is None or index.version != version:
+            result = Git.for_each_ref__branches( src=self.repo.src ).run()
+            branches = [
+                Branch( self.repo, **record ) for record in result.result ]
+            index = Chibi_atlas( version=version, branches=branches )
+            self.repo._branch_index = index
+        return index.branches
+
     @property
     def local( self ):
-        branches = Git.branch( src=self.repo.path ).run()
-        result = map( lambda x: Branch( self.repo, x ), branches.result )
+        result = filter( lambda x: not x.is_remote, self.index )
         return { b: b for b in result }
 
     @property
     def remote( self ):
         return Branches_remote( repo=self.repo )
-        branches = Git.branch( remote=True, src=self.repo.path ).run()
-        result = map( lambda x: Branch( self.repo, x ), branches.result )
-        return Branches_remote( result )
 
     def __iter__( self ):
         return iter( self.local )
 
+    def filter( self, function=None, remote=False ):
+        """
+        regresa las ramas que cumplen con la funcion sin ejecutar git
+
+        Parameters
+        ----------
+        function: callable, optional
+            recibe la rama y regresa si se incluye
+        remote: bool or None
+            False solo locales, True solo remotas y None todas
+
+        Returns
+        -------
+        list of Branch
+        """
+        result = self.index
+        if remote is not None:
+            result = filter( lambda x: x.is_remote == remote, result )
+        if function is not None:
+            result = filter( function, result )
+        return list( result )
+
+    def sorted( self, by='name', reverse=False, remote=False ):
+        """
+        regresa las ramas ordenadas por `name` o `date` sin ejecutar git
+        """
+        keys = {
+            'name': lambda x: x.name,
+            'date': lambda x: ( x.timestamp or 0, x.name ),
+        }
+        try:
+            key = keys[ by ]
+        except KeyError:
+            raise NotImplementedError(
+                f"no esta implementado ordenar por {by}" )
+        return sorted( self.filter( remote=remote ), key=key, reverse=reverse )
+
+    def stale( self, days=90, remote=False, now=None ):
+        """
+        regresa las ramas cuyo ultimo commit tiene mas de `days` dias de
+        la mas vieja a la mas nueva
+
+        Parameters
+        ----------
+        days: float
+        remote: bool or None
+        now: float, optional
+            epoch contra el que se compara, por default el actual
+        """
+        if now is None:
+            now = time.time()
+        limit = now - days * 24 * 60 * 60
+        branches = self.sorted( by='date', remote=remote )
+        return [ b for b in branches if ( b.timestamp or 0 ) < limit ]
+
     def create( self, name, target=None ):
         """
         crea una nueva rama en el target
@@ -48,9 +130,9 @@ class Branches:
             raise NotImplementedError(
                 f"target {type(target)} con valor {target} no implementado" )
 
-        command = Git.branch( name, target, src=self.repo.path )
+        command = Git.branch( name, target, src=self.repo.src )
         command.run()
-        return self.local[ name ]
+        return Branch( self.repo, name )
 
 
 class Branches_remote:
@@ -69,9 +151,13 @@ class Branches_remote:
 
     def _get_without_prefix( self, prefix ):
         for branch in self._branches:
-            if branch.name.startswith( 'origin' ):
-                name = branch.name.replace( 'origin/', '', 1 )
-                yield Branch( repo=branch.repo, name=name, is_remote=True )
+            if branch.name.startswith( f'{prefix}/' ):
+                name = branch.name.replace( f'{prefix}/', '', 1 )
+                yield Branch(
+                    repo=branch.repo, name=name, is_remote=True,
+                    hash=branch.hash, timestamp=branch.timestamp,
+                    offset=branch.offset, author=branch.author,
+                    email=branch.email )
 
     def __iter__( self ):
         if self.prefix is not None:
@@ -88,9 +174,7 @@ class Branches_remote:
 
     @property
     def _branches( self ):
-        branches = Git.branch( remote=True, src=self.repo.path ).run()
-        for branch in branches.result:
-            yield Branch( repo=self.repo, name=branch, is_remote=True )
+        return Branches( self.repo ).filter( remote=True )
 
     def __getattr__( self, name ):
         try:
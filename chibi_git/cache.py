@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import threading
+
+from chibi_git.obj import Commit_info
+
+
+class Commit_cache:
+    """
+    cache en disco de la informacion de los commits usando sqlite
+
+    los commits no cambian por lo que la informacion se guarda por hash y
+    se comparte entre procesos, la base usa WAL para que muchos lectores
+    puedan leer mientras otro escribe
+
+    Parameters
+    ----------
+    path: str
+        directorio donde se guarda `commits.sqlite3`, se puede compartir
+        entre varios repos porque los hash no se repiten
+    """
+    file_name = 'commits.sqlite3'
+    chunk_size = 500
+
+    def __init__( self, path ):
+        os.makedirs( str( path ), exist_ok=True )
+        self.path = os.path.join( str( path ), self.file_name )
+        self._local = threading.local()
+        with self.connection as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS commits ('
+                ' hash TEXT PRIMARY KEY, author TEXT, email TEXT,'
+                ' timestamp INTEGER, offset INTEGER, message TEXT'
+                ') WITHOUT ROWID' )
+
+    def __repr__( self ):
+        return f"Commit_cache( path={self.path} )"
+
+    @property
+    def connection( self ):
+        """
+        conexion de sqlite del hilo actual
+        """
+        connection = getattr( self._local, 'connection', None )
+        if connection is None:
+            connection = sqlite3.connect( self.path, timeout=30 )
+            connection.execute( 'PRAGMA journal_mode=WAL' )
+            connection.execute( 'PRAGMA synchronous=NORMAL' )
+            self._local.connection = connection
+        return connection
+
+    def get( self, hash ):
+        """
+        regresa la informacion del commit o None si no esta guardada
+
+        Returns
+        -------
+        chibi_git.obj.Commit_info or None
+        """
+        row = self.connection.execute(
+            'SELECT author, email, timestamp, offset, message '
+            'FROM commits WHERE hash = ?', ( hash, ) ).fetchone()
+        if row is None:
+            return None
+        return Commit_info( *row )
+
+    def get_many( self, hashes ):
+        """
+        regresa la informacion de los commits que estan guardados
+
+        Returns
+        -------
+        dict
+            hash con su `Commit_info`
+        """
+        hashes = list( hashes )
+        result = {}
+        for i in range( 0, len( hashes ), self.chunk_size ):
+            chunk = hashes[ i:i + self.chunk_size ]
+            marks = ', '.join( '?' * len( chunk ) )
+            rows = self.connection.execute(
+                'SELECT hash, author, email, timestamp, offset, message '
+                f'FROM commits WHERE hash IN ( {marks} )', chunk )
+            for hash, *row in rows:
+                result[ hash ] = Commit_info( *row )
+        return result
+
+    def put( self, hash, info ):
+        self.put_many( [ ( hash, info ) ] )
+
+    def put_many( self, items ):
+        """
+        guarda la informacion de varios commits en una sola transaccion
+
+        Parameters
+        ----------
+        items: iterable of tuple
+            pares de hash y `Commit_info`
+        """
+        rows = [
+            ( hash, info.author.author, info.author.email, info.timestamp,
+                info.offset, info.message )
+            for hash, info in items ]
+        if not rows:
+            return
+        with self.connection as connection:
+            connection.executemany(
+                'INSERT OR IGNORE INTO commits '
+                '( hash, author, email, timestamp, offset, message ) '
+                'VALUES ( ?, ?, ?, ?, ?, ? )', rows )
+
+    def close( self ):
+        """
+        cierra la conexion del hilo actual
+        """
+        connection = getattr( self._local, 'connection', None )
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
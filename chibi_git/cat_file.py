@@ -0,0 +1,309 @@
+import contextlib
+import io
+import logging
+import queue
+import threading
+from subprocess import Popen, PIPE, DEVNULL
+
+from chibi_atlas import Chibi_atlas
+
+from chibi_git import trace
+from chibi_git.command import Git, watchdog
+from chibi_git.exception import Git_object_not_found, Git_timeout
+
+
+logger = logging.getLogger( 'chibi_git.cat_file' )
+
+
+class Cat_file:
+    """
+    proceso persistente de `git cat-file --batch` y `--batch-check` para
+    leer objetos del repo sin crear un proceso por cada consulta
+
+    los procesos se crean la primera vez que se usan y se mantienen vivos
+    hasta que se llama `close`
+
+    Parameters
+    ----------
+    repo: chibi_git.Git
+        repo del cual se leeran los objetos
+    """
+    def __init__( self, repo ):
+        self.repo = repo
+        self._lock = threading.Lock()
+        self._batch = None
+        self._batch_check = None
+
+    def __repr__( self ):
+        return f"Cat_file( repo={self.repo} )"
+
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, exc_type, exc_value, traceback ):
+        self.close()
+
+    def __del__( self ):
+        self.close()
+
+    def _spawn( self, mode ):
+        command = Git.cat_file( mode, src=self.repo.src )
+        arguments = tuple( map( str, command.build_tuple() ) )
+        logger.info( f'iniciando "{command.preview()}"' )
+        # el proceso es persistente, solo se registra lo que tarda en
+        # iniciar
+        record = trace.start( command, kind='cat-file' )
+        proc = Popen(
+            arguments, stdin=PIPE, stdout=PIPE, stderr=DEVNULL )
+        trace.finish( record, None )
+        return proc
+
+    def _process( self, mode ):
+        attr = '_batch' if mode == '--batch' else '_batch_check'
+        proc = getattr( self, attr )
+        if proc is None or proc.poll() is not None:
+            proc = self._spawn( mode )
+            setattr( self, attr, proc )
+        return proc
+
+    def _ask( self, proc, obj ):
+        if '\n' in obj:
+            raise ValueError(
+                f'el nombre del objeto "{obj!r}" no puede tener saltos '
+                'de linea' )
+        proc.stdin.write( obj.encode() + b'\n' )
+        proc.stdin.flush()
+        header = proc.stdout.readline()
+        if not header:
+            raise BrokenPipeError(
+                f"cat-file termino inesperadamente en {self.repo.path}" )
+        header = header.decode().rstrip( '\n' )
+        # el nombre del objeto puede tener espacios
+        if header.endswith( ( ' missing', ' ambiguous' ) ):
+            return None
+        hash, type, size = header.rsplit( ' ', 2 )
+        return Chibi_atlas( hash=hash, type=type, size=int( size ) )
+
+    def info( self, obj ):
+        """
+        regresa el hash, tipo y tamaño del objeto o None si no existe
+
+        Parameters
+        ----------
+        obj: str
+            hash o cualquier revision que entienda git ( HEAD, v1^{} )
+
+        Returns
+        -------
+        Chibi_atlas or None
+        """
+        obj = str( obj )
+        with self._lock:
+            proc = self._process( '--batch-check' )
+            return self._with_deadline( proc, lambda: self._ask( proc, obj ) )
+
+    def exists( self, obj ):
+        """
+        revisa si el objeto existe en el repo
+        """
+        return self.info( obj ) is not None
+
+    def read( self, obj ):
+        """
+        lee el contenido de un objeto
+
+        Parameters
+        ----------
+        obj: str
+            hash o cualquier revision que entienda git
+
+        Returns
+        -------
+        Chibi_atlas
+            con hash, type, size y content en bytes
+
+        Raises
+        ------
+        Git_object_not_found
+            si el objeto no existe
+        """
+        obj = str( obj )
+        with self._lock:
+            proc = self._process( '--batch' )
+            result = self._with_deadline(
+                proc, lambda: self._read( proc, obj ) )
+            if result is None:
+                raise Git_object_not_found(
+                    f'no se encontro el objeto "{obj}" en {self.repo.path}' )
+            return result
+
+    def _read( self, proc, obj ):
+        result = self._ask( proc, obj )
+        if result is None:
+            return None
+        # el salto de linea final se lee aparte para no copiar el
+        # contenido al quitarlo
+        result.content = proc.stdout.read( result.size )
+        if len( result.content ) < result.size:
+            raise BrokenPipeError(
+                f"cat-file termino antes de leer el objeto {result.hash} "
+                f"en {self.repo.path}" )
+        proc.stdout.read( 1 )
+        return result
+
+    def _with_deadline( self, proc, function ):
+        """
+        ejecuta la consulta, dentro de `chibi_git.command.deadline` el
+        proceso se mata si se acaba el tiempo y se vuelve a crear en la
+        siguiente consulta, si la consulta alcanzo a terminar se regresa
+        su resultado
+        """
+        timer = watchdog( proc.kill )
+        try:
+            return function()
+        except Exception as e:
+            if timer.expired:
+                raise Git_timeout(
+                    f'se acabo el tiempo leyendo de cat-file en '
+                    f'{self.repo.path}' ) from e
+            raise
+        finally:
+            timer.cancel()
+
+    def close( self ):
+        """
+        termina los procesos de cat-file
+        """
+        for attr in ( '_batch', '_batch_check' ):
+            proc = getattr( self, attr, None )
+            if proc is None:
+                continue
+            setattr( self, attr, None )
+            if proc.poll() is None:
+                proc.stdin.close()
+                proc.wait()
+            proc.stdout.close()
+
+
+class Cat_file_pool:
+    """
+    grupo de `Cat_file` para poder leer objetos desde varios hilos
+
+    los workers se crean conforme se necesitan hasta llegar a `size`
+
+    Parameters
+    ----------
+    repo: chibi_git.Git
+        repo del cual se leeran los objetos
+    size: int
+        numero maximo de workers
+    """
+    def __init__( self, repo, size=4 ):
+        self.repo = repo
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def __repr__( self ):
+        return f"Cat_file_pool( repo={self.repo}, size={self.size} )"
+
+    @contextlib.contextmanager
+    def acquire( self ):
+        """
+        toma un worker del pool y lo regresa al terminar
+
+        Returns
+        -------
+        Cat_file
+        """
+        worker = None
+        try:
+            worker = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if len( self._workers ) < self.size:
+                    worker = Cat_file( self.repo )
+                    self._workers.append( worker )
+        if worker is None:
+            worker = self._idle.get()
+        try:
+            yield worker
+        finally:
+            self._idle.put( worker )
+
+    def info( self, obj ):
+        with self.acquire() as worker:
+            return worker.info( obj )
+
+    def exists( self, obj ):
+        with self.acquire() as worker:
+            return worker.exists( obj )
+
+    def read( self, obj ):
+        with self.acquire() as worker:
+            return worker.read( obj )
+
+    def close( self ):
+        """
+        termina los procesos de todos los workers
+        """
+        with self._lock:
+            for worker in self._workers:
+                worker.close()
+
+
+class Blob_stream( io.RawIOBase ):
+    """
+    lee el contenido de un blob conforme git lo escribe con su propio
+    proceso de `git cat-file blob` sin cargarlo completo en memoria
+
+    al cerrarlo se mata el proceso si no termino, dentro de
+    `chibi_git.command.deadline` tambien se mata cuando se acaba el tiempo
+
+    Parameters
+    ----------
+    repo: chibi_git.Git
+    hash: str
+        hash del blob
+    size: int, optional
+        tamaño del blob
+    """
+    def __init__( self, repo, hash, size=None ):
+        super().__init__()
+        self.repo = repo
+        self.hash = hash
+        self.size = size
+        self._read = 0
+        command = Git.cat_file( 'blob', hash, src=repo.src )
+        arguments = tuple( map( str, command.build_tuple() ) )
+        logger.info( f'iniciando "{command.preview()}"' )
+        self._record = trace.start( command, kind='stream' )
+        self._proc = Popen( arguments, stdout=PIPE, stderr=DEVNULL )
+        self._timer = watchdog( self._proc.kill )
+
+    def __repr__( self ):
+        return f"Blob_stream( hash={self.hash}, repo={self.repo} )"
+
+    def readable( self ):
+        return True
+
+    def readinto( self, buffer ):
+        amount = self._proc.stdout.readinto( buffer )
+        if not amount and self._timer.expired:
+            raise Git_timeout(
+                f'se acabo el tiempo leyendo el blob {self.hash}' )
+        self._read += amount
+        return amount
+
+    def close( self ):
+        if self.closed:
+            return
+        self._timer.cancel()
+        proc = self._proc
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        proc.stdout.close()
+        trace.finish( self._record, proc.returncode, self._read )
+        super().close()
@@ -1,15 +1,28 @@
 # -*- coding: utf-8 -*-
+import functools
+import itertools
 import logging
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from chibi.file import Chibi_path
 from chibi_atlas import Chibi_atlas
-from chibi_command import Result_error
 
-from .obj import Remote_wrapper, Chibi_status_file
+from .obj import Remote, Remote_wrapper, Chibi_status_file
+from chibi_git.blame import parse_blame
 from chibi_git.branches import Branches
-from chibi_git.command import Git as Git_command
+from chibi_git.cache import Commit_cache
+from chibi_git.cat_file import Cat_file_pool
+from chibi_git.command import (
+    Git as Git_command, Repo_dirs, Status_result, command_cache )
+from chibi_git.diff import parse_diff_tree, parse_patch
 from chibi_git.exception import Git_not_initiate
-from chibi_git.obj import Head, Commit
+from chibi_git.graph import Commit_graph
+from chibi_git.obj import Head, Commit, Commit_info
+from chibi_git.refs import (
+    Ref_snapshot, find_git_dir, find_common_dir, _stat )
 from chibi_git.snippets import get_base_name_from_git_url
 from chibi_git.tags import Tags
 
@@ -18,13 +31,32 @@ logger = logging.getLogger( 'chibi_git' )
 
 
 class Git:
-    def __init__( self, path ):
+    """
+    repo de git
+
+    Parameters
+    ----------
+    path: str
+        ruta del repo
+    commit_cache: bool, str or Commit_cache, optional
+        cache en disco de la info de los commits, con True se guarda en
+        `.git/chibi_git/`, con una ruta se guarda en ese directorio
+    """
+    def __init__( self, path, commit_cache=None ):
         if isinstance( path, str ):
             path = Chibi_path( path )
         self._path = path
+        self._commit_cache = commit_cache
+        self._discovery = None
+        self._commits = weakref.WeakValueDictionary()
+        self._commits_lock = threading.Lock()
+        self._graph = None
+        self._tag_index = None
+        self._branch_index = None
+        self._remote_index = None
 
     @classmethod
-    def clone( cls, url, path=None ):
+    def clone( cls, url, path=None, **options ):
         """
         clona un repo de la url, el path solo puede ser la ruta donde se
         clonara y el nombre final de la carpeta a clonar es la de default
@@ -36,6 +68,10 @@ class Git:
             url que se clonara
         path: str:
             ubicacion donde se clonara el repo
+        **options:
+            opciones de `chibi_git.command.Git.clone` ( depth, filter,
+            single_branch, branch, no_checkout, recurse_submodules, jobs,
+            reference )
 
         Returns
         -------
@@ -49,10 +85,46 @@ class Git:
         path = path + base_name
 
         logger.info( f'clonando "{url}" en "{path}"' )
-        Git_command.clone( url, path ).run()
+        Git_command.clone( url, path, **options ).run()
 
         return cls( path )
 
+    @classmethod
+    def clone_many( cls, urls, path=None, max_workers=8, **options ):
+        """
+        clona varios repos al mismo tiempo, los errores de un repo no
+        detienen a los demas
+
+        Parameters
+        ----------
+        urls: iterable of str
+            urls que se clonaran
+        path: str
+            ubicacion donde se clonaran los repos
+        max_workers: int
+            numero maximo de clones al mismo tiempo
+        **options:
+            opciones de `Git.clone`
+
+        Returns
+        -------
+        list of Chibi_atlas
+            un resultado por url en el mismo orden con `url`, `repo`,
+            `error` y `ok`
+        """
+        def clone( url ):
+            result = Chibi_atlas( url=url, repo=None, error=None, ok=True )
+            try:
+                result.repo = cls.clone( url, path, **options )
+            except Exception as e:
+                logger.warning( f'no se pudo clonar "{url}": {e}' )
+                result.error = e
+                result.ok = False
+            return result
+
+        with ThreadPoolExecutor( max_workers=max_workers ) as executor:
+            return list( executor.map( clone, urls ) )
+
     @property
     def has_git( self ):
         """
@@ -62,13 +134,98 @@ class Git:
         -------
         bool
         """
-        try:
-            Git_command.rev_parse( src=self._path ).run()
-        except Result_error as e:
-            raise Git_not_initiate(
-                f"repository in '{self._path}' is not initialize" ) from e
+        self._discover()
         return True
 
+    @property
+    def git_dir( self ):
+        """
+        directorio de git del repo ya resuelto
+        """
+        return self._discover().git_dir
+
+    @property
+    def work_tree( self ):
+        """
+        directorio de trabajo del repo ya resuelto
+        """
+        return self._discover().work_tree
+
+    @property
+    def common_dir( self ):
+        """
+        directorio comun del repo, en los worktrees es el del repo
+        principal
+        """
+        return self._discover().common_dir
+
+    @property
+    def src( self ):
+        """
+        ruta del repo con el git dir y work tree resueltos, se usa como
+        `src` de los comandos del repo
+
+        Returns
+        -------
+        chibi_git.command.Repo_dirs
+        """
+        return self._discover().src
+
+    def _discover( self ):
+        """
+        resuelve el git dir, work tree y common dir del repo, el resultado
+        se guarda mientras el inodo de `.git` no cambie y todos los
+        comandos del repo usan el git dir y work tree resueltos
+        """
+        discovery, key = self._cached_discovery()
+        if discovery is not None:
+            return discovery
+        discovery = self._discover_from_files()
+        if discovery is None:
+            result = Git_command.rev_parse__discover( self._path ).run()
+            discovery = self._discovery_from_rev_parse( result )
+        return self._save_discovery( discovery, key )
+
+    def _cached_discovery( self ):
+        key = _stat_key( self._path + '.git' )
+        if self._discovery is not None and key == self._discovery.key:
+            return self._discovery, key
+        return None, key
+
+    def _discover_from_files( self ):
+        """
+        resuelve los directorios leyendo `.git` sin ejecutar git, regresa
+        None si el repo no tiene la forma normal
+        """
+        git_dir = find_git_dir( self._path )
+        if git_dir and os.path.isfile( os.path.join( git_dir, 'HEAD' ) ):
+            return Chibi_atlas(
+                git_dir=git_dir, common_dir=find_common_dir( git_dir ),
+                work_tree=os.path.abspath( self._path ) )
+        return None
+
+    def _discovery_from_rev_parse( self, result ):
+        """
+        construye los directorios de la salida de
+        `chibi_git.command.Git.rev_parse__discover`
+        """
+        lines = result.result
+        if len( lines ) >= 3 and lines[2] == 'true':
+            return Chibi_atlas(
+                git_dir=lines[0], common_dir=lines[1], work_tree=None )
+        if result.return_code or len( lines ) < 4:
+            raise Git_not_initiate(
+                f"repository in '{self._path}' is not initialize" )
+        return Chibi_atlas(
+            git_dir=lines[0], common_dir=lines[1], work_tree=lines[3] )
+
+    def _save_discovery( self, discovery, key ):
+        discovery.key = key
+        discovery.src = Repo_dirs(
+            self._path, discovery.git_dir, discovery.work_tree )
+        self._discovery = discovery
+        return discovery
+
     def init( self ):
         """
         inicializa un repositorio de git
@@ -78,114 +235,543 @@ class Git:
             raise NotImplementedError
         except Git_not_initiate:
             Git_command.init( src=self._path ).run()
+            self._discovery = None
 
     @property
     def status( self ):
         if not self.has_git:
             raise NotImplementedError
-        status = Git_command.status( src=self._path ).run()
-        prev = status.result
+        status = Git_command.status( src=self.src ).run()
+        return self._build_status( status.result )
+
+    def _build_status( self, prev ):
+        """
+        convierte los paths del resultado de `Status_result` en
+        `Chibi_status_file` del repo
+        """
+        files = {}
+
+        def status_file( path ):
+            try:
+                return files[ path ]
+            except KeyError:
+                file = files[ path ] = Chibi_status_file( path, repo=self )
+                return file
+
         result = Chibi_atlas()
-        for k, v in prev.items():
-            result[ k ] = list( Chibi_status_file( f, repo=self ) for f in v )
+        for k in Status_result.groups.values():
+            result[ k ] = list( map( status_file, prev[ k ] ) )
+        result.untrack = list( map( status_file, prev.untrack ) )
+        result.ignored = list( map( status_file, prev.ignored ) )
+        result.index = {
+            status_file( k ): v for k, v in prev.index.items() }
+        result.worktree = {
+            status_file( k ): v for k, v in prev.worktree.items() }
+        result.renamed_from = {
+            status_file( k ): status_file( v )
+            for k, v in prev.renamed_from.items() }
+        result.branch = prev.branch
         return result
 
     def add( self, file ):
-        if isinstance( file, Chibi_status_file ):
-            relative_path = file.relative_to( self._path )
-            if relative_path.startswith( '..' ):
-                raise NotImplementedError(
-                    f"no esta implementado {type(file)} con valor {file}, "
-                    "no es tatalmente relativo al repo" )
-            if relative_path.startswith( '/' ):
-                raise NotImplementedError(
-                    f"no esta implementado {type(file)} con valor {file}, "
-                    "empieza con root" )
-            Git_command.add( relative_path, src=self._path ).run()
-        elif isinstance( file, Chibi_path ):
-            relative_path = file.relative_to( self._path )
-            if relative_path.startswith( '..' ):
-                raise NotImplementedError(
-                    f"no esta implementado {type(file)} con valor {file}, "
-                    "no es tatalmente relativo al repo" )
-            if relative_path.startswith( '/' ):
-                raise NotImplementedError(
-                    f"no esta implementado {type(file)} con valor {file}, "
-                    "empieza con root" )
-            Git_command.add( relative_path, src=self._path ).run()
+        """
+        agrega archivos al index, todos los archivos se agregan con un
+        solo proceso de git
+
+        Parameters
+        ----------
+        file: Chibi_path, Chibi_status_file, iterable or dict
+            archivo, lista de archivos o grupos del status
+            ( `repo.status.modified` o `repo.status` )
+        """
+        if isinstance( file, Chibi_path ):
+            files = [ file ]
         elif isinstance( file, str ):
             raise NotImplementedError(
                 f"no esta implementado {type(file)} con valor {file}" )
+        elif isinstance( file, dict ):
+            groups = filter(
+                lambda x: isinstance( x, list ), file.values() )
+            files = set( itertools.chain.from_iterable( groups ) )
         else:
+            try:
+                files = iter( file )
+            except TypeError:
+                raise NotImplementedError(
+                    f"no esta implementado {type(file)} con valor {file}" )
+        paths = [ self._relative_path( f ) for f in files ]
+        if not paths:
+            return
+        pathspec = "\0".join( f":(literal){path}" for path in paths )
+        Git_command.add__pathspec_from_file( src=self.src ).run(
+            stdin=pathspec )
+
+    def _relative_path( self, file ):
+        if not isinstance( file, Chibi_path ):
             raise NotImplementedError(
                 f"no esta implementado {type(file)} con valor {file}" )
+        relative_path = file.relative_to( self._path )
+        if relative_path.startswith( '..' ):
+            raise NotImplementedError(
+                f"no esta implementado {type(file)} con valor {file}, "
+                "no es tatalmente relativo al repo" )
+        if relative_path.startswith( '/' ):
+            raise NotImplementedError(
+                f"no esta implementado {type(file)} con valor {file}, "
+                "empieza con root" )
+        return relative_path
 
     def commit( self, message ):
-        Git_command.commit( message, src=self._path ).run()
+        Git_command.commit( message, src=self.src ).run()
 
     def reset( self, hard=False ):
         if hard:
-            Git_command.reset( '--hard', src=self._path ).run()
+            Git_command.reset( '--hard', src=self.src ).run()
         else:
-            Git_command.reset( src=self._path ).run()
+            Git_command.reset( src=self.src ).run()
 
     def checkout( self ):
-        Git_command.checkout( '.', src=self._path ).run()
+        Git_command.checkout( '.', src=self.src ).run()
+
+    def snapshot( self, ttl=None ):
+        """
+        dentro del bloque los comandos de solo lectura del repo ( status,
+        is_dirty, rev-parse, for-each-ref, ... ) se ejecutan una sola vez
+        y se reusa su resultado, cualquier comando que modifique el repo
+        ( add, commit, reset, checkout, pull, fetch, ... ) invalida los
+        resultados
+
+        el snapshot solo se ve en el contexto que abrio el bloque, los
+        hilos que se ejecutan con `contextvars.copy_context().run` lo
+        comparten y el mismo comando pedido al mismo tiempo se ejecuta
+        una sola vez
+
+        los cambios hechos fuera de chibi_git no se ven dentro del bloque
+        hasta que pase el `ttl`
+
+        Parameters
+        ----------
+        ttl: float, optional
+            segundos que dura cada resultado, None dura todo el bloque, un
+            snapshot anidado del mismo repo debe usar el mismo ttl
+
+        Examples
+        --------
+        >>> with repo.snapshot():
+        ...     repo.status
+        ...     repo.is_dirty
+        """
+        return command_cache( self._path, ttl=ttl )
 
     @property
     def is_dirty( self ):
-        status = self.status
-        result = bool(
-            status.modified
-            or status.renamed
-            or status.modified
-            or status.added
-            or status.deleted
-            or status.copied
-            or status.type_change
-        )
-        return result
+        return self.dirty()
+
+    def dirty( self, untracked=False ):
+        """
+        revisa si el repo tiene cambios sin construir el status con un
+        solo `git diff --quiet HEAD` que se detiene en el primer cambio,
+        sin commits se revisa el index con `--cached`
+
+        un cambio en el index que se deshizo en el work tree no cuenta
+        porque el work tree es igual a HEAD
+
+        Parameters
+        ----------
+        untracked: bool
+            si los archivos sin seguimiento cuentan como cambios
+
+        Returns
+        -------
+        bool
+        """
+        self.has_git
+        if self.refs.head_hash is None:
+            revision = '--cached'
+        else:
+            revision = 'HEAD'
+        if Git_command.diff__quiet( revision, src=self.src ).run().result:
+            return True
+        if untracked:
+            files = Git_command.ls_files(
+                '--others', '--exclude-standard', '--directory',
+                '--no-empty-directory', src=self.src ).stream()
+            try:
+                return next( files, None ) is not None
+            finally:
+                files.close()
+        return False
 
     @property
     def head( self ):
-        current_branch = Git_command.rev_parse(
-            '--abbrev-ref', 'HEAD', src=self._path ).run()
-        branch = Head( self, current_branch.result )
-        # commit = Commit( self, current_branch.result )
+        branch = Head( self, self.refs.head )
         return branch
 
+    @functools.cached_property
+    def refs( self ):
+        """
+        foto de las referencias del repo que solo se recarga cuando
+        cambian en disco
+
+        Returns
+        -------
+        chibi_git.refs.Ref_snapshot
+        """
+        return Ref_snapshot( self )
+
+    @property
+    def graph( self ):
+        """
+        grafo de commits de todas las referencias, se reconstruye solo
+        cuando las referencias cambian
+
+        Returns
+        -------
+        chibi_git.graph.Commit_graph
+        """
+        version = self.refs.version
+        if self._graph is None or self._graph.version != version:
+            graph = Commit_graph( self )
+            graph.version = version
+            self._graph = graph
+        return self._graph
+
     @property
     def path( self ):
         return Chibi_path( self._path )
 
-    def log( self ):
-        commit_hashs = Git_command.rev_list(
-            'HEAD', src=self._path ).run().result
+    @functools.cached_property
+    def commit_cache( self ):
+        """
+        cache en disco de la info de los commits, None si no se activo
+
+        Returns
+        -------
+        chibi_git.cache.Commit_cache or None
+        """
+        cache = self._commit_cache
+        if not cache:
+            return None
+        if isinstance( cache, Commit_cache ):
+            return cache
+        if cache is True:
+            cache = os.path.join( self.common_dir, 'chibi_git' )
+        return Commit_cache( cache )
+
+    def log( self, with_info=False ):
+        """
+        regresa los commits desde HEAD
+
+        Parameters
+        ----------
+        with_info: bool
+            si es verdadero se obtiene el autor, fecha y mensaje de todos
+            los commits en una sola ejecucion de git y los commits
+            regresan con su info ya cargada
+
+        Returns
+        -------
+        generator of Commit
+        """
+        if with_info and self.commit_cache is not None:
+            yield from self._log_from_cache( self.commit_cache )
+            return
+        if with_info:
+            records = Git_command.log__info(
+                'HEAD', src=self.src ).stream()
+            yield from map( self._commit_from_record, records )
+            return
+        commit_hashs = Git_command.rev_list( 'HEAD', src=self.src ).stream()
         yield from map( lambda x: Commit( self, x ), commit_hashs )
 
+    def _log_from_cache( self, cache ):
+        """
+        regresa los commits desde HEAD leyendo su info del cache por
+        bloques, los que faltan en cada bloque se leen con un solo
+        `git log --no-walk --stdin` y se guardan
+        """
+        hashes = Git_command.rev_list( 'HEAD', src=self.src ).stream()
+        try:
+            while True:
+                chunk = list( itertools.islice( hashes, cache.chunk_size ) )
+                if not chunk:
+                    return
+                infos = cache.get_many( chunk )
+                missing = [ hash for hash in chunk if hash not in infos ]
+                if missing:
+                    fetched = self._log_info_of( missing )
+                    cache.put_many( fetched.items() )
+                    infos.update( fetched )
+                for hash in chunk:
+                    yield Commit( self, hash, info=infos.get( hash ) )
+        finally:
+            hashes.close()
+
+    def _log_info_of( self, hashes ):
+        """
+        lee la info de varios commits con un solo `git log`
+
+        Returns
+        -------
+        dict
+            hash con su `Commit_info`
+        """
+        stdin = ''.join( f'{hash}\n' for hash in hashes )
+        result = Git_command.log__info(
+            '--no-walk=unsorted', '--stdin', src=self.src ).run( stdin=stdin )
+        return {
+            record.hash: self._info_from_record( record )
+            for record in result.result }
+
+    def diff( self, a, b=None, renames=True ):
+        """
+        regresa los archivos que cambiaron entre `a` y `b` conforme git
+        los escribe, sin `b` son los cambios del commit `a` contra su
+        padre
+
+        Parameters
+        ----------
+        a: Commit or str
+        b: Commit or str, optional
+        renames: bool
+            si se detectan los archivos renombrados
+
+        Returns
+        -------
+        generator of Chibi_atlas
+            con `path`, `old_path`, `status`, `score`, `old_mode`,
+            `new_mode`, `old_hash` y `new_hash`
+        """
+        return self._diff_tree( '--raw', a, b, renames )
+
+    def stats( self, a, b=None, renames=True ):
+        """
+        regresa las lineas agregadas y borradas de cada archivo entre `a`
+        y `b` como `diff`
+
+        Returns
+        -------
+        generator of Chibi_atlas
+            con `path`, `old_path`, `added` y `deleted`, en los binarios
+            `added` y `deleted` son None
+        """
+        return self._diff_tree( '--numstat', a, b, renames )
+
+    def patch( self, a, b=None, renames=True ):
+        """
+        regresa el patch de cada archivo entre `a` y `b` como `diff`, solo
+        se guarda en memoria el patch de un archivo a la vez
+
+        Returns
+        -------
+        generator of Chibi_atlas
+            con `path`, `old_path` y `text`
+        """
+        args = self._diff_tree_args( a, b, renames )
+        lines = Git_command.diff_tree__patch( *args, src=self.src ).stream()
+        return parse_patch( lines )
+
+    def diff_many( self, commits, renames=True ):
+        """
+        regresa los archivos que cambiaron en cada commit usando un solo
+        `git diff-tree --stdin` para todos
+
+        Parameters
+        ----------
+        commits: iterable of Commit or str
+            commits o sus hash completos
+
+        Returns
+        -------
+        generator of tuple
+            el `Commit` y la lista de sus archivos como en `diff`
+        """
+        return self._diff_tree_many( '--raw', commits, renames )
+
+    def stats_many( self, commits, renames=True ):
+        """
+        regresa las lineas agregadas y borradas de cada commit usando un
+        solo `git diff-tree --stdin` para todos
+
+        Returns
+        -------
+        generator of tuple
+            el `Commit` y la lista de sus archivos como en `stats`
+        """
+        return self._diff_tree_many( '--numstat', commits, renames )
+
+    def _diff_tree_args( self, a, b, renames ):
+        args = [ '-r' ]
+        if renames:
+            args.append( '-M' )
+        if b is None:
+            # sin esto git no muestra nada en los merges
+            args += [
+                '--root', '--no-commit-id', '--diff-merges=first-parent',
+                str( a ) ]
+        else:
+            args += [ str( a ), str( b ) ]
+        return args
+
+    def _diff_tree( self, mode, a, b, renames ):
+        args = self._diff_tree_args( a, b, renames )
+        fields = Git_command.diff_tree(
+            '-z', mode, *args, src=self.src ).stream()
+        return parse_diff_tree( fields )
+
+    def _diff_tree_many( self, mode, commits, renames ):
+        stdin = ''.join( f'{commit}\n' for commit in commits )
+        args = [
+            '--stdin', '--always', '--root', '--diff-merges=first-parent',
+            '-r', '-z', mode ]
+        if renames:
+            args.append( '-M' )
+        fields = Git_command.diff_tree( *args, src=self.src ).stream(
+            stdin=stdin )
+        commit = None
+        files = []
+        for item in parse_diff_tree( fields ):
+            if isinstance( item, str ):
+                if commit is not None:
+                    yield commit, files
+                commit = Commit( self, item )
+                files = []
+            else:
+                files.append( item )
+        if commit is not None:
+            yield commit, files
+
+    def blame( self, path, rev=None ):
+        """
+        regresa quien escribio cada bloque de lineas del archivo conforme
+        git lo va calculando, el orden no es el del archivo
+
+        Parameters
+        ----------
+        path: Chibi_path or str
+            archivo dentro del repo o su ruta relativa al repo
+        rev: Commit or str, optional
+            revision desde donde se hace el blame, por default el work
+            tree
+
+        Returns
+        -------
+        generator of Chibi_atlas
+            con `commit`, `author`, `timestamp`, `offset`, `summary`,
+            `path`, `original_line`, `final_line` y `lines`
+        """
+        if isinstance( path, Chibi_path ) and os.path.isabs( path ):
+            path = self._relative_path( path )
+        args = [ '--incremental' ]
+        if rev is not None:
+            args.append( str( rev ) )
+        lines = Git_command.blame(
+            *args, '--', str( path ), src=self.src ).stream()
+        return parse_blame( self, lines )
+
+    def blame_many( self, paths, rev=None, max_workers=8 ):
+        """
+        hace el blame de varios archivos al mismo tiempo, los resultados
+        se regresan conforme termina cada archivo y los errores de un
+        archivo no detienen a los demas
+
+        Returns
+        -------
+        generator of Chibi_atlas
+            con `path`, `ranges`, `error` y `ok`
+        """
+        def blame( path ):
+            result = Chibi_atlas( path=path, ranges=[], error=None, ok=True )
+            try:
+                result.ranges = list( self.blame( path, rev=rev ) )
+            except Exception as e:
+                logger.warning( f'fallo el blame de "{path}": {e}' )
+                result.error = e
+                result.ok = False
+            return result
+
+        with ThreadPoolExecutor( max_workers=max_workers ) as executor:
+            futures = [ executor.submit( blame, path ) for path in paths ]
+            for future in as_completed( futures ):
+                yield future.result()
+
+    def _commit_from_record( self, record ):
+        """
+        construye el commit con su info a partir de un registro de
+        `Log_result`
+        """
+        return Commit(
+            self, record.hash, info=self._info_from_record( record ) )
+
+    def _info_from_record( self, record ):
+        return Commit_info(
+            record.author, record.email, record.timestamp, record.offset,
+            record.message )
+
     def push( self, origin, branch, set_upstream=False ):
         push = Git_command.push(
-            origin, branch, set_upstream=set_upstream, src=self._path )
+            origin, branch, set_upstream=set_upstream, src=self.src )
         result = push.run()
         return bool( result )
 
     def pull( self ):
-        Git_command.pull( src=self._path ).run()
+        Git_command.pull( src=self.src ).run()
 
     @property
     def remote( self ):
         result = Remote_wrapper( repo=self )
         return result
 
-    def _remote( self ):
-        remote_list = Git_command.remote( src=self._path ).run().result
-        return remote_list
+    def _remotes( self ):
+        """
+        lee los remotos con un solo `git config --get-regexp`, el resultado
+        se guarda mientras `.git/config` no cambie
 
-    def _remote__get_url( self, name ):
-        return Git_command.remote__get_url( name, src=self._path ).run().result
+        Returns
+        -------
+        Chibi_atlas
+            nombre del remoto con su `Remote`
+        """
+        version = _stat( os.path.join( self.common_dir, 'config' ) )
+        index = self._remote_index
+        if index is not None and index.version == version:
+            return index.remotes
+        command = Git_command.config__get_regexp(
+            r'^remote\.', src=self.src )
+        command.raise_on_fail = False
+        values = {}
+        for key, value in command.run().result:
+            key = key[ len( 'remote.' ): ]
+            # llaves sin subseccion como `remote.pushdefault`
+            if '.' not in key:
+                continue
+            name, option = key.rsplit( '.', 1 )
+            options = values.setdefault( name, {} )
+            options.setdefault( option, [] ).append( value )
+        remotes = Chibi_atlas()
+        for name, options in values.items():
+            if 'url' not in options:
+                continue
+            remotes[ name ] = Remote(
+                name, options[ 'url' ][0], push_urls=options.get( 'pushurl' ),
+                fetch=options.get( 'fetch' ) )
+        self._remote_index = Chibi_atlas( version=version, remotes=remotes )
+        return remotes
 
     def _remote__add( self, name, url ):
-        Git_command.remote__add( name, url, src=self._path ).run()
+        Git_command.remote__add( name, url, src=self.src ).run()
+
+    @functools.cached_property
+    def objects( self ):
+        """
+        pool de procesos persistentes de `git cat-file` para leer objetos
+        del repo
+
+        Returns
+        -------
+        chibi_git.cat_file.Cat_file_pool
+        """
+        return Cat_file_pool( self )
 
     @property
     def branches( self ):
@@ -207,5 +793,13 @@ class Git:
         )
 
     def fetch( self ):
-        command = Git_command.fetch( src=self._path )
+        command = Git_command.fetch( src=self.src )
         command.run()
+
+
+def _stat_key( path ):
+    try:
+        stat = os.stat( path )
+    except FileNotFoundError:
+        return None
+    return ( stat.st_dev, stat.st_ino )
@@ -1,56 +1,322 @@
+import codecs
+import contextlib
+import contextvars
+import functools
+import logging
+import os
+import signal
+import tempfile
+import threading
+import time
+from subprocess import Popen, PIPE, TimeoutExpired
+
 from chibi.file import Chibi_path
 from chibi_atlas import Chibi_atlas
-from chibi_command import Command, Command_result
+from chibi_command import Command, Command_result, Result_error
+from chibi_git import trace
+from chibi_git.exception import Git_timeout
 from chibi_git.snippets import remove_start_asterisk
 
 
-def remove_type_from_status_string( file ):
-    return file.split( ' ', 1 )[1].strip()
+logger = logging.getLogger( 'chibi_git.command' )
+command_deadline = contextvars.ContextVar(
+    'chibi_git_command_deadline', default=None )
+
+
+@contextlib.contextmanager
+def deadline( seconds ):
+    """
+    limita el tiempo que pueden tardar los comandos de git ejecutados
+    dentro del bloque, si se pasa del tiempo el proceso se mata y se
+    lanza `Git_timeout`
+
+    Parameters
+    ----------
+    seconds: float or None
+        segundos para todo el bloque, None no tiene limite
+    """
+    if seconds is None:
+        token = command_deadline.set( None )
+    else:
+        token = command_deadline.set( time.monotonic() + seconds )
+    try:
+        yield
+    finally:
+        command_deadline.reset( token )
+
+
+class watchdog:
+    """
+    llama `kill` si se acaba el tiempo de `deadline` antes de llamar
+    `cancel`, se usa con los procesos que no se ejecutan con `Git.run`
+
+    Parameters
+    ----------
+    kill: callable
+        funcion que mata el proceso
+    """
+    def __init__( self, kill ):
+        self.expired = False
+        self._kill = kill
+        self._timer = None
+        limit = command_deadline.get()
+        if limit is not None:
+            self._timer = threading.Timer(
+                max( limit - time.monotonic(), 0 ), self._expire )
+            self._timer.daemon = True
+            self._timer.start()
+
+    @property
+    def active( self ):
+        return self._timer is not None
+
+    def _expire( self ):
+        self.expired = True
+        try:
+            self._kill()
+        except ProcessLookupError:
+            pass
+
+    def cancel( self ):
+        if self._timer is not None:
+            self._timer.cancel()
+
+
+def read_only_command( function ):
+    """
+    marca el comando que regresa la funcion como de solo lectura, solo
+    estos comandos se guardan en el `Command_cache`
+    """
+    @functools.wraps( function )
+    def wrapper( *args, **kw ):
+        command = function( *args, **kw )
+        command.read_only = True
+        return command
+    return wrapper
+
+
+class Command_cache:
+    """
+    cache de los resultados de los comandos de solo lectura de un repo
+
+    si varios hilos ejecutan el mismo comando al mismo tiempo solo se
+    ejecuta una vez y todos reciben el mismo resultado, cualquier comando
+    que no sea de solo lectura invalida el cache
+
+    Parameters
+    ----------
+    ttl: float, optional
+        segundos que dura cada resultado, None dura hasta que se invalide
+    """
+    def __init__( self, ttl=None ):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._results = {}
+        self._in_flight = {}
+        self._generation = 0
+
+    def __repr__( self ):
+        return f"Command_cache( ttl={self.ttl}, size={len( self._results )} )"
+
+    def run( self, key, function ):
+        """
+        regresa el resultado guardado de la llave o ejecuta la funcion,
+        si otro hilo ya la esta ejecutando espera su resultado
+        """
+        with self._lock:
+            cached = self._results.get( key )
+            if cached is not None:
+                result, expire = cached
+                if expire is None or expire > time.monotonic():
+                    return result
+                del self._results[ key ]
+            flight = self._in_flight.get( key )
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[ key ] = Chibi_atlas(
+                    done=threading.Event(), result=None, error=None )
+            generation = self._generation
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = function()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[ key ]
+                if flight.error is None and generation == self._generation:
+                    expire = None
+                    if self.ttl is not None:
+                        expire = time.monotonic() + self.ttl
+                    self._results[ key ] = ( flight.result, expire )
+            flight.done.set()
+        return flight.result
+
+    def invalidate( self ):
+        """
+        borra todos los resultados, los comandos en curso no se guardan
+        """
+        with self._lock:
+            self._results.clear()
+            self._generation += 1
+
+
+# caches activos en el contexto actual por ruta del repo, los hilos
+# nuevos no heredan el contexto por lo que no ven el cache
+_command_caches = contextvars.ContextVar(
+    'chibi_git_command_caches', default={} )
+
+
+@contextlib.contextmanager
+def command_cache( path, ttl=None ):
+    """
+    activa el `Command_cache` de un repo dentro del bloque, solo afecta
+    al contexto actual, para compartirlo con otros hilos se ejecutan con
+    `contextvars.copy_context().run`
+
+    si el repo ya tiene un cache activo en el contexto se reusa, debe
+    tener el mismo `ttl`
+
+    Parameters
+    ----------
+    path: str
+        ruta del repo
+    ttl: float, optional
+        segundos que dura cada resultado
+
+    Returns
+    -------
+    Command_cache
+
+    Raises
+    ------
+    ValueError
+        si el cache activo del repo tiene otro `ttl`
+    """
+    path = str( path )
+    caches = _command_caches.get()
+    cache = caches.get( path )
+    if cache is not None:
+        if cache.ttl != ttl:
+            raise ValueError(
+                f'el repo {path} ya tiene un snapshot activo con '
+                f'ttl={cache.ttl} y se pidio ttl={ttl}' )
+        yield cache
+        return
+    cache = Command_cache( ttl )
+    token = _command_caches.set( { **caches, path: cache } )
+    try:
+        yield cache
+    finally:
+        _command_caches.reset( token )
 
 
 class Status_result( Command_result ):
+    """
+    parsea la salida de `git status --porcelain=v2 -z --branch` en una
+    sola pasada
+
+    el resultado tiene los grupos por letra del status ( `modified`,
+    `added`, `untrack`, ... ) donde cada archivo esta en el grupo de la
+    letra del index y en el de la letra del work tree, `index` y
+    `worktree` con el estado de cada archivo por separado, `renamed_from`
+    con el path original de los archivos renombrados o copiados y
+    `branch` con los encabezados de la rama
+    """
+    groups = {
+        'M': 'modified', 'R': 'renamed', 'A': 'added', 'D': 'deleted',
+        'C': 'copied', 'T': 'type_change', 'U': 'update_no_merge',
+    }
+
     def parse_result( self ):
-        lines = self.result.split( '\n' )
-        lines = list( map( str.strip, lines ) )
-        # files = lines[1:]
-        result = Chibi_atlas()
-        untrack = filter( lambda x: x.startswith( "??" ), lines )
-        untrack = list( map( remove_type_from_status_string, untrack ) )
-        modified = filter( lambda x: x.startswith( "M" ), lines )
-        modified = list( map( remove_type_from_status_string, modified ) )
-        renamed = filter( lambda x: x.startswith( "R" ), lines )
-        renamed = list( map( remove_type_from_status_string, renamed ) )
-        added = filter( lambda x: x.startswith( "A" ), lines )
-        added = list( map( remove_type_from_status_string, added ) )
-        deleted = filter( lambda x: x.startswith( "D" ), lines )
-        deleted = list( map( remove_type_from_status_string, deleted ) )
-        copied = filter( lambda x: x.startswith( "C" ), lines )
-        copied = list( map( remove_type_from_status_string, copied ) )
-        type_change = filter( lambda x: x.startswith( "T" ), lines )
-        type_change = list(
-            map( remove_type_from_status_string, type_change ) )
-        update_no_merge = filter( lambda x: x.startswith( "U" ), lines )
-        update_no_merge = list(
-            map( remove_type_from_status_string, update_no_merge ) )
+        groups = { name: [] for name in self.groups.values() }
+        untrack = []
+        ignored = []
+        index = {}
+        worktree = {}
+        renamed_from = {}
+        branch = Chibi_atlas(
+            oid=None, head=None, upstream=None, ahead=0, behind=0 )
 
+        records = iter( self.result.split( '\0' ) )
+        for record in records:
+            if not record:
+                continue
+            kind = record[0]
+            if kind == '1':
+                fields = record.split( ' ', 8 )
+                self._add( fields[1], fields[8], groups, index, worktree )
+            elif kind == '2':
+                fields = record.split( ' ', 9 )
+                path = fields[9]
+                self._add( fields[1], path, groups, index, worktree )
+                renamed_from[ path ] = next( records )
+            elif kind == 'u':
+                fields = record.split( ' ', 10 )
+                path = fields[10]
+                groups[ 'update_no_merge' ].append( path )
+                index[ path ] = fields[1][0]
+                worktree[ path ] = fields[1][1]
+            elif kind == '?':
+                untrack.append( record[2:] )
+            elif kind == '!':
+                ignored.append( record[2:] )
+            elif kind == '#':
+                self._parse_header( record, branch )
+
+        result = Chibi_atlas( groups )
         result.untrack = untrack
-        result.modified = modified
-        result.renamed = renamed
-        result.added = added
-        result.deleted = deleted
-        result.copied = copied
-        result.update_no_merge = update_no_merge
-        result.type_change = type_change
+        result.ignored = ignored
+        result.index = index
+        result.worktree = worktree
+        result.renamed_from = renamed_from
+        result.branch = branch
         self.result = result
 
+    def _add( self, xy, path, groups, index, worktree ):
+        x, y = xy
+        if x != '.':
+            index[ path ] = x
+            groups[ self.groups[ x ] ].append( path )
+        if y != '.':
+            worktree[ path ] = y
+            if y != x:
+                groups[ self.groups[ y ] ].append( path )
+
+    def _parse_header( self, record, branch ):
+        name, value = record[2:].split( ' ', 1 )
+        if name == 'branch.oid':
+            branch.oid = None if value == '(initial)' else value
+        elif name == 'branch.head':
+            branch.head = None if value == '(detached)' else value
+        elif name == 'branch.upstream':
+            branch.upstream = value
+        elif name == 'branch.ab':
+            ahead, behind = value.split( ' ' )
+            branch.ahead = int( ahead )
+            branch.behind = -int( behind )
+
 
 class Clean_lines( Command_result ):
+    record_separator = '\n'
+
     def parse_result( self ):
         lines = self.result.split( '\n' )
         lines = filter( bool, lines )
         lines = map( str.strip, lines )
         self.result = list( lines )
 
+    @classmethod
+    def parse_record( cls, record ):
+        return record.strip()
+
 
 class Branch_result( Clean_lines ):
     def parse_result( self ):
@@ -70,6 +336,39 @@ class Show_ref_result( Clean_lines ):
         self.result = list( lines )
 
 
+class Diff_quiet_result( Command_result ):
+    """
+    resultado de `git diff --quiet`, el resultado es verdadero si hay
+    cambios ( codigo de salida 1 )
+    """
+    def parse_result( self ):
+        self.result = self.return_code == 1
+
+    def throw( self ):
+        if self.return_code not in ( 0, 1 ):
+            raise Result_error( self )
+
+
+class Config_result( Command_result ):
+    """
+    parsea la salida de `git config -z --get-regexp` en una lista de
+    pares ( llave, valor ), el codigo de salida 1 indica que no hubo
+    coincidencias
+    """
+    def parse_result( self ):
+        result = []
+        for entry in self.result.split( '\x00' ):
+            if not entry:
+                continue
+            key, value = ( entry.split( '\n', 1 ) + [ '' ] )[:2]
+            result.append( ( key, value ) )
+        self.result = result
+
+    def throw( self ):
+        if self.return_code not in ( 0, 1 ):
+            raise Result_error( self )
+
+
 class Clean_result( Command_result ):
     def parse_result( self ):
         self.result = self.result.strip()
@@ -83,22 +382,394 @@ class Rev_list_parse_result( Clean_lines ):
     pass
 
 
+class Log_result( Command_result ):
+    """
+    parsea la salida de `git log` con el formato de `Log_result.format`
+    cada registro termina con `record_separator` y los campos se separan
+    con `field_separator`, la fecha debe de estar en `--date=raw`
+    """
+    field_separator = '\x00'
+    record_separator = '\x1e'
+    format = '%H%x00%an%x00%ae%x00%ad%x00%B%x1e'
+
+    def parse_result( self ):
+        records = self.result.split( self.record_separator )
+        records = filter( lambda x: x.strip( '\n' ), records )
+        self.result = list( map( self.parse_record, records ) )
+
+    @classmethod
+    def parse_record( cls, record ):
+        hash, author, email, date, message = record.lstrip( '\n' ).split(
+            cls.field_separator, 4 )
+        timestamp, offset = date.split( ' ' )
+        return Chibi_atlas(
+            hash=hash, author=author, email=email,
+            timestamp=int( timestamp ), offset=parse_offset( offset ),
+            message=message )
+
+
+class Tag_index_result( Command_result ):
+    """
+    parsea la salida de `git for-each-ref refs/tags` con el formato de
+    `Tag_index_result.format`, incluye el objeto del tag, el commit pelado,
+    la fecha del tag ( o del commit en los tags ligeros ) y la anotacion
+    """
+    field_separator = '\x00'
+    record_separator = '\x1e'
+    format = (
+        '%(refname:strip=2)%00%(objectname)%00%(objecttype)%00'
+        '%(*objectname)%00%(*objecttype)%00%(creatordate:raw)%00'
+        '%(contents)%1e' )
+
+    def parse_result( self ):
+        records = self.result.split( self.record_separator )
+        records = filter( lambda x: x.strip( '\n' ), records )
+        self.result = list( map( self.parse_record, records ) )
+
+    @classmethod
+    def parse_record( cls, record ):
+        name, hash, type, peeled, peeled_type, date, message = (
+            record.lstrip( '\n' ).split( cls.field_separator, 6 ) )
+        if type != 'tag':
+            peeled, message = hash, None
+        elif peeled_type != 'commit':
+            peeled = None
+        timestamp, offset = date.split( ' ' ) if date else ( 0, '+0000' )
+        return Chibi_atlas(
+            name=name, hash=hash, type=type, peeled=peeled,
+            timestamp=int( timestamp ), offset=parse_offset( offset ),
+            message=message )
+
+
+class Branch_index_result( Command_result ):
+    """
+    parsea la salida de `git for-each-ref refs/heads refs/remotes` con el
+    formato de `Branch_index_result.format`, incluye la punta, el
+    upstream con cuantos commits va adelante y atras, la fecha y el autor
+    del ultimo commit
+
+    las referencias simbolicas remotas ( `refs/remotes/origin/HEAD` ) no
+    son ramas y se omiten
+    """
+    field_separator = '\x00'
+    record_separator = '\x1e'
+    format = (
+        '%(refname)%00%(symref)%00%(objectname)%00%(upstream:short)%00'
+        '%(upstream:track,nobracket)%00%(committerdate:raw)%00'
+        '%(authorname)%00%(authoremail:trim)%1e' )
+
+    def parse_result( self ):
+        records = self.result.split( self.record_separator )
+        records = filter( lambda x: x.strip( '\n' ), records )
+        records = map( self.parse_record, records )
+        self.result = list( filter( None, records ) )
+
+    @classmethod
+    def parse_record( cls, record ):
+        ref, symref, hash, upstream, track, date, author, email = (
+            record.lstrip( '\n' ).split( cls.field_separator, 7 ) )
+        if symref and ref.startswith( 'refs/remotes/' ):
+            return None
+        is_remote = ref.startswith( 'refs/remotes/' )
+        name = ref.split( '/', 2 )[2]
+        ahead = behind = 0
+        for part in track.split( ', ' ):
+            if part.startswith( 'ahead ' ):
+                ahead = int( part[ len( 'ahead ' ): ] )
+            elif part.startswith( 'behind ' ):
+                behind = int( part[ len( 'behind ' ): ] )
+        timestamp, offset = date.split( ' ' ) if date else ( 0, '+0000' )
+        return Chibi_atlas(
+            name=name, is_remote=is_remote, hash=hash,
+            upstream=upstream or None, ahead=ahead, behind=behind,
+            upstream_gone=track == 'gone',
+            timestamp=int( timestamp ), offset=parse_offset( offset ),
+            author=author, email=email )
+
+
+def parse_offset( offset ):
+    """
+    convierte la zona horaria de git ( +hhmm ) a minutos
+    """
+    sign = -1 if offset.startswith( '-' ) else 1
+    offset = offset.lstrip( '+-' )
+    return sign * ( int( offset[:2] ) * 60 + int( offset[2:] ) )
+
+
 class Remote_result( Command_result ):
     def parse_result( self ):
         self.result = list( filter( bool, self.result.split( '\n' ) ) )
 
 
+class Nul_result( Command_result ):
+    """
+    separa la salida de los comandos con `-z` en sus campos sin
+    interpretarlos
+    """
+    record_separator = '\x00'
+
+    def parse_result( self ):
+        self.result = list( filter( bool, self.result.split( '\x00' ) ) )
+
+    @classmethod
+    def parse_record( cls, record ):
+        return record
+
+
+class Line_result( Command_result ):
+    """
+    separa la salida en lineas sin quitarles los espacios
+    """
+    record_separator = '\n'
+
+    def parse_result( self ):
+        self.result = self.result.split( '\n' )
+
+    @classmethod
+    def parse_record( cls, record ):
+        return record
+
+
+class Record_reader:
+    """
+    separa la salida de un comando en registros conforme llegan los
+    pedazos de bytes, usa el `record_separator` y `parse_record` del
+    `result_class`
+    """
+    def __init__( self, result_class ):
+        self.separator = result_class.record_separator
+        self.parse_record = result_class.parse_record
+        self.decoder = codecs.getincrementaldecoder( 'utf-8' )()
+        self.pending = ''
+
+    def feed( self, chunk ):
+        """
+        agrega un pedazo de la salida y regresa los registros completos,
+        un pedazo vacio indica que termino la salida
+        """
+        self.pending += self.decoder.decode( chunk, final=not chunk )
+        *records, self.pending = self.pending.split( self.separator )
+        if not chunk:
+            records.append( self.pending )
+            self.pending = ''
+        return [
+            self.parse_record( record ) for record in records
+            if record.strip( '\n' ) ]
+
+
+class Repo_dirs:
+    """
+    ruta de un repo con su git dir y work tree ya resueltos, los comandos
+    que se construyen con el como `src` usan esos directorios en lugar de
+    `src/.git`
+
+    Parameters
+    ----------
+    path: Chibi_path
+        ruta con la que se creo el repo
+    git_dir: str
+    work_tree: str or None
+        None en repos bare
+    """
+    __slots__ = ( 'path', 'git_dir', 'work_tree' )
+
+    def __init__( self, path, git_dir, work_tree ):
+        self.path = Chibi_path( path )
+        self.git_dir = git_dir
+        self.work_tree = work_tree
+
+    def __str__( self ):
+        return str( self.path )
+
+    def __repr__( self ):
+        return (
+            f"Repo_dirs( path={self.path}, git_dir={self.git_dir}, "
+            f"work_tree={self.work_tree} )" )
+
+
 class Git( Command ):
     command = 'git'
     captive = True
+    src = None
+    read_only = False
+    stream_chunk_size = 64 * 1024
+
+    @property
+    def _command_cache( self ):
+        """
+        `Command_cache` activo del repo del comando o None
+        """
+        if not self.src:
+            return None
+        return _command_caches.get().get( str( self.src ) )
+
+    def invalidate_cache( self ):
+        """
+        invalida el `Command_cache` activo del repo si el comando puede
+        modificar el repo, se usa al ejecutar el comando fuera de `run`
+        """
+        cache = self._command_cache
+        if cache is not None and not self.read_only:
+            cache.invalidate()
+
+    def run( self, *args, stdin=None, **kw ):
+        cache = self._command_cache
+        if cache is None:
+            return self._run( *args, stdin=stdin, **kw )
+        if not self.read_only:
+            try:
+                return self._run( *args, stdin=stdin, **kw )
+            finally:
+                cache.invalidate()
+        key = (
+            tuple( map( str, self.build_tuple( *args, **kw ) ) ), stdin,
+            self.raise_on_fail, self.result_class )
+        return cache.run(
+            key, lambda: self._run( *args, stdin=stdin, **kw ) )
+
+    def _run( self, *args, stdin=None, **kw ):
+        limit = command_deadline.get()
+        logger.info( 'ejecutando "{}"'.format( self.preview( *args, **kw ) ) )
+        record = trace.start( self, args=args, kw=kw )
+        if limit is None:
+            proc = self._build_proccess( *args, stdin=stdin, **kw )
+        else:
+            arguments = self.build_tuple( *args, **kw )
+            arguments = tuple( map( lambda x: str( x ), arguments ) )
+            # git puede crear otros procesos ( ssh, remote-https, alias ) por
+            # eso se crea en su propio grupo para matarlos a todos
+            proc = Popen(
+                arguments, stdin=PIPE if stdin is not None else None,
+                stdout=self.stdout, stderr=self.stderr, env=self.env or None,
+                start_new_session=True )
+        if isinstance( stdin, str ):
+            stdin = stdin.encode()
+        try:
+            if limit is None:
+                result, error = proc.communicate( stdin )
+            else:
+                result, error = proc.communicate(
+                    stdin, timeout=max( limit - time.monotonic(), 0 ) )
+        except TimeoutExpired as e:
+            os.killpg( proc.pid, signal.SIGKILL )
+            proc.communicate()
+            trace.finish( record, proc.returncode )
+            raise Git_timeout(
+                f'se acabo el tiempo ejecutando "{self.preview()}"' ) from e
+        trace.finish(
+            record, proc.returncode, len( result or b'' ),
+            len( error or b'' ) )
+
+        if result is not None:
+            result = result.decode( 'utf-8' )
+        if error is not None:
+            error = error.decode( 'utf-8' )
+        result = self.result_class(
+            result, error, proc.returncode, command=self )
+        if self.raise_on_fail:
+            result.throw()
+        return result
+
+    def stream( self, *args, stdin=None, **kw ):
+        """
+        ejecuta el comando y regresa los registros conforme git los
+        escribe en stdout, los registros se separan con el
+        `record_separator` del `result_class` y se parsean con su
+        `parse_record`
+
+        si el generador se cierra antes de terminar el proceso de git
+        se mata, dentro de `deadline` se mata cuando se acaba el tiempo y
+        se lanza `Git_timeout`
+
+        Parameters
+        ----------
+        stdin: str, optional
+            texto que se le enviara al proceso
+
+        Returns
+        -------
+        generator
+        """
+        logger.info( 'ejecutando "{}"'.format( self.preview( *args, **kw ) ) )
+        arguments = self.build_tuple( *args, **kw )
+        arguments = tuple( map( lambda x: str( x ), arguments ) )
+        reader = Record_reader( self.result_class )
+        record = trace.start( self, kind='stream', args=args, kw=kw )
+
+        error_file = tempfile.TemporaryFile()
+        has_limit = command_deadline.get() is not None
+        # igual que en `_run` con limite de tiempo se crea en su propio
+        # grupo para matar a los procesos hijos de git
+        proc = Popen(
+            arguments, stdin=PIPE if stdin is not None else None,
+            stdout=PIPE, stderr=error_file, env=self.env or None,
+            start_new_session=has_limit )
+        timer = watchdog( lambda: os.killpg( proc.pid, signal.SIGKILL ) )
+        writer = None
+        if stdin is not None:
+            writer = threading.Thread(
+                target=self._write_stdin, args=( proc.stdin, stdin ),
+                daemon=True )
+            writer.start()
+
+        size = 0
+        try:
+            while True:
+                chunk = proc.stdout.read1( self.stream_chunk_size )
+                size += len( chunk )
+                yield from reader.feed( chunk )
+                if not chunk:
+                    break
+            proc.wait()
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+            if writer is not None:
+                writer.join()
+            self.invalidate_cache()
+            trace.finish(
+                record, proc.returncode, size,
+                os.fstat( error_file.fileno() ).st_size )
+            error_file.seek( 0 )
+            error = error_file.read().decode( 'utf-8', 'replace' )
+            error_file.close()
+
+        if timer.expired:
+            raise Git_timeout(
+                f'se acabo el tiempo ejecutando "{self.preview()}"' )
+        if proc.returncode and self.raise_on_fail:
+            raise Result_error( Command_result(
+                None, error, proc.returncode, command=self ) )
+
+    @staticmethod
+    def _write_stdin( pipe, stdin ):
+        if isinstance( stdin, str ):
+            stdin = stdin.encode()
+        try:
+            pipe.write( stdin )
+            pipe.close()
+        except ( BrokenPipeError, ValueError ):
+            logger.debug( 'el proceso cerro stdin antes de terminar' )
 
     @classmethod
+    @read_only_command
     def rev_parse( cls, *args, src=None, **kw ):
         command = cls._build_command(
             'rev-parse', *args, src=src, result_class=Rev_parse_result, **kw )
         return command
 
     @classmethod
+    @read_only_command
+    def symbolic_ref( cls, *args, src=None ):
+        command = cls._build_command(
+            'symbolic-ref', *args, src=src, result_class=Clean_result )
+        return command
+
+    @classmethod
+    @read_only_command
     def rev_list( cls, *args, src=None, **kw ):
         command = cls._build_command(
             'rev-list', *args, src=src,
@@ -111,20 +782,64 @@ class Git( Command ):
             'checkout', *args, src=src, **kw )
         return command
 
+    @classmethod
+    def reset( cls, *args, src=None, **kw ):
+        command = cls._build_command(
+            'reset', *args, src=src, **kw )
+        return command
+
     @classmethod
     def init( cls, src=None ):
         command = cls._build_command( 'init', src=src )
         return command
 
     @classmethod
+    @read_only_command
     def log( cls, *args, src=None, **kw ):
         command = cls._build_command( 'log', *args, src=src, **kw )
         return command
 
     @classmethod
+    @read_only_command
+    def log__info( cls, *args, src=None ):
+        """
+        wrapper de git log que regresa la informacion de todos los commits
+        en una sola ejecucion
+        """
+        command = cls._build_command(
+            'log', f'--format={Log_result.format}', '--date=raw', *args,
+            src=src,
+            result_class=Log_result )
+        return command
+
+    @classmethod
+    @read_only_command
     def status( cls, src=None ):
         command = cls._build_command(
-            'status', '-sb', src=src, result_class=Status_result )
+            'status', '--porcelain=v2', '-z', '--branch', src=src,
+            result_class=Status_result )
+        return command
+
+    @classmethod
+    @read_only_command
+    def diff__quiet( cls, *args, src=None ):
+        """
+        wrapper de git diff --quiet, solo regresa si hay cambios y git se
+        detiene en el primer cambio que encuentra
+        """
+        command = cls._build_command(
+            'diff', '--quiet', '--no-ext-diff', *args, src=src,
+            result_class=Diff_quiet_result )
+        return command
+
+    @classmethod
+    @read_only_command
+    def ls_files( cls, *args, src=None ):
+        """
+        wrapper de git ls-files
+        """
+        command = cls._build_command(
+            'ls-files', *args, src=src, result_class=Clean_lines )
         return command
 
     @classmethod
@@ -132,6 +847,15 @@ class Git( Command ):
         command = cls._build_command( 'add', file, src=src, )
         return command
 
+    @classmethod
+    def add__pathspec_from_file( cls, src=None ):
+        """
+        wrapper de git add que lee los paths de stdin separados por NUL
+        """
+        command = cls._build_command(
+            'add', '--pathspec-from-file=-', '--pathspec-file-nul', src=src )
+        return command
+
     @classmethod
     def commit( cls, message, src=None ):
         command = cls._build_command( 'commit', '-m', message, src=src, )
@@ -148,16 +872,38 @@ class Git( Command ):
 
     @classmethod
     def _build_command( cls, *args, src=None, **kw ):
-        if src:
-            src = Chibi_path( src )
+        if isinstance( src, Repo_dirs ):
+            dirs = src
+            src = dirs.path
+            options = [ f'--git-dir={dirs.git_dir}' ]
+            if dirs.work_tree is not None:
+                options.append( f'--work-tree={dirs.work_tree}' )
         else:
-            src = Chibi_path( '.' )
+            src = Chibi_path( src ) if src else Chibi_path( '.' )
+            options = [ f'--git-dir={src}/.git', f'--work-tree={src}' ]
+        command = cls( *options, *args, **kw )
+        command.src = src
+        return command
+
+    @classmethod
+    @read_only_command
+    def rev_parse__discover( cls, path ):
+        """
+        busca el git dir, common dir y work tree desde `path` sin forzar
+        `--git-dir` para encontrar subdirectorios, worktrees y repos bare,
+        en los repos bare git falla en `--show-toplevel` despues de
+        escribir lo demas
+        """
         command = cls(
-            f'--git-dir={src}/.git', f'--work-tree={src}',
-            *args, **kw )
+            '-C', path, 'rev-parse', '--path-format=absolute', '--git-dir',
+            '--git-common-dir', '--is-bare-repository', '--show-toplevel',
+            result_class=Line_result )
+        command.src = Chibi_path( path )
+        command.raise_on_fail = False
         return command
 
     @classmethod
+    @read_only_command
     def remote( cls, src=None ):
         command = cls._build_command(
             'remote', src=src,
@@ -165,6 +911,7 @@ class Git( Command ):
         return command
 
     @classmethod
+    @read_only_command
     def remote__get_url( cls, name, src=None ):
         command = cls._build_command(
             'remote', 'get-url', name, src=src,
@@ -172,6 +919,18 @@ class Git( Command ):
         )
         return command
 
+    @classmethod
+    @read_only_command
+    def config__get_regexp( cls, pattern, src=None ):
+        """
+        wrapper de git config --get-regexp que regresa las llaves y sus
+        valores
+        """
+        command = cls._build_command(
+            'config', '-z', '--get-regexp', pattern, src=src,
+            result_class=Config_result )
+        return command
+
     @classmethod
     def remote__add( cls, name, url, src=None ):
         command = cls._build_command(
@@ -180,11 +939,55 @@ class Git( Command ):
         return command
 
     @classmethod
-    def clone( cls, url, directory=None ):
+    def clone(
+            cls, url, directory=None, depth=None, filter=None,
+            single_branch=False, branch=None, no_checkout=False,
+            recurse_submodules=False, jobs=None, reference=None ):
+        """
+        wrapper de git clone
+
+        Parameters
+        ----------
+        depth: int, optional
+            clona solo los ultimos commits ( --depth )
+        filter: str, optional
+            filtro para clones parciales, por ejemplo `blob:none` o
+            `tree:0` ( --filter )
+        single_branch: bool
+            solo clona la rama de HEAD o la de `branch`
+        branch: str, optional
+            rama que se clonara y se usara de HEAD
+        no_checkout: bool
+            no llena el work tree despues de clonar
+        recurse_submodules: bool
+            clona tambien los submodulos
+        jobs: int, optional
+            numero de submodulos que se clonan al mismo tiempo
+        reference: str, optional
+            repo local del cual se comparten los objetos
+        """
+        args = []
+        if depth is not None:
+            args.append( f'--depth={depth}' )
+        if filter is not None:
+            args.append( f'--filter={filter}' )
+        if single_branch:
+            args.append( '--single-branch' )
+        if branch is not None:
+            args += [ '--branch', branch ]
+        if no_checkout:
+            args.append( '--no-checkout' )
+        if recurse_submodules:
+            args.append( '--recurse-submodules' )
+        if jobs is not None:
+            args.append( f'--jobs={jobs}' )
+        if reference is not None:
+            args += [ '--reference', reference ]
+
         if directory is not None:
-            command = cls( 'clone', url, directory )
+            command = cls( 'clone', *args, url, directory )
         else:
-            command = cls( 'clone', url )
+            command = cls( 'clone', *args, url )
 
         return command
 
@@ -211,6 +1014,7 @@ class Git( Command ):
         return command
 
     @classmethod
+    @read_only_command
     def show_ref( cls, ref, src=None ):
         """
         wrapper de git show-ref
@@ -219,6 +1023,94 @@ class Git( Command ):
             'show-ref', ref, src=src, result_class=Show_ref_result )
         return command
 
+    @classmethod
+    @read_only_command
+    def for_each_ref( cls, *args, src=None ):
+        """
+        wrapper de git for-each-ref
+        """
+        command = cls._build_command(
+            'for-each-ref', *args, src=src, result_class=Show_ref_result )
+        return command
+
+    @classmethod
+    @read_only_command
+    def for_each_ref__tags( cls, src=None ):
+        """
+        wrapper de git for-each-ref que regresa todos los tags con su
+        informacion en una sola ejecucion
+        """
+        command = cls._build_command(
+            'for-each-ref', f'--format={Tag_index_result.format}',
+            'refs/tags', src=src, result_class=Tag_index_result )
+        return command
+
+    @classmethod
+    @read_only_command
+    def for_each_ref__branches( cls, src=None ):
+        """
+        wrapper de git for-each-ref que regresa las ramas locales y
+        remotas con su informacion en una sola ejecucion
+        """
+        command = cls._build_command(
+            'for-each-ref', f'--format={Branch_index_result.format}',
+            'refs/heads', 'refs/remotes', src=src,
+            result_class=Branch_index_result )
+        return command
+
+    @classmethod
+    @read_only_command
+    def diff_tree( cls, *args, src=None ):
+        """
+        wrapper de git diff-tree para usarse con `-z`, regresa los campos
+        de la salida separados
+        """
+        command = cls._build_command(
+            '-c', 'core.quotePath=false', 'diff-tree', *args, src=src,
+            result_class=Nul_result )
+        return command
+
+    @classmethod
+    @read_only_command
+    def diff_tree__patch( cls, *args, src=None ):
+        """
+        wrapper de git diff-tree que regresa el patch linea por linea
+        """
+        command = cls._build_command(
+            '-c', 'core.quotePath=false', 'diff-tree', '-p', *args,
+            src=src, result_class=Line_result )
+        return command
+
+    @classmethod
+    @read_only_command
+    def blame( cls, *args, src=None ):
+        """
+        wrapper de git blame que regresa la salida linea por linea
+        """
+        command = cls._build_command(
+            '-c', 'core.quotePath=false', 'blame', *args, src=src,
+            result_class=Line_result )
+        return command
+
+    @classmethod
+    @read_only_command
+    def ls_tree( cls, *args, src=None ):
+        """
+        wrapper de git ls-tree para usarse con `-z`, regresa cada entrada
+        separada
+        """
+        command = cls._build_command(
+            'ls-tree', *args, src=src, result_class=Nul_result )
+        return command
+
+    @classmethod
+    def cat_file( cls, *args, src=None ):
+        """
+        wrapper de git cat-file
+        """
+        command = cls._build_command( 'cat-file', *args, src=src )
+        return command
+
     @classmethod
     def fetch( cls, src=None ):
         """
@@ -0,0 +1,161 @@
+from chibi_atlas import Chibi_atlas
+
+
+def parse_diff_tree( fields ):
+    """
+    parsea los campos de `git diff-tree -z` con `--raw` o `--numstat`
+    conforme llegan
+
+    Parameters
+    ----------
+    fields: iterable of str
+        campos separados por NUL
+
+    Returns
+    -------
+    generator
+        el hash de cada commit como str cuando se usa `--stdin` y un
+        `Chibi_atlas` por archivo, con `--raw` tiene `path`, `old_path`,
+        `status`, `score`, `old_mode`, `new_mode`, `old_hash` y
+        `new_hash`, con `--numstat` tiene `path`, `old_path`, `added` y
+        `deleted` ( None en archivos binarios )
+    """
+    fields = iter( fields )
+    for field in fields:
+        if field.startswith( ':' ):
+            old_mode, new_mode, old_hash, new_hash, status = (
+                field[1:].split( ' ' ) )
+            old_path = None
+            if status[0] in 'RC':
+                old_path = next( fields )
+            yield Chibi_atlas(
+                path=next( fields ), old_path=old_path, status=status[0],
+                score=int( status[1:] ) if status[1:] else None,
+                old_mode=old_mode, new_mode=new_mode, old_hash=old_hash,
+                new_hash=new_hash )
+        elif '\t' in field:
+            added, deleted, path = field.split( '\t', 2 )
+            old_path = None
+            if not path:
+                old_path = next( fields )
+                path = next( fields )
+            yield Chibi_atlas(
+                path=path, old_path=old_path,
+                added=None if added == '-' else int( added ),
+                deleted=None if deleted == '-' else int( deleted ) )
+        else:
+            yield field.strip( '\n' )
+
+
+def parse_patch( lines ):
+    """
+    separa las lineas de un patch por archivo conforme llegan, solo se
+    guarda en memoria el patch de un archivo a la vez
+
+    Returns
+    -------
+    generator of Chibi_atlas
+        con `path`, `old_path` y `text` del patch del archivo
+    """
+    current = None
+    for line in lines:
+        if line.startswith( 'diff --git ' ):
+            if current is not None:
+                yield _build_patch( current )
+            current = [ line ]
+        elif current is not None:
+            current.append( line )
+    if current is not None:
+        yield _build_patch( current )
+
+
+def _build_patch( lines ):
+    old_path, path = _split_header( lines[0][ len( 'diff --git ' ): ] )
+    for line in lines[1:]:
+        if line.startswith( '@@' ):
+            break
+        if line.startswith( 'rename from ' ):
+            old_path = unquote_path( line[ len( 'rename from ' ): ] )
+        elif line.startswith( 'rename to ' ):
+            path = unquote_path( line[ len( 'rename to ' ): ] )
+        elif line.startswith( '--- ' ):
+            old_path = _patch_path( line[ 4: ], 'a/', old_path )
+        elif line.startswith( '+++ ' ):
+            path = _patch_path( line[ 4: ], 'b/', path )
+    return Chibi_atlas(
+        path=path, old_path=None if old_path == path else old_path,
+        text='\n'.join( lines ) + '\n' )
+
+
+def _split_header( header ):
+    """
+    separa las rutas de `diff --git a/x b/y`, cualquiera de las dos puede
+    venir entre comillas
+    """
+    if header.startswith( '"' ):
+        end = _quote_end( header )
+        old_path, path = header[ :end ], header[ end + 1: ]
+    elif header.endswith( '"' ):
+        start = header.rindex( ' "' )
+        old_path, path = header[ :start ], header[ start + 1: ]
+    elif ' b/' in header:
+        old_path, path = header.rsplit( ' b/', 1 )
+        path = 'b/' + path
+    else:
+        old_path, path = header, header
+    return (
+        _strip_prefix( unquote_path( old_path ), 'a/' ),
+        _strip_prefix( unquote_path( path ), 'b/' ) )
+
+
+def _quote_end( value ):
+    i = 1
+    while value[ i ] != '"':
+        i += 2 if value[ i ] == '\\' else 1
+    return i + 1
+
+
+def _strip_prefix( path, prefix ):
+    return path[ len( prefix ): ] if path.startswith( prefix ) else path
+
+
+def _patch_path( value, prefix, default ):
+    """
+    ruta de las lineas `---` y `+++`, git agrega un tab al final cuando
+    el nombre tiene espacios
+    """
+    if value == '/dev/null':
+        return default
+    if not value.startswith( '"' ):
+        value = value.rstrip( '\t' )
+    return _strip_prefix( unquote_path( value ), prefix )
+
+
+_escapes = {
+    'a': 7, 'b': 8, 't': 9, 'n': 10, 'v': 11, 'f': 12, 'r': 13, '"': 34,
+    '\\': 92,
+}
+
+
+def unquote_path( value ):
+    """
+    quita las comillas de las rutas que git escribe como strings de C
+    ( con escapes y bytes en octal ), las demas se regresan igual
+    """
+    if len( value ) < 2 or value[0] != '"' or value[-1] != '"':
+        return value
+    body = value[ 1:-1 ]
+    result = bytearray()
+    i = 0
+    while i < len( body ):
+        char = body[ i ]
+        if char != '\\':
+            result += char.encode()
+            i += 1
+        elif body[ i + 1 ] in '01234567':
+            result.append( int( body[ i + 1:i + 4 ], 8 ) )
+            i += 4
+        else:
+            result.append( _escapes[ body[ i + 1 ] ] )
+            i += 2
+    return result.decode( 'utf-8', 'replace' )
@@ -1,2 +1,10 @@
 class Git_not_initiate( Exception ):
     pass
+
+
+class Git_object_not_found( KeyError ):
+    pass
+
+
+class Git_timeout( TimeoutError ):
+    pass
@@ -0,0 +1,236 @@
+import collections
+from array import array
+
+from chibi_git.command import Git
+from chibi_git.obj import Commit
+
+
+class Commit_graph:
+    """
+    grafo de commits en memoria construido con un solo
+    `git rev-list --parents` leido conforme git lo escribe
+
+    los padres e hijos se guardan en arreglos de enteros indexados por
+    commit por lo que las consultas de ancestros no crean procesos
+
+    Parameters
+    ----------
+    repo: chibi_git.Git
+        repo del grafo
+    revs: str
+        revisiones que se cargaran, por default `--all`
+    """
+    def __init__( self, repo, *revs ):
+        self.repo = repo
+        self.revs = revs or ( '--all', )
+        self.version = None
+        self._index = {}
+        self._hashes = []
+        self._load()
+
+    def __repr__( self ):
+        return f"Commit_graph( repo={self.repo}, commits={len( self )} )"
+
+    def __len__( self ):
+        return len( self._hashes )
+
+    def __contains__( self, commit ):
+        return self._find( commit ) is not None
+
+    def _node( self, hash ):
+        try:
+            return self._index[ hash ]
+        except KeyError:
+            node = self._index[ hash ] = len( self._hashes )
+            self._hashes.append( hash )
+            return node
+
+    def _load( self ):
+        command = Git.rev_list(
+            '--parents', *self.revs, src=self.repo.src )
+        edges = array( 'i' )
+        owners = array( 'i' )
+        for line in command.stream():
+            hash, *parents = line.split( ' ' )
+            node = self._node( hash )
+            for parent in parents:
+                owners.append( node )
+                edges.append( self._node( parent ) )
+        size = len( self._hashes )
+        self._parents = _compress( size, owners, edges )
+        self._children = _compress( size, edges, owners )
+
+    def _find( self, commit ):
+        hash = str( getattr( commit, 'commit', commit ) )
+        node = self._index.get( hash )
+        if node is None:
+            resolved = self.repo.refs.resolve( hash )
+            if resolved is not None:
+                node = self._index.get( resolved )
+        return node
+
+    def _get( self, commit ):
+        node = self._find( commit )
+        if node is None:
+            raise KeyError(
+                f'no se encontro "{commit}" en el grafo de {self.repo.path}' )
+        return node
+
+    def _commits( self, nodes ):
+        return [ Commit( self.repo, self._hashes[ n ] ) for n in nodes ]
+
+    def _edges( self, edges, node ):
+        offsets, targets = edges
+        return targets[ offsets[ node ]:offsets[ node + 1 ] ]
+
+    def _reach( self, starts, edges, stop=None ):
+        """
+        marca todos los nodos alcanzables desde los inicios incluyendolos
+        """
+        seen = bytearray( len( self._hashes ) )
+        offsets, targets = edges
+        pending = collections.deque()
+        for start in starts:
+            if not seen[ start ]:
+                seen[ start ] = 1
+                pending.append( start )
+        while pending:
+            node = pending.pop()
+            if node == stop:
+                return seen
+            for i in range( offsets[ node ], offsets[ node + 1 ] ):
+                target = targets[ i ]
+                if not seen[ target ]:
+                    seen[ target ] = 1
+                    pending.append( target )
+        return seen
+
+    def parents( self, commit ):
+        return self._commits(
+            self._edges( self._parents, self._get( commit ) ) )
+
+    def children( self, commit ):
+        return self._commits(
+            self._edges( self._children, self._get( commit ) ) )
+
+    def is_ancestor( self, ancestor, commit ):
+        """
+        si `ancestor` es ancestro de `commit` o el mismo commit como
+        `git merge-base --is-ancestor`
+        """
+        ancestor = self._get( ancestor )
+        seen = self._reach(
+            [ self._get( commit ) ], self._parents, stop=ancestor )
+        return bool( seen[ ancestor ] )
+
+    def merge_bases( self, a, b ):
+        """
+        regresa todos los mejores ancestros comunes de los commits
+        """
+        ancestors_a = self._reach( [ self._get( a ) ], self._parents )
+        ancestors_b = self._reach( [ self._get( b ) ], self._parents )
+        common = [
+            i for i, ( x, y ) in enumerate( zip( ancestors_a, ancestors_b ) )
+            if x and y ]
+        parents = [
+            parent for node in common
+            for parent in self._edges( self._parents, node ) ]
+        redundant = self._reach( parents, self._parents )
+        return self._commits( n for n in common if not redundant[ n ] )
+
+    def merge_base( self, a, b ):
+        """
+        regresa un mejor ancestro comun de los commits o None
+        """
+        bases = self.merge_bases( a, b )
+        return bases[0] if bases else None
+
+    def ahead_behind( self, a, b ):
+        """
+        regresa cuantos commits tiene `a` que no tiene `b` y cuantos tiene
+        `b` que no tiene `a`
+
+        Returns
+        -------
+        tuple of int
+        """
+        ancestors_a = self._reach( [ self._get( a ) ], self._parents )
+        ancestors_b = self._reach( [ self._get( b ) ], self._parents )
+        ahead = behind = 0
+        for x, y in zip( ancestors_a, ancestors_b ):
+            if x and not y:
+                ahead += 1
+            elif y and not x:
+                behind += 1
+        return ahead, behind
+
+    def topological_order( self ):
+        """
+        regresa los commits en orden topologico, los hijos antes que sus
+        padres
+
+        Returns
+        -------
+        list of Commit
+        """
+        offsets, targets = self._children
+        pending = [
+            offsets[ n + 1 ] - offsets[ n ] for n in range( len( self ) ) ]
+        ready = [ n for n, count in enumerate( pending ) if not count ]
+        ready.reverse()
+        result = []
+        parent_offsets, parents = self._parents
+        while ready:
+            node = ready.pop()
+            result.append( node )
+            for i in range(
+                    parent_offsets[ node + 1 ] - 1,
+                    parent_offsets[ node ] - 1, -1 ):
+                parent = parents[ i ]
+                pending[ parent ] -= 1
+                if not pending[ parent ]:
+                    ready.append( parent )
+        return self._commits( result )
+
+    def descendants( self, commit ):
+        """
+        regresa los commits que contienen al commit incluyendolo
+        """
+        seen = self._reach( [ self._get( commit ) ], self._children )
+        return self._commits( n for n, x in enumerate( seen ) if x )
+
+    def containing( self, commit, branches ):
+        """
+        regresa las ramas o tags cuya punta contiene al commit, los
+        descendientes se calculan una sola vez para todas las ramas
+
+        Parameters
+        ----------
+        commit: Commit or str
+        branches: iterable of Branch or Tag
+        """
+        seen = self._reach( [ self._get( commit ) ], self._children )
+        result = []
+        for branch in branches:
+            node = self._find( branch.commit )
+            if node is not None and seen[ node ]:
+                result.append( branch )
+        return result
+
+
+def _compress( size, sources, targets ):
+    """
+    convierte una lista de aristas en arreglos de offsets y destinos
+    ordenados por nodo de origen
+    """
+    offsets = array( 'i', [ 0 ] ) * ( size + 1 )
+    for source in sources:
+        offsets[ source + 1 ] += 1
+    for i in range( size ):
+        offsets[ i + 1 ] += offsets[ i ]
+    position = array( 'i', offsets[:-1] )
+    result = array( 'i', [ 0 ] ) * len( targets )
+    for source, target in zip( sources, targets ):
+        result[ position[ source ] ] = target
+        position[ source ] += 1
+    return offsets, result
@@ -1,17 +1,121 @@
 import datetime
-import functools
+import io
 import re
+import sys
+import warnings
+import weakref
 
 from chibi.file import Chibi_path
-from chibi_atlas import Chibi_atlas
 
-from chibi_git.command import Git
+from chibi_git.cat_file import Blob_stream
+from chibi_git.command import Git, parse_offset
+from chibi_git.exception import Git_object_not_found
+from chibi_git.tree import Tree
+
+
+def build_date( timestamp, offset ):
+    """
+    construye el datetime de un epoch y la zona horaria en minutos
+    """
+    tz = datetime.timezone( datetime.timedelta( minutes=offset ) )
+    return datetime.datetime.fromtimestamp( timestamp, tz )
+
+
+class Commit_author:
+    """
+    autor de un commit, los autores se comparten entre todos los commits
+    con el mismo nombre y correo mientras alguno los use
+    """
+    __slots__ = ( 'author', 'email', '__weakref__' )
+    _authors = weakref.WeakValueDictionary()
+
+    def __new__( cls, author, email ):
+        key = ( author, email )
+        try:
+            return cls._authors[ key ]
+        except KeyError:
+            pass
+        result = super().__new__( cls )
+        result.author = sys.intern( author )
+        result.email = sys.intern( email )
+        return cls._authors.setdefault( key, result )
+
+    def __getitem__( self, name ):
+        return getattr( self, name )
+
+    def __eq__( self, other ):
+        if isinstance( other, Commit_author ):
+            return (
+                self.author == other.author and self.email == other.email )
+        return NotImplemented
+
+    def __hash__( self ):
+        return hash( ( self.author, self.email ) )
+
+    def __str__( self ):
+        return f"{self.author} <{self.email}>"
+
+    def __repr__( self ):
+        return f"Commit_author( author={self.author}, email={self.email} )"
+
+
+class Commit_info:
+    """
+    informacion compacta de un commit, la fecha se guarda como epoch y
+    zona horaria en minutos y el datetime se construye al pedirlo
+    """
+    __slots__ = ( 'author', 'timestamp', 'offset', 'message' )
+
+    def __init__( self, author, email, timestamp, offset, message ):
+        self.author = Commit_author( author, email )
+        self.timestamp = timestamp
+        self.offset = offset
+        self.message = message
+
+    @property
+    def date( self ):
+        return build_date( self.timestamp, self.offset )
+
+    def __getitem__( self, name ):
+        return getattr( self, name )
+
+    def __eq__( self, other ):
+        if isinstance( other, Commit_info ):
+            return (
+                self.author is other.author
+                and self.timestamp == other.timestamp
+                and self.offset == other.offset
+                and self.message == other.message )
+        return NotImplemented
+
+    def __repr__( self ):
+        return (
+            f"Commit_info( author={self.author!r}, date={self.date}, "
+            f"message={self.message!r} )" )
 
 
 class Commit:
-    def __init__( self, repo, hash ):
-        self.repo = repo
-        self._hash = hash
+    """
+    commit del repo, hay un solo objeto por hash en cada repo por lo que
+    su info solo se obtiene una vez
+    """
+    __slots__ = ( 'repo', '_hash', '_info', '_tree', '__weakref__' )
+    # tamaño maximo en bytes para que `open` lea el archivo completo
+    small_blob_size = 1024 * 1024
+
+    def __new__( cls, repo, hash, info=None ):
+        with repo._commits_lock:
+            commit = repo._commits.get( hash )
+            if commit is None:
+                commit = super().__new__( cls )
+                commit.repo = repo
+                commit._hash = hash
+                commit._info = None
+                commit._tree = None
+                repo._commits[ hash ] = commit
+        if info is not None and commit._info is None:
+            commit._info = info
+        return commit
 
     @property
     def author( self ):
@@ -35,17 +139,166 @@ class Commit:
             raise NotImplementedError(
                 f"no implementado con el {type(other)}( {str(other)} )" )
 
+    @property
+    def parents( self ):
+        return self.repo.graph.parents( self )
+
+    def is_ancestor( self, other ):
+        """
+        si el commit es ancestro de `other` usando el grafo del repo
+        """
+        return self.repo.graph.is_ancestor( self, other )
+
+    def merge_base( self, other ):
+        return self.repo.graph.merge_base( self, other )
+
+    @property
+    def branches( self ):
+        """
+        ramas locales que contienen el commit
+        """
+        return self.repo.graph.containing(
+            self, self.repo.branches.local.values() )
+
+    def diff( self, renames=True ):
+        """
+        archivos que cambiaron en el commit contra su primer padre, ver
+        `chibi_git.Git.diff`
+        """
+        return self.repo.diff( self, renames=renames )
+
+    def stats( self, renames=True ):
+        """
+        lineas agregadas y borradas de cada archivo del commit, ver
+        `chibi_git.Git.stats`
+        """
+        return self.repo.stats( self, renames=renames )
+
+    def patch( self, renames=True ):
+        """
+        patch de cada archivo del commit, ver `chibi_git.Git.patch`
+        """
+        return self.repo.patch( self, renames=renames )
+
+    @property
+    def tree( self ):
+        """
+        `Tree` de la raiz del commit, los directorios se leen hasta que se
+        usan y se guardan en el commit
+
+        Examples
+        --------
+        >>> commit.tree[ 'chibi_git/obj.py' ].size
+        >>> [ entry.path for entry in commit.tree.walk() ]
+        """
+        if self._tree is None:
+            info = self.repo.objects.info( f"{self._hash}^{{tree}}" )
+            if info is None:
+                raise Git_object_not_found(
+                    f'no se encontro el tree del commit {self._hash}' )
+            self._tree = Tree( self.repo, info.hash )
+        return self._tree
+
+    def read( self, path ):
+        """
+        lee el contenido de un archivo como estaba en el commit sin hacer
+        checkout, se usa el pool de `git cat-file --batch` del repo
+
+        Parameters
+        ----------
+        path: str
+            ruta del archivo relativa a la raiz del repo
+
+        Returns
+        -------
+        bytes
+
+        Raises
+        ------
+        Git_object_not_found
+            si el archivo no existe en el commit
+        IsADirectoryError
+            si la ruta es un directorio
+        """
+        result = self.repo.objects.read( self._blob_name( path ) )
+        self._check_blob( path, result )
+        return result.content
+
+    def open( self, path ):
+        """
+        abre un archivo como estaba en el commit para leerlo en binario
+
+        los archivos de hasta `small_blob_size` bytes se leen completos
+        del pool de cat-file, los mas grandes se leen conforme git los
+        escribe con `Blob_stream`
+
+        Parameters
+        ----------
+        path: str
+            ruta del archivo relativa a la raiz del repo
+
+        Returns
+        -------
+        io.BufferedIOBase
+        """
+        name = self._blob_name( path )
+        info = self.repo.objects.info( name )
+        if info is None:
+            raise Git_object_not_found(
+                f'no se encontro "{path}" en el commit {self._hash}' )
+        self._check_blob( path, info )
+        if info.size <= self.small_blob_size:
+            return io.BytesIO( self.repo.objects.read( info.hash ).content )
+        return io.BufferedReader(
+            Blob_stream( self.repo, info.hash, info.size ) )
+
+    def _blob_name( self, path ):
+        path = str( path )
+        if path.startswith( './' ):
+            path = path[ 2: ]
+        return f"{self._hash}:{path}"
+
+    def _check_blob( self, path, result ):
+        if result.type == 'tree':
+            raise IsADirectoryError(
+                f'"{path}" es un directorio en el commit {self._hash}' )
+        if result.type != 'blob':
+            raise NotImplementedError(
+                f'"{path}" es {result.type} y no un archivo en el commit '
+                f'{self._hash}' )
+
     def get_info( self ):
-        result = Git.log(
-            '-n', 1, '--date=iso8601-strict', self._hash, src=self.repo.path )
-        result = result.run()
-        return self.parse( result.result )
+        result = self.repo.objects.read( self._hash )
+        if result.type != 'commit':
+            raise NotImplementedError(
+                f"el objeto {self._hash} es {result.type} y no un commit" )
+        return self.parse_raw( result.content.decode( 'utf-8', 'replace' ) )
 
-    @functools.cached_property
+    @property
     def info( self ):
-        return self.get_info()
+        if self._info is None:
+            cache = self.repo.commit_cache
+            info = None if cache is None else cache.get( self._hash )
+            if info is None:
+                info = self.get_info()
+                if cache is not None:
+                    cache.put( self._hash, info )
+            self._info = info
+        return self._info
 
     def parse( self, info ):
+        """
+        parsea la salida de `git log -n 1 --date=iso8601-strict`, si
+        recibe el contenido crudo del commit usa `parse_raw`
+
+        .. deprecated:: 0.10.0
+            usar `parse_raw` con el contenido de `git cat-file commit`
+        """
+        warnings.warn(
+            'Commit.parse esta obsoleto, usar Commit.parse_raw',
+            DeprecationWarning, stacklevel=2 )
+        if info.startswith( 'tree ' ):
+            return self.parse_raw( info )
         lines = info.split( '\n' )
         author = lines[1]
         date = lines[2]
@@ -54,13 +307,32 @@ class Commit:
         author = author[ :email.span()[0] ]
         email = email.groups()[0]
         author = author.split( ':', 1 )[1].strip()
-        author = Chibi_atlas( author=author, email=email )
         date = datetime.datetime.fromisoformat(
             date.split( ':', 1 )[1].strip() )
+        offset = int( date.utcoffset().total_seconds() // 60 )
         message = map( lambda x: x.lstrip(), message )
         message = "\n".join( message )
-        result = Chibi_atlas( author=author, date=date, message=message )
-        return result
+        return Commit_info(
+            author, email, int( date.timestamp() ), offset, message )
+
+    def parse_raw( self, raw ):
+        """
+        parsea el contenido crudo del commit como lo regresa
+        `git cat-file commit`
+        """
+        headers, message = raw.split( '\n\n', 1 )
+        for line in headers.split( '\n' ):
+            if line.startswith( 'author ' ):
+                break
+        else:
+            raise NotImplementedError(
+                f"el commit {self._hash} no tiene autor" )
+        author, date = line[ len( 'author ' ): ].rsplit( '>', 1 )
+        author, email = author.rsplit( '<', 1 )
+        timestamp, offset = date.split()
+        return Commit_info(
+            author.strip(), email, int( timestamp ), parse_offset( offset ),
+            message )
 
     def __str__( self ):
         return f"{self._hash}"
@@ -70,10 +342,49 @@ class Commit:
 
 
 class Branch:
-    def __init__( self, repo, name, is_remote=False ):
+    """
+    rama del repo, cuando viene del indice de `Branches` ya tiene la
+    punta, el upstream, cuantos commits va adelante y atras y la fecha y
+    autor del ultimo commit sin crear procesos
+
+    Parameters
+    ----------
+    repo: chibi_git.Git
+    name: str
+        nombre corto de la rama, en las remotas incluye el remoto
+    is_remote: bool
+    hash: str, optional
+        hash de la punta de la rama
+    upstream: str, optional
+        nombre corto de la rama que sigue
+    ahead: int, optional
+    behind: int, optional
+        commits que tiene la rama que no tiene el upstream y al reves
+    upstream_gone: bool, optional
+        si el upstream ya no existe
+    timestamp: int, optional
+    offset: int, optional
+        fecha del ultimo commit
+    author: str, optional
+    email: str, optional
+        autor del ultimo commit
+    """
+    def __init__(
+            self, repo, name, is_remote=False, hash=None, upstream=None,
+            ahead=None, behind=None, upstream_gone=False, timestamp=None,
+            offset=None, author=None, email=None ):
         self.repo = repo
         self.name = name
         self.is_remote = is_remote
+        self.hash = hash
+        self.upstream = upstream
+        self.ahead = ahead
+        self.behind = behind
+        self.upstream_gone = upstream_gone
+        self.timestamp = timestamp
+        self.offset = offset
+        self.author = author
+        self.email = email
 
     def __repr__( self ):
         return (
@@ -90,19 +401,53 @@ class Branch:
     def __hash__( self ):
         return hash( self.name )
 
+    @property
+    def date( self ):
+        """
+        fecha del ultimo commit de la rama
+        """
+        if self.timestamp is None:
+            return None
+        return build_date( self.timestamp, self.offset )
+
+    @property
+    def ref( self ):
+        """
+        nombre completo de la referencia de la rama
+        """
+        if self.is_remote:
+            return f'refs/remotes/{self.name}'
+        return f'refs/heads/{self.name}'
+
     @property
     def commit( self ):
         """
         commit de la rama
         """
-        ref = Git.show_ref( self.name, src=self.repo.path ).run()
-        return Commit( self.repo, hash=ref.result[0][0] )
+        hash = self.hash or self.repo.refs.refs.get( self.ref )
+        if hash is None:
+            ref = Git.show_ref( self.name, src=self.repo.src ).run()
+            hash = ref.result[0][0]
+        return Commit( self.repo, hash=hash )
+
+    def contains( self, commit ):
+        """
+        si la rama contiene al commit usando el grafo del repo
+        """
+        return self.repo.graph.is_ancestor( commit, self.commit )
+
+    def ahead_behind( self, other ):
+        """
+        cuantos commits tiene la rama que no tiene `other` y cuantos
+        tiene `other` que no tiene la rama
+        """
+        return self.repo.graph.ahead_behind( self.commit, other )
 
     def checkout( self ):
         if not self.is_remote:
-            Git.checkout( self.name, src=self.repo.path ).run()
+            Git.checkout( self.name, src=self.repo.src ).run()
         else:
-            Git.checkout( '--track', self.name, src=self.repo.path ).run()
+            Git.checkout( '--track', self.name, src=self.repo.src ).run()
 
 
 class Head( Branch ):
@@ -112,21 +457,55 @@ class Head( Branch ):
 
     @property
     def commit( self ):
-        result = Git.rev_parse(
-            'HEAD', src=self.repo.path ).run()
-        return Commit( self.repo, result.result )
+        hash = self.repo.refs.head_hash
+        if hash is None:
+            hash = Git.rev_parse( 'HEAD', src=self.repo.src ).run().result
+        return Commit( self.repo, hash )
+
+
+class Remote( str ):
+    """
+    remoto del repo, es igual a su url para que `repo.remote.origin`
+    se pueda comparar directamente con la url
+
+    Parameters
+    ----------
+    name: str
+    url: str
+    push_urls: list of str, optional
+        urls de `remote.<name>.pushurl`, si no tiene se usa la url
+    fetch: list of str, optional
+        refspecs de `remote.<name>.fetch`
+    """
+    def __new__( cls, name, url, push_urls=None, fetch=None ):
+        result = super().__new__( cls, url )
+        result.name = name
+        result.push_urls = push_urls or [ url ]
+        result.fetch = fetch or []
+        return result
+
+    @property
+    def url( self ):
+        return str( self )
+
+    def __repr__( self ):
+        return f"Remote( name={self.name}, url={self.url} )"
 
 
 class Remote_wrapper:
+    """
+    remotos del repo, se leen hasta que se usan con un solo
+    `git config --get-regexp` y se reusan mientras `.git/config` no cambie
+    """
     def __init__( self, repo ):
         self.repo = repo
-        self.reload()
 
     def reload( self ):
-        names = self.repo._remote()
-        self._names = Chibi_atlas()
-        for n in names:
-            self._names[ n ] = self.repo._remote__get_url( n )
+        self.repo._remote_index = None
+
+    @property
+    def _names( self ):
+        return self.repo._remotes()
 
     def append( self, name, url ):
         self.repo._remote__add( name, url )
@@ -135,6 +514,18 @@ class Remote_wrapper:
     def __bool__( self ):
         return bool( self._names )
 
+    def __len__( self ):
+        return len( self._names )
+
+    def __iter__( self ):
+        return iter( self._names.values() )
+
+    def __contains__( self, name ):
+        return name in self._names
+
+    def __getitem__( self, name ):
+        return self._names[ name ]
+
     def __getattr__( self, name ):
         try:
             return super().__getattribute__( name )
@@ -146,9 +537,38 @@ class Remote_wrapper:
 
 
 class Tag:
-    def __init__( self, repo, name ):
+    """
+    tag del repo, cuando viene del indice de `Tags` ya tiene el objeto,
+    el commit pelado, la fecha y la anotacion sin crear procesos
+
+    Parameters
+    ----------
+    repo: chibi_git.Git
+    name: str
+        nombre corto del tag
+    hash: str, optional
+        objeto al que apunta la referencia del tag
+    type: str, optional
+        tipo del objeto, `tag` en los tags anotados
+    peeled: str, optional
+        hash del commit al que apunta el tag
+    timestamp: int, optional
+    offset: int, optional
+        fecha del tag o del commit en los tags ligeros
+    message: str, optional
+        anotacion de los tags anotados
+    """
+    def __init__(
+            self, repo, name, hash=None, type=None, peeled=None,
+            timestamp=None, offset=None, message=None ):
         self.name = name
         self.repo = repo
+        self.hash = hash
+        self.type = type
+        self.peeled = peeled
+        self.timestamp = timestamp
+        self.offset = offset
+        self.message = message
 
     def __repr__( self ):
         return (
@@ -162,12 +582,36 @@ class Tag:
             raise NotImplementedError(
                 f"no implementado eq {self} con {other}" )
 
+    @property
+    def ref( self ):
+        """
+        nombre completo de la referencia del tag
+        """
+        return f'refs/tags/{self.name}'
+
+    @property
+    def is_annotated( self ):
+        return self.type == 'tag'
+
+    @property
+    def date( self ):
+        """
+        fecha del tag anotado o del commit en los tags ligeros
+        """
+        if self.timestamp is None:
+            return None
+        return build_date( self.timestamp, self.offset )
+
     @property
     def commit( self ):
-        name = self.name + '^{}'
-        #ref = Git.show_ref( name, src=self.repo.path ).run()
-        ref = Git.rev_parse( name, src=self.repo.path ).run()
-        return Commit( self.repo, hash=ref.result )
+        hash = self.peeled or self.repo.refs.peeled( self.ref )
+        if hash is not None:
+            return Commit( self.repo, hash=hash )
+        result = self.repo.objects.info( f'{self.ref}^{{}}' )
+        if result is None:
+            raise KeyError(
+                f'no se encontro el tag "{self.name}" en {self.repo.path}' )
+        return Commit( self.repo, hash=result.hash )
 
 
 class Chibi_status_file( Chibi_path ):
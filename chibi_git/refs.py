@@ -0,0 +1,435 @@
+import os
+import threading
+import time
+
+from chibi_git.command import Git
+
+
+SYMBOLIC_PREFIX = 'ref: '
+SHORT_NAME_RULES = (
+    '{}', 'refs/{}', 'refs/tags/{}', 'refs/heads/{}', 'refs/remotes/{}',
+    'refs/remotes/{}/HEAD',
+)
+
+
+def find_git_dir( path ):
+    """
+    regresa el directorio de git de un work tree, si `.git` es un
+    archivo ( worktrees y submodulos ) se sigue la linea `gitdir:`
+
+    Returns
+    -------
+    str or None
+    """
+    git_dir = os.path.join( str( path ), '.git' )
+    if os.path.isfile( git_dir ):
+        with open( git_dir ) as f:
+            content = f.read().strip()
+        if not content.startswith( 'gitdir:' ):
+            return None
+        target = content[ len( 'gitdir:' ): ].strip()
+        git_dir = os.path.normpath(
+            os.path.join( os.path.dirname( git_dir ), target ) )
+    if os.path.isdir( git_dir ):
+        return git_dir
+    return None
+
+
+def find_common_dir( git_dir ):
+    """
+    regresa el directorio comun de un repo, para los worktrees es el
+    que indica el archivo `commondir`
+    """
+    common_file = os.path.join( git_dir, 'commondir' )
+    try:
+        with open( common_file ) as f:
+            common = f.read().strip()
+    except FileNotFoundError:
+        return git_dir
+    return os.path.normpath( os.path.join( git_dir, common ) )
+
+
+class Ref_reader:
+    """
+    lector nativo de `HEAD`, las referencias sueltas en `refs/` y
+    `packed-refs` ( incluyendo las lineas `^` con el objeto pelado ) sin
+    crear procesos de git
+
+    Parameters
+    ----------
+    git_dir: str
+        directorio de git del work tree
+    """
+    def __init__( self, git_dir, common_dir=None ):
+        self.git_dir = git_dir
+        if common_dir is None and git_dir:
+            common_dir = find_common_dir( git_dir )
+        self.common_dir = common_dir
+
+    def __repr__( self ):
+        return f"Ref_reader( git_dir={self.git_dir} )"
+
+    @property
+    def is_supported( self ):
+        """
+        si el layout del repo se puede leer directamente, los repos con
+        reftable o sin directorio de git no se soportan
+        """
+        if not self.git_dir or not os.path.isfile( self.head_file ):
+            return False
+        if os.path.exists( os.path.join( self.common_dir, 'reftable' ) ):
+            return False
+        return True
+
+    @property
+    def head_file( self ):
+        return os.path.join( self.git_dir, 'HEAD' )
+
+    @property
+    def packed_refs_file( self ):
+        return os.path.join( self.common_dir, 'packed-refs' )
+
+    def ref_dirs( self ):
+        """
+        directorios donde se guardan referencias sueltas
+        """
+        result = [ os.path.join( self.common_dir, 'refs' ) ]
+        if self.git_dir != self.common_dir:
+            result.append( os.path.join( self.git_dir, 'refs' ) )
+        return result
+
+    def packed( self ):
+        """
+        lee `packed-refs`
+
+        Returns
+        -------
+        tuple of dict
+            las referencias con su hash y las referencias con su objeto
+            pelado
+        """
+        refs = {}
+        peeled = {}
+        try:
+            f = open( self.packed_refs_file )
+        except FileNotFoundError:
+            return refs, peeled
+        traits = ()
+        last = None
+        with f:
+            for line in f:
+                line = line.rstrip( '\n' )
+                if line.startswith( '# pack-refs with:' ):
+                    traits = line.split( ':', 1 )[1].split()
+                    continue
+                if not line or line.startswith( '#' ):
+                    continue
+                if line.startswith( '^' ):
+                    if last is not None:
+                        peeled[ last ] = line[1:]
+                    continue
+                hash, last = line.split( ' ', 1 )
+                refs[ last ] = hash
+                # con estos traits las referencias sin linea `^` no son
+                # tags anotados y su objeto pelado es ellas mismas
+                if 'fully-peeled' in traits or (
+                        'peeled' in traits
+                        and last.startswith( 'refs/tags/' ) ):
+                    peeled[ last ] = hash
+        return refs, peeled
+
+    def loose( self ):
+        """
+        lee todas las referencias sueltas
+
+        Returns
+        -------
+        dict
+            nombre de la referencia con su contenido crudo, puede ser un
+            hash o `ref: <otra referencia>`
+        """
+        result = {}
+        for ref_dir in self.ref_dirs():
+            base = os.path.dirname( ref_dir )
+            for root, dirs, files in os.walk( ref_dir ):
+                for name in files:
+                    if name.endswith( '.lock' ):
+                        continue
+                    path = os.path.join( root, name )
+                    ref = os.path.relpath( path, base ).replace( os.sep, '/' )
+                    try:
+                        with open( path ) as f:
+                            result[ ref ] = f.read().strip()
+                    except FileNotFoundError:
+                        continue
+        return result
+
+    def read( self ):
+        """
+        lee todas las referencias del repo
+
+        Returns
+        -------
+        tuple
+            ( referencias con su hash, referencias peladas, contenido de HEAD,
+            referencias simbolicas )
+        """
+        refs, peeled = self.packed()
+        symbolic = {}
+        for name, value in self.loose().items():
+            if value.startswith( SYMBOLIC_PREFIX ):
+                symbolic[ name ] = value[ len( SYMBOLIC_PREFIX ): ]
+                continue
+            refs[ name ] = value
+            peeled.pop( name, None )
+        with open( self.head_file ) as f:
+            head = f.read().strip()
+        for name, target in symbolic.items():
+            hash = _follow( refs, symbolic, target )
+            if hash is not None:
+                refs[ name ] = hash
+        return refs, peeled, head, symbolic
+
+
+def _follow( refs, symbolic, name, depth=5 ):
+    for i in range( depth ):
+        if name in refs:
+            return refs[ name ]
+        if name not in symbolic:
+            return None
+        name = symbolic[ name ]
+    return None
+
+
+class Ref_snapshot:
+    """
+    foto de las referencias del repo ( HEAD, ramas, remotas y tags )
+
+    la foto se reusa mientras `.git/HEAD`, `.git/packed-refs` y los
+    directorios de `.git/refs/` no cambien en disco, git siempre escribe
+    las referencias en un `.lock` y lo renombra por lo que basta con
+    revisar los directorios y no cada referencia, la validacion solo usa
+    `os.stat` por lo que no se crea ningun proceso si nada cambio
+
+    las referencias se leen directamente de los archivos con `Ref_reader`
+    y solo se usa `git for-each-ref` cuando el layout no se soporta
+
+    Parameters
+    ----------
+    repo: chibi_git.Git
+        repo del cual se leeran las referencias
+    """
+    def __init__( self, repo ):
+        self.repo = repo
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._refs = None
+        self._peeled = None
+        self._symbolic = None
+        self._head = None
+        self._head_hash = None
+        self._reader = None
+        self._version = 0
+        # directorio con su stat y sus subdirectorios, solo se vuelve a
+        # listar cuando cambia su stat
+        self._dirs = {}
+
+    def __repr__( self ):
+        return f"Ref_snapshot( repo={self.repo} )"
+
+    @property
+    def reader( self ):
+        git_dir = self.repo.git_dir
+        if self._reader is None or self._reader.git_dir != git_dir:
+            self._reader = Ref_reader( git_dir, self.repo.common_dir )
+        return self._reader
+
+    # los directorios modificados hace menos de esto pueden cambiar otra
+    # vez sin que cambie su mtime, la foto no se guarda hasta que pase
+    racy_window_ns = 1_000_000_000
+
+    def stamp( self ):
+        """
+        regresa una tupla con los stats de HEAD, packed-refs y los
+        directorios de referencias, si cambia la tupla la foto ya no es
+        valida
+        """
+        reader = self.reader
+        result = [
+            _stat( reader.head_file ), _stat( reader.packed_refs_file ) ]
+        pending = list( reversed( reader.ref_dirs() ) )
+        while pending:
+            root = pending.pop()
+            stat = _stat( root )
+            result.append( ( root, stat ) )
+            if stat is None:
+                continue
+            cached = self._dirs.get( root )
+            if cached is None or cached[0] != stat:
+                try:
+                    with os.scandir( root ) as entries:
+                        subdirs = sorted(
+                            entry.path for entry in entries
+                            if entry.is_dir( follow_symlinks=False ) )
+                except FileNotFoundError:
+                    subdirs = []
+                cached = self._dirs[ root ] = ( stat, subdirs )
+            pending.extend( reversed( cached[1] ) )
+        return tuple( result )
+
+    def _is_racy( self, stamp ):
+        limit = time.time_ns() - self.racy_window_ns
+        return any(
+            stat is not None and stat[1] >= limit
+            for root, stat in stamp[2:] )
+
+    def _load( self ):
+        if self.reader.is_supported:
+            self._load_native()
+        else:
+            self._load_command()
+
+    def _load_native( self ):
+        refs, peeled, head, symbolic = self.reader.read()
+        if head.startswith( SYMBOLIC_PREFIX ):
+            target = head[ len( SYMBOLIC_PREFIX ): ]
+            self._head = target.replace( 'refs/heads/', '', 1 )
+            self._head_hash = _follow( refs, symbolic, target )
+        else:
+            self._head = 'HEAD'
+            self._head_hash = head
+        self._refs = refs
+        self._peeled = peeled
+        self._symbolic = frozenset( symbolic )
+
+    def _load_command( self ):
+        refs = Git.for_each_ref(
+            '--format=%(objectname) %(symref) %(refname)',
+            src=self.repo.src ).run()
+        self._refs = { name: hash for hash, symref, name in refs.result }
+        self._symbolic = frozenset(
+            name for hash, symref, name in refs.result if symref )
+        self._peeled = {}
+        head = Git.symbolic_ref( '--short', '-q', 'HEAD', src=self.repo.src )
+        head.raise_on_fail = False
+        head = head.run()
+        self._head = head.result if head else 'HEAD'
+        head_hash = Git.rev_parse(
+            '-q', '--verify', 'HEAD', src=self.repo.src )
+        head_hash.raise_on_fail = False
+        head_hash = head_hash.run()
+        self._head_hash = head_hash.result if head_hash else None
+
+    def refresh( self ):
+        """
+        recarga la foto si las referencias cambiaron en disco
+        """
+        stamp = self.stamp()
+        with self._lock:
+            if self._stamp is None or stamp != self._stamp:
+                before = (
+                    self._refs, self._peeled, self._symbolic, self._head,
+                    self._head_hash )
+                self._load()
+                after = (
+                    self._refs, self._peeled, self._symbolic, self._head,
+                    self._head_hash )
+                if before != after:
+                    self._version += 1
+                self._stamp = None if self._is_racy( stamp ) else stamp
+        return self
+
+    @property
+    def version( self ):
+        """
+        numero que cambia cada vez que las referencias cambian
+        """
+        return self.refresh()._version
+
+    def invalidate( self ):
+        """
+        obliga a recargar la foto en el siguiente acceso
+        """
+        with self._lock:
+            self._stamp = None
+
+    @property
+    def refs( self ):
+        """
+        diccionario con el nombre completo de la referencia y su hash
+        """
+        return self.refresh()._refs
+
+    @property
+    def head( self ):
+        """
+        nombre corto de a donde apunta HEAD
+        """
+        return self.refresh()._head
+
+    @property
+    def head_hash( self ):
+        """
+        hash del commit de HEAD, None si la rama no tiene commits
+        """
+        return self.refresh()._head_hash
+
+    def resolve( self, name ):
+        """
+        regresa el hash al que apunta una referencia, acepta nombres
+        completos ( refs/heads/master ) y cortos ( master, origin/master )
+
+        Returns
+        -------
+        str or None
+        """
+        self.refresh()
+        if name == 'HEAD':
+            return self._head_hash
+        for rule in SHORT_NAME_RULES:
+            hash = self._refs.get( rule.format( name ) )
+            if hash is not None:
+                return hash
+        return None
+
+    def peeled( self, name ):
+        """
+        regresa el objeto pelado de una referencia si `packed-refs` lo
+        conoce, None si no se sabe
+        """
+        return self.refresh()._peeled.get( name )
+
+    def names( self, prefix ):
+        """
+        regresa los nombres de las referencias que empiezan con el prefijo
+        sin el prefijo
+        """
+        size = len( prefix )
+        return sorted(
+            name[ size: ] for name in self.refs if name.startswith( prefix ) )
+
+    @property
+    def heads( self ):
+        return self.names( 'refs/heads/' )
+
+    @property
+    def remotes( self ):
+        """
+        ramas remotas sin las referencias simbolicas como `origin/HEAD`
+        """
+        symbolic = self.refresh()._symbolic
+        return [
+            name for name in self.names( 'refs/remotes/' )
+            if f'refs/remotes/{name}' not in symbolic ]
+
+    @property
+    def tags( self ):
+        return self.names( 'refs/tags/' )
+
+
+def _stat( path ):
+    try:
+        stat = os.stat( path )
+    except FileNotFoundError:
+        return None
+    return ( stat.st_ino, stat.st_mtime_ns, stat.st_size )
@@ -0,0 +1,121 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from chibi_atlas import Chibi_atlas
+
+from chibi_git.chibi_git import Git
+from chibi_git.command import deadline
+
+
+logger = logging.getLogger( 'chibi_git.repo_set' )
+
+
+class Repo_set:
+    """
+    conjunto de repos para ejecutar la misma operacion en todos con un
+    pool de hilos
+
+    los errores de cada repo se guardan en su resultado y no detienen a los
+    demas
+
+    Parameters
+    ----------
+    repos: iterable of Git or str
+        repos o rutas de los repos
+    max_workers: int
+        numero maximo de repos que se procesan al mismo tiempo
+    timeout: float, optional
+        segundos maximos por repo, si se pasa el proceso de git se mata y
+        el resultado tiene un `Git_timeout` como error
+    on_progress: callable, optional
+        funcion que se llama con ( terminados, total, resultado ) cada vez
+        que termina un repo
+    """
+    def __init__(
+            self, repos, max_workers=8, timeout=None, on_progress=None ):
+        self.repos = [
+            repo if isinstance( repo, Git ) else Git( repo )
+            for repo in repos ]
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.on_progress = on_progress
+
+    def __repr__( self ):
+        return (
+            f"Repo_set( repos={len( self.repos )}, "
+            f"max_workers={self.max_workers} )" )
+
+    def __iter__( self ):
+        return iter( self.repos )
+
+    def __len__( self ):
+        return len( self.repos )
+
+    def run( self, operation, *args, **kw ):
+        """
+        ejecuta la operacion en todos los repos
+
+        Parameters
+        ----------
+        operation: str or callable
+            nombre del metodo o propiedad de `Git` o una funcion que
+            recibe el repo
+        *args, **kw:
+            parametros para el metodo
+
+        Returns
+        -------
+        list of Chibi_atlas
+            un resultado por repo en el mismo orden con `repo`, `result`,
+            `error`, `ok` y `time`
+        """
+        total = len( self.repos )
+        results = [ None ] * total
+        done = 0
+        with ThreadPoolExecutor( max_workers=self.max_workers ) as executor:
+            futures = {
+                executor.submit(
+                    self._run_one, repo, operation, args, kw ): i
+                for i, repo in enumerate( self.repos ) }
+            for future in as_completed( futures ):
+                result = future.result()
+                results[ futures[ future ] ] = result
+                done += 1
+                if self.on_progress is not None:
+                    self.on_progress( done, total, result )
+        return results
+
+    def _run_one( self, repo, operation, args, kw ):
+        start = time.monotonic()
+        result = Chibi_atlas( repo=repo, result=None, error=None, ok=True )
+        try:
+            with deadline( self.timeout ):
+                result.result = self._call( repo, operation, args, kw )
+        except Exception as e:
+            logger.warning(
+                f'fallo "{operation}" en {repo.path}: {e}' )
+            result.error = e
+            result.ok = False
+        result.time = time.monotonic() - start
+        return result
+
+    def _call( self, repo, operation, args, kw ):
+        if callable( operation ):
+            return operation( repo, *args, **kw )
+        attr = getattr( repo, operation )
+        if callable( attr ):
+            return attr( *args, **kw )
+        return attr
+
+    def fetch( self ):
+        return self.run( 'fetch' )
+
+    def pull( self ):
+        return self.run( 'pull' )
+
+    def status( self ):
+        return self.run( 'status' )
+
+    def is_dirty( self ):
+        return self.run( 'is_dirty' )
@@ -1,8 +1,19 @@
+import re
+
+from chibi_atlas import Chibi_atlas
+
 from chibi_git.command import Git
 from chibi_git.obj import Commit, Tag
 
 
 class Tags:
+    """
+    manejador de los tags del repo
+
+    los tags se leen con un solo `git for-each-ref` que incluye el commit
+    pelado, la fecha y la anotacion, el indice se guarda en el repo y solo
+    se recarga cuando cambian las referencias
+    """
     def __init__( self, repo ):
         self.repo = repo
 
@@ -11,16 +22,66 @@ class Tags:
             f"Tags( repo={self.repo} )"
         )
 
+    @property
+    def index( self ):
+        """
+        diccionario con el nombre del tag y su `Tag`
+        """
+        version = self.repo.refs.version
+        index = self.repo._tag_index
+        if index is None or index.version != version:
+            tags = {}
+            # sin tags en las referencias no hace falta ejecutar git
+            if self.repo.refs.tags:
+                result = Git.for_each_ref__tags( src=self.repo.src ).run()
+                tags = {
+                    record.name: Tag( repo=self.repo, **record )
+                    for record in result.result }
+            index = Chibi_atlas( version=version, tags=tags )
+            self.repo._tag_index = index
+        return index.tags
+
     def __iter__( self ):
-        tags = Git.tag( src=self.repo.path ).run().result
-        return map( lambda x: Tag( repo=self.repo, name=x ), tags )
+        return iter( self.index.values() )
+
+    def __len__( self ):
+        return len( self.index )
+
+    def __contains__( self, name ):
+        return str( getattr( name, 'name', name ) ) in self.index
 
     def __getitem__( self, name ):
-        for tag in self:
-            if tag == name:
-                return tag
-        raise KeyError(
-            f'no se encontro el tag "{name}" en {self.repo.path}' )
+        try:
+            return self.index[ name ]
+        except KeyError:
+            raise KeyError(
+                f'no se encontro el tag "{name}" en {self.repo.path}' )
+
+    def sorted( self, by='name', reverse=False ):
+        """
+        regresa los tags ordenados sin ejecutar git
+
+        Parameters
+        ----------
+        by: str
+            `name`, `version` ( v1.10 va despues de v1.9 ) o `date`
+        reverse: bool
+
+        Returns
+        -------
+        list of Tag
+        """
+        keys = {
+            'name': lambda x: x.name,
+            'version': lambda x: version_key( x.name ),
+            'date': lambda x: ( x.timestamp or 0, x.name ),
+        }
+        try:
+            key = keys[ by ]
+        except KeyError:
+            raise NotImplementedError(
+                f"no esta implementado ordenar por {by}" )
+        return sorted( self, key=key, reverse=reverse )
 
     def create( self, name, target=None, message=None ):
         """
@@ -45,8 +106,17 @@ class Tags:
 
         if message:
             command = Git.tag(
-                name, target, '-m', message, src=self.repo.path )
+                name, target, '-m', message, src=self.repo.src )
         else:
-            command = Git.tag( name, target, src=self.repo.path )
+            command = Git.tag( name, target, src=self.repo.src )
         command.run()
-        return self[ name ]
+        return Tag( repo=self.repo, name=name )
+
+
+def version_key( name ):
+    """
+    llave para ordenar nombres comparando los numeros como enteros
+    """
+    parts = re.split( r'(\d+)', name )
+    return [
+        int( part ) if i % 2 else part for i, part in enumerate( parts ) ]
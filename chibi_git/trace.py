@@ -0,0 +1,199 @@
+import logging
+import os
+import sys
+import threading
+import time
+
+from chibi_atlas import Chibi_atlas
+
+
+logger = logging.getLogger( 'chibi_git.trace' )
+
+_hooks = ()
+_lock = threading.Lock()
+# modulos que solo ejecutan los comandos y no son la api que se llamo
+_internal_modules = frozenset( (
+    'chibi_git.command', 'chibi_git.trace', 'chibi_git.cat_file',
+    'chibi_git.repo_set',
+) )
+# opciones globales de git que llevan su valor en el siguiente argumento
+_options_with_value = frozenset( ( '-C', '-c' ) )
+
+
+def add_hook( hook ):
+    """
+    agrega una funcion que se llama con el registro de cada proceso de
+    git cuando termina
+
+    Parameters
+    ----------
+    hook: callable
+        recibe un `Chibi_atlas` con `argv`, `cwd`, `operation`, `api`,
+        `kind`, `start`, `time`, `return_code`, `stdout_bytes` y
+        `stderr_bytes`
+    """
+    global _hooks
+    with _lock:
+        _hooks = ( *_hooks, hook )
+
+
+def remove_hook( hook ):
+    global _hooks
+    with _lock:
+        _hooks = tuple( h for h in _hooks if h is not hook )
+
+
+def start( command, kind='run', args=(), kw=None ):
+    """
+    empieza el registro de un proceso, si no hay hooks regresa None y no
+    se hace nada mas
+
+    Parameters
+    ----------
+    command: chibi_git.command.Git
+    kind: str
+        `run`, `stream`, `cat-file` o `async`
+    args: tuple, optional
+    kw: dict, optional
+        parametros extra con los que se ejecuta el comando
+    """
+    if not _hooks:
+        return None
+    argv = command.build_tuple( *args, **( kw or {} ) )
+    argv = [ str( x ) for x in argv ]
+    src = getattr( command, 'src', None )
+    return Chibi_atlas(
+        argv=argv, cwd=str( src ) if src else os.getcwd(),
+        operation=operation( argv ), api=calling_api(), kind=kind,
+        start=time.time(), time=None, return_code=None,
+        stdout_bytes=0, stderr_bytes=0, _monotonic=time.monotonic() )
+
+
+def finish( record, return_code, stdout_bytes=0, stderr_bytes=0 ):
+    """
+    termina el registro y lo manda a todos los hooks, los errores de los
+    hooks solo se registran en el log
+    """
+    if record is None:
+        return
+    record.time = time.monotonic() - record.pop( '_monotonic' )
+    record.return_code = return_code
+    record.stdout_bytes = stdout_bytes
+    record.stderr_bytes = stderr_bytes
+    for hook in _hooks:
+        try:
+            hook( record )
+        except Exception:
+            logger.exception( f'fallo el hook {hook}' )
+
+
+def operation( argv ):
+    """
+    regresa el subcomando de git de los argumentos, se brincan las
+    opciones globales y el valor de las que lo llevan aparte ( -C, -c )
+    """
+    arguments = iter( argv[1:] )
+    for argument in arguments:
+        if argument in _options_with_value:
+            next( arguments, None )
+        elif not argument.startswith( '-' ):
+            return argument
+    return None
+
+
+def calling_api():
+    """
+    regresa el nombre de la funcion de chibi_git que llamo el codigo de
+    afuera de la libreria, por ejemplo `Commit.info` o `Branches.local`
+    """
+    frame = sys._getframe( 1 )
+    api = None
+    while frame is not None:
+        module = frame.f_globals.get( '__name__', '' )
+        if not module.startswith( 'chibi_git' ):
+            if api is not None:
+                break
+        elif module not in _internal_modules:
+            api = _qualname( frame )
+        frame = frame.f_back
+    return api
+
+
+def _qualname( frame ):
+    code = frame.f_code
+    try:
+        return code.co_qualname
+    except AttributeError:
+        pass
+    # antes de python 3.11 el codigo no tiene el nombre con la clase, se
+    # toma de `self` o `cls`
+    owner = frame.f_locals.get( 'self', frame.f_locals.get( 'cls' ) )
+    if owner is None:
+        return code.co_name
+    if not isinstance( owner, type ):
+        owner = type( owner )
+    return f"{owner.__name__}.{code.co_name}"
+
+
+class Tracer:
+    """
+    guarda los registros de todos los procesos de git que se ejecuten
+    mientras esta activo en cualquier hilo
+
+    Examples
+    --------
+    >>> with Tracer() as tracer:
+    ...     repo.branches.local
+    >>> tracer.stats()
+    """
+    def __init__( self ):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def __repr__( self ):
+        return f"Tracer( records={len( self.records )} )"
+
+    def __call__( self, record ):
+        with self._lock:
+            self.records.append( record )
+
+    def __enter__( self ):
+        add_hook( self )
+        return self
+
+    def __exit__( self, exc_type, exc_value, traceback ):
+        remove_hook( self )
+
+    def stats( self, by='api' ):
+        """
+        junta los registros por api, subcomando o cualquier campo
+
+        Parameters
+        ----------
+        by: str
+            campo del registro, `api`, `operation` o `kind`
+
+        Returns
+        -------
+        dict
+            valor del campo con `count`, `time`, `stdout_bytes`,
+            `stderr_bytes` y `failed`
+        """
+        result = {}
+        with self._lock:
+            records = list( self.records )
+        for record in records:
+            key = record[ by ]
+            try:
+                stats = result[ key ]
+            except KeyError:
+                stats = result[ key ] = Chibi_atlas(
+                    count=0, time=0.0, stdout_bytes=0, stderr_bytes=0,
+                    failed=0 )
+            stats.count += 1
+            stats.time += record.time
+            stats.stdout_bytes += record.stdout_bytes
+            stats.stderr_bytes += record.stderr_bytes
+            if record.return_code:
+                stats.failed += 1
+        return result
@@ -0,0 +1,201 @@
+from chibi_git.command import Git
+
+
+def parse_ls_tree( record ):
+    """
+    parsea un registro de `git ls-tree -z --long`
+
+    Returns
+    -------
+    tuple
+        `mode`, `type`, `hash`, `size` ( None en directorios y
+        submodulos ) y `path`
+    """
+    meta, path = record.split( '\t', 1 )
+    mode, type, hash, size = meta.split()
+    return mode, type, hash, None if size == '-' else int( size ), path
+
+
+class Tree_entry:
+    """
+    entrada de un directorio del commit, puede ser un archivo ( blob ),
+    un directorio ( tree ) o un submodulo ( commit )
+    """
+    __slots__ = ( 'repo', 'path', 'mode', 'type', 'hash', 'size', '_tree' )
+
+    def __init__( self, repo, path, mode, type, hash, size=None ):
+        self.repo = repo
+        self.path = path
+        self.mode = mode
+        self.type = type
+        self.hash = hash
+        self.size = size
+        self._tree = None
+
+    @property
+    def name( self ):
+        return self.path.rsplit( '/', 1 )[-1]
+
+    @property
+    def is_dir( self ):
+        return self.type == 'tree'
+
+    @property
+    def tree( self ):
+        """
+        `Tree` del directorio, su contenido se lee hasta que se usa
+        """
+        if not self.is_dir:
+            raise NotADirectoryError(
+                f'"{self.path}" es {self.type} y no un directorio' )
+        if self._tree is None:
+            self._tree = Tree( self.repo, self.hash, self.path )
+        return self._tree
+
+    def read( self ):
+        """
+        contenido del archivo en bytes usando el pool de cat-file
+        """
+        if self.type != 'blob':
+            raise IsADirectoryError(
+                f'"{self.path}" es {self.type} y no un archivo' )
+        return self.repo.objects.read( self.hash ).content
+
+    def __eq__( self, other ):
+        if isinstance( other, Tree_entry ):
+            return (
+                self.path == other.path and self.mode == other.mode
+                and self.hash == other.hash )
+        return NotImplemented
+
+    def __hash__( self ):
+        return hash( ( self.path, self.hash ) )
+
+    def __repr__( self ):
+        return (
+            f"Tree_entry( path={self.path}, mode={self.mode}, "
+            f"type={self.type}, hash={self.hash}, size={self.size} )" )
+
+
+class Tree:
+    """
+    directorio de un commit, el contenido se lee con
+    `git ls-tree -z --long` hasta que se usa y se guarda, los
+    subdirectorios se leen igual conforme se visitan
+
+    las busquedas por ruta usan el diccionario de cada directorio
+
+    Parameters
+    ----------
+    repo: chibi_git.Git
+    hash: str
+        hash del tree
+    path: str, optional
+        ruta del directorio relativa a la raiz del repo
+    """
+    def __init__( self, repo, hash, path='' ):
+        self.repo = repo
+        self.hash = hash
+        self.path = path
+        self._entries = None
+
+    def __repr__( self ):
+        return f"Tree( hash={self.hash}, path={self.path!r} )"
+
+    @property
+    def is_loaded( self ):
+        return self._entries is not None
+
+    @property
+    def entries( self ):
+        """
+        diccionario con el nombre y su `Tree_entry` del directorio
+        """
+        if self._entries is None:
+            self.load()
+        return self._entries
+
+    def _full_path( self, path ):
+        return f"{self.path}/{path}" if self.path else path
+
+    def load( self, recursive=False ):
+        """
+        lee el contenido del directorio, con `recursive` se leen todos los
+        subdirectorios con un solo `git ls-tree -r -t`
+        """
+        args = [ '-z', '--long' ]
+        if recursive:
+            args += [ '-r', '-t' ]
+        result = Git.ls_tree( *args, self.hash, src=self.repo.src ).run()
+        trees = { '': self }
+        self._entries = {}
+        for record in result.result:
+            mode, type, hash, size, path = parse_ls_tree( record )
+            parent, _, name = path.rpartition( '/' )
+            entry = Tree_entry(
+                self.repo, self._full_path( path ), mode, type, hash, size )
+            trees[ parent ]._entries[ name ] = entry
+            if recursive and type == 'tree':
+                entry._tree = trees[ path ] = Tree(
+                    self.repo, hash, entry.path )
+                entry._tree._entries = {}
+        return self
+
+    def walk( self ):
+        """
+        regresa todas las entradas del directorio y sus subdirectorios,
+        si el arbol no esta completo se lee con un solo proceso
+        """
+        if not self._is_fully_loaded():
+            self.load( recursive=True )
+        for entry in self.entries.values():
+            yield entry
+            if entry.is_dir:
+                yield from entry.tree.walk()
+
+    def _is_fully_loaded( self ):
+        if self._entries is None:
+            return False
+        return all(
+            entry._tree is not None and entry._tree._is_fully_loaded()
+            for entry in self._entries.values() if entry.is_dir )
+
+    def get( self, path, default=None ):
+        try:
+            return self[ path ]
+        except KeyError:
+            return default
+
+    def __getitem__( self, path ):
+        """
+        busca la entrada de una ruta relativa a este directorio
+
+        Raises
+        ------
+        KeyError
+            si la ruta no existe
+        """
+        tree = self
+        parts = str( path ).strip( '/' ).split( '/' )
+        for i, name in enumerate( parts ):
+            try:
+                entry = tree.entries[ name ]
+            except KeyError:
+                raise KeyError(
+                    f'no se encontro "{path}" en el tree {self.hash}' )
+            if i == len( parts ) - 1:
+                return entry
+            if not entry.is_dir:
+                raise KeyError(
+                    f'no se encontro "{path}" en el tree {self.hash}, '
+                    f'"{entry.path}" no es un directorio' )
+            tree = entry.tree
+
+    def __contains__( self, path ):
+        return self.get( path ) is not None
+
+    def __iter__( self ):
+        return iter( self.entries.values() )
+
+    def __len__( self ):
+        return len( self.entries )
@@ -5,6 +5,7 @@ import unittest
 from chibi.file.temp import Chibi_temp_path
 
 from chibi_git import Git
+from chibi_git.command import Git as Git_command
 from chibi_git.snippets import get_base_name_from_git_url
 
 
@@ -26,3 +27,72 @@ class Test_snippet_clone( unittest.TestCase ):
     def test_clone_should_get_the_repo( self ):
         result = get_base_name_from_git_url( self.url_git )
         self.assertEqual( 'chibi_git', result )
+
+
+class Test_chibi_git_clone_local( unittest.TestCase ):
+    def setUp( self ):
+        self.source_path = Chibi_temp_path()
+        source = Git( self.source_path )
+        source.init()
+        for i in range( 3 ):
+            source.add( self.source_path.temp_file() )
+            source.commit( f"commit {i}" )
+        source.branches.create( 'other' )
+        self.origin_path = Chibi_temp_path()
+        Git_command(
+            'clone', '--bare', self.source_path,
+            self.origin_path + 'origin.git' ).run()
+        Git_command(
+            '-C', self.origin_path + 'origin.git', 'config',
+            'uploadpack.allowFilter', 'true' ).run()
+        self.url = f'file://{self.origin_path}/origin.git'
+        self.path = Chibi_temp_path()
+
+    def test_clone_should_have_all_the_history( self ):
+        repo = Git.clone( self.url, self.path )
+        self.assertEqual( len( list( repo.log() ) ), 3 )
+        self.assertEqual( repo.path, self.path + 'origin' )
+
+    def test_shallow_clone( self ):
+        repo = Git.clone( self.url, self.path, depth=1 )
+        self.assertEqual( len( list( repo.log() ) ), 1 )
+
+    def test_single_branch( self ):
+        repo = Git.clone( self.url, self.path, single_branch=True )
+        branches = [ b.name for b in repo.branches.remote ]
+        self.assertIn( 'origin/master', branches )
+        self.assertNotIn( 'origin/other', branches )
+        path = Chibi_temp_path()
+        repo = Git.clone( self.url, path )
+        self.assertIn( 'origin/other', repo.branches.remote )
+
+    def test_branch( self ):
+        repo = Git.clone(
+            self.url, self.path, single_branch=True, branch='other' )
+        self.assertEqual( repo.head.name, 'other' )
+
+    def test_partial_clone( self ):
+        repo = Git.clone( self.url, self.path, filter='blob:none' )
+        result = Git_command._build_command(
+            'config', 'remote.origin.partialclonefilter',
+            src=repo.path ).run()
+        self.assertEqual( result.result.strip(), 'blob:none' )
+
+    def test_no_checkout( self ):
+        repo = Git.clone( self.url, self.path, no_checkout=True )
+        self.assertEqual(
+            [ f.base_name for f in repo.path.ls() ], [ '.git' ] )
+
+    def test_reference( self ):
+        repo = Git.clone(
+            self.url, self.path, reference=self.source_path )
+        alternates = repo.path + '.git/objects/info/alternates'
+        self.assertTrue( alternates.exists )
+
+    def test_clone_many( self ):
+        urls = [ self.url, f'file://{self.origin_path}/no_existe.git' ]
+        results = Git.clone_many( urls, self.path, depth=1 )
+        self.assertTrue( results[0].ok )
+        self.assertIsInstance( results[0].repo, Git )
+        self.assertFalse( results[1].ok )
+        self.assertIsNotNone( results[1].error )
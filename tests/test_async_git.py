@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+from chibi.file.temp import Chibi_temp_path
+from chibi_command import Result_error
+
+from chibi_git import Async_git, Git, Tracer
+from chibi_git.exception import Git_not_initiate
+from chibi_git.obj import Commit
+from tests.test_chibi_git import Test_chibi_git_with_history
+
+
+class Test_async_git( Test_chibi_git_with_history ):
+    def setUp( self ):
+        super().setUp()
+        self.async_repo = Async_git( self.repo )
+
+    def run_async( self, coroutine ):
+        return asyncio.run( coroutine )
+
+    async def collect( self, iterator ):
+        return [ item async for item in iterator ]
+
+    def test_status_should_be_the_same_of_sync( self ):
+        self.path.temp_file()
+        result = self.run_async( self.async_repo.status() )
+        self.assertEqual( result, self.repo.status )
+
+    def test_log_should_be_the_same_of_sync( self ):
+        commits = self.run_async( self.collect( self.async_repo.log() ) )
+        self.assertEqual( commits, list( self.repo.log() ) )
+
+    def test_log_with_info( self ):
+        commits = self.run_async(
+            self.collect( self.async_repo.log( with_info=True ) ) )
+        self.assertEqual( len( commits ), self.amount_commits )
+        for commit in commits:
+            self.assertIsInstance( commit, Commit )
+            self.assertEqual( commit.info, commit.get_info() )
+
+    def test_log_can_stop_early( self ):
+        async def first():
+            log = self.async_repo.log()
+            async for commit in log:
+                await log.aclose()
+                return commit
+        commit = self.run_async( first() )
+        self.assertEqual( commit, next( self.repo.log() ) )
+
+    def test_branches_and_tags( self ):
+        self.repo.tags.create( 'new_tag' )
+        branches = self.run_async( self.async_repo.branches() )
+        tags = self.run_async( self.async_repo.tags() )
+        self.assertEqual(
+            [ b.name for b in branches ],
+            [ b.name for b in self.repo.branches.local ] )
+        self.assertEqual( [ t.name for t in tags ], [ 'new_tag' ] )
+
+    def test_many_repos_in_the_same_loop( self ):
+        async def statuses():
+            return await asyncio.gather(
+                *( self.async_repo.status() for i in range( 10 ) ) )
+        result = self.run_async( statuses() )
+        self.assertEqual( len( result ), 10 )
+
+    def test_pull_fail_should_raise( self ):
+        with self.assertRaises( Result_error ):
+            self.run_async( self.async_repo.pull() )
+
+    def test_discovery_should_not_block_the_loop( self ):
+        subdir = self.path + 'sub'
+        subdir.mkdir()
+        async_repo = Async_git( subdir )
+        with Tracer() as tracer:
+            result = self.run_async( async_repo.status() )
+        self.assertEqual( result, self.repo.status )
+        operations = [ r.operation for r in tracer.records ]
+        self.assertEqual( operations, [ 'rev-parse', 'status' ] )
+        self.assertEqual( { r.kind for r in tracer.records }, { 'async' } )
+        src = self.run_async( async_repo.src() )
+        self.assertEqual( src.git_dir, self.repo.git_dir )
+
+
+class Test_async_git_not_init( unittest.TestCase ):
+    def test_status_should_raise( self ):
+        repo = Async_git( Chibi_temp_path() )
+        self.assertIsInstance( repo.repo, Git )
+        with self.assertRaises( Git_not_initiate ):
+            asyncio.run( repo.status() )
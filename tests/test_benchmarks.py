@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+
+from chibi.file.temp import Chibi_temp_path
+
+from benchmarks.run import compare, run_benchmarks
+from benchmarks.synthetic import build_repo
+
+
+class Test_synthetic_repo( unittest.TestCase ):
+    def setUp( self ):
+        self.path = Chibi_temp_path()
+        self.repo = build_repo(
+            self.path, commits=30, files=12, branches=3, tags=4,
+            remotes=2, dirty_files=2 )
+
+    def test_should_have_the_requested_size( self ):
+        self.assertEqual( len( list( self.repo.log() ) ), 30 )
+        self.assertEqual( len( self.repo.branches.local ), 4 )
+        self.assertEqual( len( self.repo.tags ), 4 )
+        self.assertEqual( len( self.repo.remote ), 2 )
+        status = self.repo.status
+        self.assertEqual( len( status.untrack ), 2 )
+        self.assertEqual( len( status.modified ), 2 )
+
+    def test_should_be_reproducible( self ):
+        other_path = Chibi_temp_path()
+        other = build_repo(
+            other_path, commits=30, files=12, branches=3, tags=4,
+            remotes=2, dirty_files=2 )
+        self.assertEqual(
+            str( other.head.commit ), str( self.repo.head.commit ) )
+
+    def test_run_benchmarks( self ):
+        results = run_benchmarks(
+            self.path, repeat=1, only=[ 'log', 'tags', 'add' ] )
+        self.assertEqual( set( results ), { 'log', 'tags', 'add' } )
+        self.assertEqual( results[ 'log' ][ 'spawns' ], 1 )
+        self.assertFalse( self.repo.status.added )
+        lines = compare(
+            { 'results': results }, { 'results': results } )
+        self.assertIn( '1.00x', lines[0] )
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+
+from chibi.file.temp import Chibi_temp_path
+
+from chibi_git import Git
+from chibi_git.obj import Commit
+
+
+class Test_blame( unittest.TestCase ):
+    def setUp( self ):
+        self.path = Chibi_temp_path()
+        self.repo = Git( self.path )
+        self.repo.init()
+        self.file = self.path + 'file.txt'
+        self.file.open().write( 'uno\ndos\n' )
+        self.repo.add( self.file )
+        self.repo.commit( 'primero' )
+        self.file.open().append( 'tres\ncuatro\n' )
+        self.repo.add( self.file )
+        self.repo.commit( 'segundo' )
+        self.first, self.second = list( self.repo.log() )[::-1]
+
+    def test_ranges_should_cover_all_the_lines( self ):
+        ranges = sorted(
+            self.repo.blame( 'file.txt' ), key=lambda x: x.final_line )
+        self.assertEqual(
+            [ ( r.final_line, r.lines ) for r in ranges ],
+            [ ( 1, 2 ), ( 3, 2 ) ] )
+        self.assertEqual(
+            [ r.summary for r in ranges ], [ 'primero', 'segundo' ] )
+        self.assertEqual( ranges[0].path, 'file.txt' )
+
+    def test_commits_should_be_the_same_of_the_log( self ):
+        ranges = list( self.repo.blame( self.file ) )
+        commits = { r.commit for r in ranges }
+        self.assertIn( self.first, commits )
+        for commit in commits:
+            self.assertIsInstance( commit, Commit )
+            self.assertIs( commit, Commit( self.repo, str( commit ) ) )
+
+    def test_author_should_match_the_commit_info( self ):
+        ranges = list( self.repo.blame( 'file.txt' ) )
+        for r in ranges:
+            self.assertIs( r.author, r.commit.info.author )
+            self.assertEqual( r.timestamp, r.commit.info.timestamp )
+
+    def test_blame_in_a_old_revision( self ):
+        ranges = list( self.repo.blame( 'file.txt', rev=self.first ) )
+        self.assertEqual( len( ranges ), 1 )
+        self.assertIs( ranges[0].commit, self.first )
+        self.assertEqual( ranges[0].lines, 2 )
+
+    def test_blame_many_should_report_the_errors( self ):
+        results = {
+            r.path: r for r in self.repo.blame_many(
+                [ 'file.txt', 'no_existe.txt' ] ) }
+        self.assertTrue( results[ 'file.txt' ].ok )
+        self.assertEqual( len( results[ 'file.txt' ].ranges ), 2 )
+        self.assertFalse( results[ 'no_existe.txt' ].ok )
+        self.assertIsNotNone( results[ 'no_existe.txt' ].error )
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import time
+import unittest
+from unittest.mock import patch, PropertyMock
+
+from chibi.file.temp import Chibi_temp_path
+
+from chibi_git import Git
+from chibi_git.command import Git as Git_command
+
+
+class Test_branch_index( unittest.TestCase ):
+    def setUp( self ):
+        self.origin_path = Chibi_temp_path()
+        self.origin = Git( self.origin_path )
+        self.origin.init()
+        self.commit( self.origin, 'base' )
+        self.path = Chibi_temp_path()
+        self.repo = Git.clone( f'file://{self.origin_path}', self.path )
+        self.commit( self.repo, 'local' )
+        self.commit( self.origin, 'remote' )
+        self.repo.fetch()
+        self.repo.branches.create( 'old', 'HEAD~1' )
+
+    def commit( self, repo, message ):
+        file = repo.path + f'{message}.txt'
+        with open( file, 'w' ) as f:
+            f.write( message )
+        repo.add( file )
+        repo.commit( message )
+
+    def test_local_should_have_upstream_and_track( self ):
+        master = self.repo.branches.local[ 'master' ]
+        self.assertEqual( master.upstream, 'origin/master' )
+        self.assertEqual( ( master.ahead, master.behind ), ( 1, 1 ) )
+        self.assertFalse( master.upstream_gone )
+        self.assertEqual( master.commit, self.repo.head.commit )
+        self.assertIsNone( self.repo.branches.local[ 'old' ].upstream )
+
+    def test_should_have_the_last_commit_date_and_author( self ):
+        master = self.repo.branches.local[ 'master' ]
+        info = self.repo.head.commit.info
+        self.assertEqual( master.timestamp, info.timestamp )
+        self.assertEqual( master.author, info.author.author )
+        self.assertEqual( master.email, info.author.email )
+        self.assertEqual( master.date, info.date )
+
+    def test_remote_should_come_from_the_same_index( self ):
+        remote = self.repo.branches.remote
+        self.assertIn( 'origin/master', [ b.name for b in remote ] )
+        master = remote.origin.master
+        self.assertEqual(
+            str( master.commit ), str( self.origin.head.commit ) )
+
+    def test_remote_head_should_not_be_a_branch( self ):
+        self.assertTrue( os.path.exists( os.path.join(
+            self.repo.git_dir, 'refs', 'remotes', 'origin', 'HEAD' ) ) )
+        names = [ b.name for b in self.repo.branches.remote ]
+        self.assertEqual( names, [ 'origin/master' ] )
+        self.assertEqual(
+            [ b.name for b in self.repo.branches.remote.origin ],
+            [ 'master' ] )
+        self.assertEqual( self.repo.refs.remotes, [ 'origin/master' ] )
+        with patch(
+                'chibi_git.refs.Ref_reader.is_supported',
+                new_callable=PropertyMock ) as is_supported:
+            is_supported.return_value = False
+            repo = Git( self.repo.path )
+            self.assertEqual( repo.refs.remotes, [ 'origin/master' ] )
+
+    def test_upstream_gone( self ):
+        Git_command._build_command(
+            'update-ref', '-d', 'refs/remotes/origin/master',
+            src=self.repo.path ).run()
+        master = self.repo.branches.local[ 'master' ]
+        self.assertTrue( master.upstream_gone )
+
+    def test_filter_and_sort_should_not_spawn_process( self ):
+        self.repo.branches.index
+        with patch( 'chibi_command.Popen' ) as popen:
+            branches = self.repo.branches
+            names = [ b.name for b in branches.sorted() ]
+            self.assertEqual( names, [ 'master', 'old' ] )
+            ahead = branches.filter( lambda x: x.ahead )
+            self.assertEqual( [ b.name for b in ahead ], [ 'master' ] )
+            everything = branches.filter( remote=None )
+            self.assertEqual( len( everything ), len( branches.index ) )
+            self.assertEqual(
+                len( branches.sorted( by='date', remote=True ) ),
+                len( branches.filter( remote=True ) ) )
+        popen.assert_not_called()
+
+    def test_stale( self ):
+        branches = self.repo.branches
+        self.assertEqual( branches.stale( days=1 ), [] )
+        now = time.time() + 2 * 24 * 60 * 60
+        stale = branches.stale( days=1, now=now )
+        self.assertEqual(
+            sorted( b.name for b in stale ), [ 'master', 'old' ] )
+
+    def test_index_should_reload_when_the_upstream_change( self ):
+        self.assertIsNotNone( self.repo.branches.local[ 'master' ].upstream )
+        Git_command.branch(
+            '--unset-upstream', 'master', src=self.repo.path ).run()
+        self.assertIsNone( self.repo.branches.local[ 'master' ].upstream )
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+from chibi.file.temp import Chibi_temp_path
+
+from chibi_git import Git, Tracer
+from chibi_git.cache import Commit_cache
+from chibi_git.cat_file import Cat_file
+from chibi_git.obj import Commit_info
+
+
+class Test_commit_cache( unittest.TestCase ):
+    def setUp( self ):
+        self.path = Chibi_temp_path()
+        self.cache = Commit_cache( self.path + 'cache' )
+        self.info = Commit_info(
+            'chibi', 'chibi@example.com', 1700000000, -360, 'mensaje\n' )
+
+    def test_should_create_the_file_inside_the_dir( self ):
+        self.assertTrue( os.path.isfile( self.cache.path ) )
+
+    def test_put_and_get( self ):
+        self.assertIsNone( self.cache.get( 'a' * 40 ) )
+        self.cache.put( 'a' * 40, self.info )
+        self.assertEqual( self.cache.get( 'a' * 40 ), self.info )
+
+    def test_get_many_should_only_return_the_saved( self ):
+        self.cache.put_many( [
+            ( 'a' * 40, self.info ), ( 'b' * 40, self.info ) ] )
+        result = self.cache.get_many( [ 'a' * 40, 'c' * 40 ] )
+        self.assertEqual( list( result ), [ 'a' * 40 ] )
+
+    def test_should_be_shared_between_instances_and_threads( self ):
+        self.cache.put( 'a' * 40, self.info )
+        other = Commit_cache( self.path + 'cache' )
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append( other.get( 'a' * 40 ) ) )
+        thread.start()
+        thread.join()
+        self.assertEqual( result, [ self.info ] )
+
+
+class Test_chibi_git_commit_cache( unittest.TestCase ):
+    def setUp( self ):
+        self.path = Chibi_temp_path()
+        repo = Git( self.path )
+        repo.init()
+        for message in ( 'uno', 'dos', 'tres' ):
+            repo.add( self.path.temp_file() )
+            repo.commit( message )
+        self.repo = Git( self.path, commit_cache=True )
+
+    def test_default_cache_should_be_inside_git_dir( self ):
+        self.assertTrue(
+            self.repo.commit_cache.path.startswith( self.repo.common_dir ) )
+
+    def test_without_option_there_is_no_cache( self ):
+        self.assertIsNone( Git( self.path ).commit_cache )
+
+    def test_log_should_fill_the_cache( self ):
+        commits = list( self.repo.log( with_info=True ) )
+        self.assertEqual(
+            [ c.message.strip() for c in commits ], [ 'tres', 'dos', 'uno' ] )
+        saved = self.repo.commit_cache.get_many( map( str, commits ) )
+        self.assertEqual( len( saved ), 3 )
+
+    def test_a_new_repo_should_read_the_info_from_the_cache( self ):
+        expected = [ c.info for c in self.repo.log( with_info=True ) ]
+        repo = Git( self.path, commit_cache=True )
+        with patch.object( Cat_file, 'read' ) as read:
+            commits = list( repo.log( with_info=True ) )
+            self.assertEqual( [ c.info for c in commits ], expected )
+            self.assertEqual( repo.head.commit.info, expected[0] )
+            read.assert_not_called()
+
+    def test_only_the_missing_should_be_read_with_git( self ):
+        head = next( self.repo.log() )
+        self.assertEqual( head.message.strip(), 'tres' )
+        repo = Git( self.path, commit_cache=True )
+        with patch.object( Cat_file, 'read' ) as read, Tracer() as tracer:
+            commits = list( repo.log( with_info=True ) )
+            read.assert_not_called()
+        self.assertEqual( len( commits ), 3 )
+        self.assertEqual(
+            [ c.message.strip() for c in commits ], [ 'tres', 'dos', 'uno' ] )
+        self.assertEqual( commits[0].info, head.info )
+        # rev-list y un solo log para los que faltaban
+        self.assertEqual( len( tracer.records ), 2 )
+        self.assertEqual(
+            len( repo.commit_cache.get_many( map( str, commits ) ) ), 3 )
+
+    def test_cache_dir_can_be_shared( self ):
+        cache_dir = self.path + 'shared'
+        repo = Git( self.path, commit_cache=cache_dir )
+        list( repo.log( with_info=True ) )
+        cache = Commit_cache( cache_dir )
+        self.assertEqual(
+            len( cache.get_many( map( str, repo.log() ) ) ), 3 )
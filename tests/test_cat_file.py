@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from chibi.file.temp import Chibi_temp_path
+
+import chibi_git.cat_file
+from chibi_git import Git
+from chibi_git.cat_file import Cat_file, Cat_file_pool
+from chibi_git.command import deadline
+from chibi_git.exception import Git_object_not_found, Git_timeout
+from chibi_git.obj import Commit
+from tests.test_chibi_git import Test_chibi_git_with_history
+
+
+class Test_cat_file( Test_chibi_git_with_history ):
+    def setUp( self ):
+        super().setUp()
+        self.cat_file = Cat_file( self.repo )
+        self.commits = list( self.repo.log() )
+
+    def tearDown( self ):
+        self.cat_file.close()
+
+    def test_read_should_return_the_commit( self ):
+        commit = self.commits[0]
+        result = self.cat_file.read( str( commit ) )
+        self.assertEqual( result.hash, str( commit ) )
+        self.assertEqual( result.type, 'commit' )
+        self.assertEqual( len( result.content ), result.size )
+
+    def test_exists( self ):
+        self.assertTrue( self.cat_file.exists( str( self.commits[0] ) ) )
+        self.assertTrue( self.cat_file.exists( 'HEAD' ) )
+        self.assertFalse( self.cat_file.exists( 'no_existe' ) )
+
+    def test_read_not_existing_should_raise( self ):
+        with self.assertRaises( Git_object_not_found ):
+            self.cat_file.read( 'no_existe' )
+        self.assertTrue( self.cat_file.read( 'HEAD' ) )
+
+    def test_should_use_only_one_process_for_many_reads( self ):
+        with patch(
+                'chibi_git.cat_file.Popen',
+                wraps=chibi_git.cat_file.Popen ) as popen:
+            for commit in self.commits:
+                self.cat_file.read( str( commit ) )
+                self.cat_file.read( str( commit ) )
+        popen.assert_called_once()
+
+    def test_a_finished_read_should_return_after_the_deadline( self ):
+        original = Cat_file._read
+
+        def slow_after( *args ):
+            result = original( *args )
+            time.sleep( 0.3 )
+            return result
+
+        with patch.object(
+                Cat_file, '_read', autospec=True, side_effect=slow_after ):
+            with deadline( 0.05 ):
+                result = self.cat_file.read( 'HEAD' )
+        self.assertEqual( result.hash, str( self.commits[0] ) )
+        self.assertEqual( len( result.content ), result.size )
+        self.assertTrue( self.cat_file.read( 'HEAD' ) )
+
+    def test_an_unfinished_read_should_raise_timeout( self ):
+        original = Cat_file._read
+
+        def slow_before( *args ):
+            time.sleep( 0.3 )
+            return original( *args )
+
+        with patch.object(
+                Cat_file, '_read', autospec=True, side_effect=slow_before ):
+            with deadline( 0.05 ):
+                with self.assertRaises( Git_timeout ):
+                    self.cat_file.read( 'HEAD' )
+        self.assertTrue( self.cat_file.read( 'HEAD' ) )
+
+
+class Test_cat_file_pool( Test_chibi_git_with_history ):
+    def setUp( self ):
+        super().setUp()
+        self.pool = Cat_file_pool( self.repo, size=2 )
+        self.commits = list( self.repo.log() )
+
+    def tearDown( self ):
+        self.pool.close()
+
+    def test_should_work_with_threads( self ):
+        hashes = [ str( c ) for c in self.commits ] * 10
+        with ThreadPoolExecutor( 8 ) as executor:
+            result = list( executor.map( self.pool.read, hashes ) )
+        self.assertEqual( [ r.hash for r in result ], hashes )
+        self.assertLessEqual( len( self.pool._workers ), 2 )
+
+    def test_acquire_should_give_different_workers( self ):
+        with self.pool.acquire() as a:
+            with self.pool.acquire() as b:
+                self.assertIsNot( a, b )
+        event = threading.Event()
+
+        def take():
+            with self.pool.acquire():
+                event.set()
+
+        with self.pool.acquire(), self.pool.acquire():
+            thread = threading.Thread( target=take )
+            thread.start()
+            self.assertFalse( event.wait( 0.1 ) )
+        thread.join()
+        self.assertTrue( event.is_set() )
+
+
+class Test_commit_with_cat_file( Test_chibi_git_with_history ):
+    def test_info_of_commits_should_be_the_same_of_log( self ):
+        for commit in self.repo.log( with_info=True ):
+            self.assertEqual(
+                commit.info, commit.parse_raw( self.repo.objects.read(
+                    str( commit ) ).content.decode() ) )
+
+    def test_commit_info_should_not_spawn_process( self ):
+        commits = list( self.repo.log() )
+        commits[0].info
+        with patch(
+                'chibi_git.cat_file.Popen',
+                wraps=chibi_git.cat_file.Popen ) as popen:
+            for commit in commits[1:]:
+                self.assertTrue( commit.author )
+        popen.assert_not_called()
+
+
+class Test_commit_read( unittest.TestCase ):
+    def setUp( self ):
+        self.path = Chibi_temp_path()
+        self.repo = Git( self.path )
+        self.repo.init()
+        self.file = self.path + 'file.txt'
+        self.file.open().write( 'primero\n' )
+        ( self.path + 'dir' ).mkdir()
+        self.big = self.path + 'dir' + 'big.bin'
+        with open( str( self.big ), 'wb' ) as f:
+            f.write( bytes( range( 256 ) ) * 64 )
+        self.repo.add( [ self.file, self.big ] )
+        self.repo.commit( 'primero' )
+        self.first = self.repo.head.commit
+        self.file.open().write( 'segundo\n' )
+        self.repo.add( self.file )
+        self.repo.commit( 'segundo' )
+        self.second = self.repo.head.commit
+
+    def test_read_should_return_the_content_of_the_commit( self ):
+        self.assertEqual( self.first.read( 'file.txt' ), b'primero\n' )
+        self.assertEqual( self.second.read( 'file.txt' ), b'segundo\n' )
+        self.assertEqual(
+            self.first.read( 'dir/big.bin' ), bytes( range( 256 ) ) * 64 )
+
+    def test_read_should_not_touch_the_work_tree( self ):
+        self.first.read( 'file.txt' )
+        self.assertEqual( self.file.open().read(), 'segundo\n' )
+
+    def test_read_of_a_missing_file_should_fail( self ):
+        with self.assertRaises( Git_object_not_found ):
+            self.first.read( 'no_existe.txt' )
+        with self.assertRaises( Git_object_not_found ):
+            self.first.open( 'no_existe.txt' )
+        with self.assertRaises( Git_object_not_found ):
+            self.first.read( 'no existe' )
+        with self.assertRaises( Git_object_not_found ):
+            self.first.open( 'no existe' )
+        with self.assertRaises( Git_object_not_found ):
+            self.first.read( 'con dos espacios' )
+
+    def test_read_of_a_path_with_spaces( self ):
+        ( self.path + 'con espacio.txt' ).open().write( 'espacio\n' )
+        self.repo.add( self.path + 'con espacio.txt' )
+        self.repo.commit( 'tercero' )
+        self.assertEqual(
+            self.repo.head.commit.read( 'con espacio.txt' ), b'espacio\n' )
+
+    def test_read_of_a_directory_should_fail( self ):
+        with self.assertRaises( IsADirectoryError ):
+            self.first.read( 'dir' )
+
+    def test_open_small_should_not_spawn_process( self ):
+        self.first.read( 'file.txt' )
+        self.repo.objects.info( 'HEAD' )
+        with patch(
+                'chibi_git.cat_file.Popen',
+                wraps=chibi_git.cat_file.Popen ) as popen:
+            with self.first.open( 'file.txt' ) as f:
+                self.assertEqual( f.read(), b'primero\n' )
+        popen.assert_not_called()
+
+    def test_open_big_should_stream_the_content( self ):
+        with patch.object( Commit, 'small_blob_size', 1024 ):
+            with self.first.open( 'dir/big.bin' ) as f:
+                self.assertIsInstance( f.raw, chibi_git.cat_file.Blob_stream )
+                self.assertEqual( f.read( 256 ), bytes( range( 256 ) ) )
+                rest = f.read()
+        self.assertEqual( len( rest ), 256 * 63 )
+
+    def test_close_before_the_end_should_kill_the_process( self ):
+        stream = chibi_git.cat_file.Blob_stream(
+            self.repo, self.repo.objects.info(
+                f'{self.first}:dir/big.bin' ).hash )
+        self.assertEqual( len( stream.read( 10 ) ), 10 )
+        stream.close()
+        self.assertIsNotNone( stream._proc.returncode )
+        self.assertTrue( stream.closed )
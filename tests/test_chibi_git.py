@@ -1,15 +1,21 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import os
 import random
 import datetime
 import unittest
 
 from unittest.mock import patch, Mock
+import chibi_command
+
+import chibi_git.command
 from chibi.file import Chibi_path
 from chibi.file.temp import Chibi_temp_path
 from chibi.madness.string import generate_string
 
-from chibi_git import Git
+from benchmarks.synthetic import build_repo
+from chibi_git import Git, Tracer
+from chibi_git.command import Git as Git_command
 from chibi_git.exception import Git_not_initiate
 from chibi_git.obj import Branch, Commit, Remote_wrapper
 
@@ -30,6 +36,91 @@ class Test_chibi_git_with_history( unittest.TestCase ):
         self.assertEqual( len( commits ), self.amount_commits )
 
 
+class Test_chibi_git_log_with_info( Test_chibi_git_with_history ):
+    def test_log_with_info_should_have_the_same_amount_of_commits( self ):
+        commits = list( self.repo.log( with_info=True ) )
+        self.assertEqual( len( commits ), self.amount_commits )
+        self.assertEqual( commits, list( self.repo.log() ) )
+
+    def test_log_with_info_should_be_the_same_of_get_info( self ):
+        for commit in self.repo.log( with_info=True ):
+            self.assertEqual( commit.info, commit.get_info() )
+
+    def test_log_with_info_should_run_only_one_process( self ):
+        with patch(
+                'chibi_git.command.Popen',
+                wraps=chibi_git.command.Popen ) as popen:
+            commits = list( self.repo.log( with_info=True ) )
+            for commit in commits:
+                self.assertTrue( commit.author )
+                self.assertTrue( commit.message )
+        popen.assert_called_once()
+
+
+class Test_chibi_git_log_stream( Test_chibi_git_with_history ):
+    def test_log_should_yield_before_the_process_end( self ):
+        # la salida de git es mas grande que el buffer del pipe y lo que
+        # se lee de golpe, git sigue escribiendo cuando sale el primero
+        path = Chibi_temp_path()
+        repo = build_repo(
+            path, commits=5000, files=1, branches=0, tags=0, remotes=0 )
+        procs = []
+        popen = chibi_git.command.Popen
+
+        def build_proccess( *args, **kw ):
+            proc = popen( *args, **kw )
+            procs.append( proc )
+            return proc
+
+        with patch( 'chibi_git.command.Popen', side_effect=build_proccess ):
+            log = repo.log()
+            commit = next( log )
+            self.assertIsInstance( commit, Commit )
+            self.assertEqual( len( procs ), 1 )
+            self.assertIsNone( procs[0].poll() )
+            log.close()
+        self.assertIsNotNone( procs[0].poll() )
+
+    def test_close_the_log_should_kill_the_process( self ):
+        procs = []
+        popen = chibi_git.command.Popen
+
+        def build_proccess( *args, **kw ):
+            proc = popen( *args, **kw )
+            procs.append( proc )
+            return proc
+
+        with patch( 'chibi_git.command.Popen', side_effect=build_proccess ):
+            log = self.repo.log( with_info=True )
+            next( log )
+            log.close()
+        self.assertEqual( len( procs ), 1 )
+        self.assertIsNotNone( procs[0].poll() )
+
+    def test_close_the_log_should_close_the_error_file( self ):
+        files = []
+        temporary_file = chibi_git.command.tempfile.TemporaryFile
+
+        def build_file( *args, **kw ):
+            f = temporary_file( *args, **kw )
+            files.append( f )
+            return f
+
+        with patch(
+                'chibi_git.command.tempfile.TemporaryFile',
+                side_effect=build_file ):
+            log = self.repo.log()
+            next( log )
+            log.close()
+        self.assertEqual( len( files ), 1 )
+        self.assertTrue( files[0].closed )
+
+    def test_stream_should_raise_when_git_fail( self ):
+        command = Git_command.rev_list( 'no_existe', src=self.path )
+        with self.assertRaises( chibi_command.Result_error ):
+            list( command.stream() )
+
+
 class Test_chibi_git_not_init( unittest.TestCase ):
     def setUp(self):
         self.path = Chibi_temp_path()
@@ -130,6 +221,121 @@ class Test_chibi_git_after_commit( unittest.TestCase ):
         self.assertTrue( self.repo.status.renamed )
 
 
+class Test_chibi_git_add_many( Test_chibi_git_after_commit ):
+    def test_add_list_should_use_only_one_process( self ):
+        files = [ self.path.temp_file() for i in range( 20 ) ]
+        with patch(
+                'chibi_command.Popen', wraps=chibi_command.Popen ) as popen:
+            self.repo.add( files )
+        popen.assert_called_once()
+        self.assertEqual( len( self.repo.status.added ), 20 )
+
+    def test_add_status_group( self ):
+        for i in range( 5 ):
+            self.path.temp_file()
+        self.repo.add( self.repo.status.untrack )
+        self.assertEqual( len( self.repo.status.added ), 5 )
+        self.assertFalse( self.repo.status.untrack )
+
+    def test_add_status_should_add_all_the_groups( self ):
+        self.file.open().append( generate_string() )
+        self.path.temp_file()
+        self.repo.add( self.repo.status )
+        status = self.repo.status
+        self.assertFalse( status.untrack )
+        self.assertEqual( len( status.added ), 1 )
+
+    def test_add_paths_with_special_characters( self ):
+        files = [ self.path + 'con espacio', self.path + '*' ]
+        for file in files:
+            file.open().append( generate_string() )
+        self.repo.add( files )
+        self.assertEqual( len( self.repo.status.added ), 2 )
+
+    def test_add_path_outside_should_not_add_anything( self ):
+        file = self.path.temp_file()
+        with self.assertRaises( NotImplementedError ):
+            self.repo.add( [ file, Chibi_path( '/tmp/otro' ) ] )
+        self.assertFalse( self.repo.status.added )
+
+    def test_add_empty_list_should_not_run_git( self ):
+        with patch( 'chibi_command.Popen' ) as popen:
+            self.repo.add( [] )
+        popen.assert_not_called()
+
+
+class Test_chibi_git_discovery( Test_chibi_git_after_commit ):
+    def test_should_resolve_the_directories( self ):
+        self.assertEqual( self.repo.git_dir, self.path + '.git' )
+        self.assertEqual( self.repo.common_dir, self.path + '.git' )
+        self.assertEqual( self.repo.work_tree, self.path )
+
+    def test_status_should_use_only_one_process( self ):
+        self.repo.status
+        with patch(
+                'chibi_command.Popen', wraps=chibi_command.Popen ) as popen:
+            self.repo.status
+        popen.assert_called_once()
+
+    def test_is_dirty_should_use_only_one_process( self ):
+        self.repo.status
+        with patch(
+                'chibi_command.Popen', wraps=chibi_command.Popen ) as popen:
+            self.assertFalse( self.repo.is_dirty )
+        popen.assert_called_once()
+
+    def test_should_discover_again_when_the_repo_is_replaced( self ):
+        self.repo.status
+        ( self.path + '.git' ).delete()
+        with self.assertRaises( Git_not_initiate ):
+            self.repo.status
+        self.repo.init()
+        self.assertTrue( self.repo.has_git )
+
+
+class Test_chibi_git_dirty( Test_chibi_git_after_commit ):
+    def test_clean_repo_should_not_be_dirty( self ):
+        self.assertFalse( self.repo.dirty() )
+        self.assertFalse( self.repo.dirty( untracked=True ) )
+
+    def test_untracked_should_count_only_when_is_asked( self ):
+        self.path.temp_file()
+        self.assertFalse( self.repo.dirty() )
+        self.assertTrue( self.repo.dirty( untracked=True ) )
+
+    def test_staged_changes_should_be_dirty( self ):
+        self.repo.add( self.path.temp_file() )
+        self.assertTrue( self.repo.is_dirty )
+
+    def test_deleted_file_should_be_dirty( self ):
+        self.file.delete()
+        self.assertTrue( self.repo.is_dirty )
+
+    def test_touched_file_without_changes_should_not_be_dirty( self ):
+        self.file.open().write( self.file.open().read() )
+        self.assertFalse( self.repo.is_dirty )
+
+    def test_should_stop_in_the_first_change( self ):
+        self.repo.add( self.path.temp_file() )
+        with patch(
+                'chibi_command.Popen', wraps=chibi_command.Popen ) as popen:
+            self.assertTrue( self.repo.is_dirty )
+        popen.assert_called_once()
+
+    def test_repo_without_commits( self ):
+        path = Chibi_temp_path()
+        repo = Git( path )
+        repo.init()
+        self.assertFalse( repo.is_dirty )
+        repo.add( path.temp_file() )
+        self.assertTrue( repo.is_dirty )
+
+    def test_should_not_build_the_status( self ):
+        with patch( 'chibi_git.command.Git.status' ) as status:
+            self.repo.dirty( untracked=True )
+        status.assert_not_called()
+
+
 class Test_chibi_git_head( Test_chibi_git_after_commit ):
     def test_repo_should_have_head( self ):
         self.assertTrue( self.repo.head )
@@ -397,3 +603,67 @@ class Test_pull( Test_chibi_git_with_history ):
     def test_pull_should_work( self ):
         repo = Git( '.' )
         repo.pull()
+
+
+class Test_ref_snapshot( Test_chibi_git_with_history ):
+    def test_repeated_access_should_not_spawn_process( self ):
+        self.repo.head
+        self.repo.branches.index
+        with Tracer() as tracer:
+            for i in range( 10 ):
+                self.assertEqual( self.repo.head.name, 'master' )
+                self.assertIn( 'master', self.repo.branches.local )
+                list( self.repo.tags )
+                list( self.repo.branches.remote )
+        self.assertEqual( tracer.records, [] )
+
+    def test_should_reload_when_the_refs_change( self ):
+        self.assertNotIn( 'new_branch', self.repo.branches.local )
+        self.repo.branches.create( 'new_branch' )
+        self.assertIn( 'new_branch', self.repo.branches.local )
+        self.repo.tags.create( 'new_tag' )
+        self.assertIn( 'new_tag', self.repo.tags )
+        self.repo.branches.local[ 'new_branch' ].checkout()
+        self.assertEqual( self.repo.head.name, 'new_branch' )
+
+    def test_stamp_should_only_stat_the_directories( self ):
+        for i in range( 5 ):
+            self.repo.tags.create( f'tag_{i}' )
+        self.repo.refs.refresh()
+        with patch( 'chibi_git.refs.os.stat', wraps=os.stat ) as stat:
+            self.repo.refs.refresh()
+        paths = [ str( call.args[0] ) for call in stat.call_args_list ]
+        self.assertFalse( [ p for p in paths if 'tag_' in p ] )
+        self.assertTrue( [ p for p in paths if p.endswith( 'tags' ) ] )
+
+    def test_should_see_changes_with_the_same_mtime( self ):
+        commits = list( self.repo.log() )
+        self.repo.branches.create( 'new_branch' )
+        self.assertEqual(
+            self.repo.refs.refs[ 'refs/heads/new_branch' ],
+            str( commits[0] ) )
+        heads = os.path.join( str( self.repo.git_dir ), 'refs', 'heads' )
+        stat = os.stat( heads )
+        Git_command._build_command(
+            'update-ref', 'refs/heads/new_branch', str( commits[-1] ),
+            src=self.path ).run()
+        os.utime( heads, ns=( stat.st_atime_ns, stat.st_mtime_ns ) )
+        self.assertEqual(
+            self.repo.refs.refs[ 'refs/heads/new_branch' ],
+            str( commits[-1] ) )
+
+    def test_version_should_only_change_with_the_refs( self ):
+        version = self.repo.refs.version
+        self.repo.refs.invalidate()
+        self.assertEqual( self.repo.refs.version, version )
+        self.repo.tags.create( 'new_tag' )
+        self.assertNotEqual( self.repo.refs.version, version )
+
+    def test_should_see_the_packed_refs( self ):
+        self.repo.branches.create( 'new_branch' )
+        self.assertIn( 'new_branch', self.repo.branches.local )
+        Git_command._build_command(
+            'pack-refs', '--all', src=self.path ).run()
+        self.assertIn( 'new_branch', self.repo.branches.local )
+        Git_command.branch( '-D', 'new_branch', src=self.path ).run()
+        self.assertNotIn( 'new_branch', self.repo.branches.local )
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import contextvars
+import threading
+import time
+import unittest
+
+from chibi.file.temp import Chibi_temp_path
+from chibi_command import Result_error
+
+from chibi_git import Async_git, Git, Tracer
+from chibi_git.command import Command_cache, Git as Git_command
+
+
+class Test_command_cache( unittest.TestCase ):
+    def test_should_run_only_once( self ):
+        cache = Command_cache()
+        calls = []
+        for i in range( 3 ):
+            result = cache.run( 'key', lambda: calls.append( 1 ) or 'r' )
+        self.assertEqual( result, 'r' )
+        self.assertEqual( len( calls ), 1 )
+
+    def test_ttl_should_expire( self ):
+        cache = Command_cache( ttl=0.01 )
+        calls = []
+        cache.run( 'key', lambda: calls.append( 1 ) )
+        time.sleep( 0.02 )
+        cache.run( 'key', lambda: calls.append( 1 ) )
+        self.assertEqual( len( calls ), 2 )
+
+    def test_errors_should_not_be_saved( self ):
+        cache = Command_cache()
+
+        def fail():
+            raise ValueError( 'fallo' )
+
+        with self.assertRaises( ValueError ):
+            cache.run( 'key', fail )
+        self.assertEqual( cache.run( 'key', lambda: 'ok' ), 'ok' )
+
+    def test_in_flight_should_be_shared( self ):
+        cache = Command_cache()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append( 1 )
+            started.set()
+            release.wait()
+            return 'slow'
+
+        results = []
+        leader = threading.Thread(
+            target=lambda: results.append( cache.run( 'key', slow ) ) )
+        leader.start()
+        started.wait()
+        followers = [
+            threading.Thread(
+                target=lambda: results.append( cache.run( 'key', slow ) ) )
+            for i in range( 4 ) ]
+        for follower in followers:
+            follower.start()
+        time.sleep( 0.01 )
+        release.set()
+        for thread in [ leader, *followers ]:
+            thread.join()
+        self.assertEqual( results, [ 'slow' ] * 5 )
+        self.assertEqual( len( calls ), 1 )
+
+    def test_invalidate_during_flight_should_not_save( self ):
+        cache = Command_cache()
+        cache.run( 'key', lambda: cache.invalidate() or 'old' )
+        self.assertEqual( cache.run( 'key', lambda: 'new' ), 'new' )
+
+
+class Test_chibi_git_snapshot( unittest.TestCase ):
+    def setUp( self ):
+        self.path = Chibi_temp_path()
+        self.repo = Git( self.path )
+        self.repo.init()
+        self.repo.add( self.path.temp_file() )
+        self.repo.commit( 'base' )
+
+    def test_without_snapshot_should_not_cache( self ):
+        with Tracer() as tracer:
+            self.repo.status
+            self.repo.status
+        self.assertEqual( len( tracer.records ), 2 )
+
+    def test_snapshot_should_reuse_the_results( self ):
+        with self.repo.snapshot(), Tracer() as tracer:
+            for i in range( 5 ):
+                self.repo.status
+                self.repo.is_dirty
+                Git( self.path ).status
+        self.assertEqual( len( tracer.records ), 2 )
+
+    def test_mutating_commands_should_invalidate( self ):
+        with self.repo.snapshot():
+            self.assertFalse( self.repo.is_dirty )
+            self.assertFalse( self.repo.status.untrack )
+            file = self.path.temp_file()
+            self.assertFalse( self.repo.status.untrack )
+            self.repo.add( file )
+            self.assertTrue( self.repo.is_dirty )
+            self.assertEqual( self.repo.status.added, [ file ] )
+            self.repo.commit( 'nuevo' )
+            self.assertFalse( self.repo.is_dirty )
+
+    def test_threads_should_share_the_snapshot( self ):
+        barrier = threading.Barrier( 8 )
+
+        def status():
+            barrier.wait()
+            self.repo.status
+
+        with self.repo.snapshot(), Tracer() as tracer:
+            threads = [
+                threading.Thread(
+                    target=contextvars.copy_context().run, args=( status, ) )
+                for i in range( 8 ) ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual( len( tracer.records ), 1 )
+
+    def test_other_threads_should_not_see_the_snapshot( self ):
+        result = []
+
+        def untrack():
+            result.append( self.repo.status.untrack )
+
+        with self.repo.snapshot():
+            self.assertFalse( self.repo.status.untrack )
+            file = self.path.temp_file()
+            thread = threading.Thread( target=untrack )
+            thread.start()
+            thread.join()
+            self.assertFalse( self.repo.status.untrack )
+        self.assertEqual( result, [ [ file ] ] )
+
+    def test_nested_snapshot_should_reuse_the_cache( self ):
+        with self.repo.snapshot( ttl=5 ) as cache:
+            with self.repo.snapshot( ttl=5 ) as nested:
+                self.assertIs( cache, nested )
+            with self.assertRaises( ValueError ):
+                with self.repo.snapshot():
+                    pass
+
+    def test_failed_commands_should_not_be_cached( self ):
+        command = Git_command.rev_parse( 'nothing', src=self.path )
+        with self.repo.snapshot():
+            with self.assertRaises( Result_error ):
+                command.run()
+            self.repo.branches.create( 'nothing' )
+            self.assertTrue( command.run().result )
+
+    def test_ttl( self ):
+        with self.repo.snapshot( ttl=0.01 ), Tracer() as tracer:
+            self.repo.status
+            time.sleep( 0.02 )
+            self.repo.status
+        self.assertEqual( len( tracer.records ), 2 )
+
+    def test_async_mutating_commands_should_invalidate( self ):
+        async_repo = Async_git( self.repo )
+        with self.repo.snapshot():
+            self.assertFalse( self.repo.is_dirty )
+            file = self.path.temp_file()
+            self.assertFalse( self.repo.status.added )
+            asyncio.run( async_repo.run( Git_command._build_command(
+                'add', '-A', src=self.path ) ) )
+            self.assertEqual( self.repo.status.added, [ file ] )
+            self.assertTrue( self.repo.is_dirty )
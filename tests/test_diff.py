@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+
+from chibi.file.temp import Chibi_temp_path
+
+from chibi_git import Git, Tracer
+from chibi_git.command import Git as Git_command
+from chibi_git.diff import parse_diff_tree, parse_patch
+
+
+class Test_parse_diff_tree( unittest.TestCase ):
+    def test_numstat_with_binary_and_rename( self ):
+        fields = [ 'abc', '-\t-\timage.png', '1\t2\t', 'old', 'new' ]
+        header, binary, rename = parse_diff_tree( fields )
+        self.assertEqual( header, 'abc' )
+        self.assertIsNone( binary.added )
+        self.assertEqual( binary.path, 'image.png' )
+        self.assertEqual( ( rename.old_path, rename.path ), ( 'old', 'new' ) )
+        self.assertEqual( ( rename.added, rename.deleted ), ( 1, 2 ) )
+
+    def test_raw_with_copy( self ):
+        fields = [ ':100644 100644 aaa bbb C075', 'old', 'new' ]
+        entry, = parse_diff_tree( fields )
+        self.assertEqual( entry.status, 'C' )
+        self.assertEqual( entry.score, 75 )
+        self.assertEqual( entry.old_path, 'old' )
+
+    def test_patch_should_split_by_file( self ):
+        lines = [
+            'diff --git a/con espacio b/con espacio', '--- a/con espacio',
+            '+++ b/con espacio', '@@ -1 +1 @@', '-a', '+b',
+            'diff --git a/x b/y', 'similarity index 100%',
+            'rename from x', 'rename to y' ]
+        first, second = parse_patch( lines )
+        self.assertEqual( first.path, 'con espacio' )
+        self.assertIsNone( first.old_path )
+        self.assertTrue( first.text.endswith( '+b\n' ) )
+        self.assertEqual( ( second.old_path, second.path ), ( 'x', 'y' ) )
+
+    def test_patch_with_quoted_names( self ):
+        lines = [
+            'diff --git "a/tab\\there" "b/tab\\there"',
+            'new file mode 100644', '--- /dev/null',
+            '+++ "b/tab\\there"', '@@ -0,0 +1 @@', '+a',
+            'diff --git "a/e\\303\\261e" "b/e\\303\\261e"',
+            'old mode 100644', 'new mode 100755' ]
+        first, second = parse_patch( lines )
+        self.assertEqual( first.path, 'tab\there' )
+        self.assertIsNone( first.old_path )
+        self.assertEqual( second.path, 'eñe' )
+        self.assertIsNone( second.old_path )
+
+
+class Test_chibi_git_diff( unittest.TestCase ):
+    def setUp( self ):
+        self.path = Chibi_temp_path()
+        self.repo = Git( self.path )
+        self.repo.init()
+        self.write( 'a.txt', 'uno\n' )
+        self.repo.add( self.path + 'a.txt' )
+        self.repo.commit( 'a' )
+        self.write( 'a.txt', 'uno\ndos\ntres\n' )
+        self.write( 'b.txt', 'b\n' * 10 )
+        self.repo.add( [ self.path + 'a.txt', self.path + 'b.txt' ] )
+        self.repo.commit( 'b' )
+        Git_command._build_command(
+            'mv', 'b.txt', 'c.txt', src=self.path ).run()
+        self.repo.commit( 'c' )
+        self.commits = list( self.repo.log() )
+
+    def write( self, name, content ):
+        with open( self.path + name, 'w' ) as f:
+            f.write( content )
+
+    def test_root_commit_should_have_its_files( self ):
+        root = self.commits[-1]
+        self.assertEqual( [ d.path for d in root.diff() ], [ 'a.txt' ] )
+        self.assertEqual( next( root.diff() ).status, 'A' )
+
+    def test_stats( self ):
+        stats = { s.path: s for s in self.commits[1].stats() }
+        self.assertEqual( stats[ 'a.txt' ].added, 2 )
+        self.assertEqual( stats[ 'a.txt' ].deleted, 0 )
+        self.assertEqual( stats[ 'b.txt' ].added, 10 )
+
+    def test_renames( self ):
+        entry, = self.commits[0].diff()
+        self.assertEqual( entry.status, 'R' )
+        self.assertEqual(
+            ( entry.old_path, entry.path ), ( 'b.txt', 'c.txt' ) )
+        result = self.commits[0].diff( renames=False )
+        self.assertEqual( sorted( d.status for d in result ), [ 'A', 'D' ] )
+
+    def test_range( self ):
+        result = self.repo.diff( self.commits[-1], self.commits[0] )
+        self.assertEqual(
+            sorted( d.path for d in result ), [ 'a.txt', 'c.txt' ] )
+        stats = list( self.repo.stats( self.commits[-1], 'HEAD' ) )
+        self.assertEqual( sum( s.added for s in stats ), 12 )
+
+    def test_patch( self ):
+        patches = list( self.commits[1].patch() )
+        self.assertEqual( [ p.path for p in patches ], [ 'a.txt', 'b.txt' ] )
+        self.assertIn( '+dos', patches[0].text )
+
+    def test_many_should_use_one_process( self ):
+        with Tracer() as tracer:
+            result = list( self.repo.stats_many( self.commits ) )
+        self.assertEqual( len( tracer.records ), 1 )
+        self.assertEqual( [ c for c, s in result ], self.commits )
+        self.assertEqual( result, [
+            ( c, list( c.stats() ) ) for c in self.commits ] )
+        diffs = dict( self.repo.diff_many( self.repo.log() ) )
+        self.assertEqual(
+            diffs[ self.commits[0] ], list( self.commits[0].diff() ) )
+
+    def test_merge_should_diff_against_the_first_parent( self ):
+        Git_command.checkout( '-b', 'feature', src=self.path ).run()
+        self.write( 'd.txt', 'd\n' )
+        self.repo.add( self.path + 'd.txt' )
+        self.repo.commit( 'd' )
+        Git_command.checkout( 'master', src=self.path ).run()
+        self.write( 'e.txt', 'e\n' )
+        self.repo.add( self.path + 'e.txt' )
+        self.repo.commit( 'e' )
+        Git_command._build_command(
+            'merge', '--no-ff', '-m', 'merge', 'feature',
+            src=self.path ).run()
+        merge = self.repo.head.commit
+        self.assertEqual( [ d.path for d in merge.diff() ], [ 'd.txt' ] )
+        self.assertEqual( [ s.path for s in merge.stats() ], [ 'd.txt' ] )
+        self.assertEqual(
+            [ p.path for p in merge.patch() ], [ 'd.txt' ] )
+        diffs = dict( self.repo.diff_many( [ merge ] ) )
+        self.assertEqual( [ d.path for d in diffs[ merge ] ], [ 'd.txt' ] )
+
+    def test_patch_of_a_path_with_spaces( self ):
+        self.write( 'con espacio.txt', 'a\n' )
+        self.repo.add( self.path + 'con espacio.txt' )
+        self.repo.commit( 'espacio' )
+        patch, = self.repo.head.commit.patch()
+        self.assertEqual( patch.path, 'con espacio.txt' )
+        self.assertIsNone( patch.old_path )
+        Git_command._build_command(
+            'mv', 'con espacio.txt', 'otro espacio.txt', src=self.path ).run()
+        self.write( 'otro espacio.txt', 'a\nb\n' )
+        self.repo.add( self.path + 'otro espacio.txt' )
+        self.repo.commit( 'renombrado' )
+        patch, = self.repo.head.commit.patch()
+        self.assertEqual(
+            ( patch.old_path, patch.path ),
+            ( 'con espacio.txt', 'otro espacio.txt' ) )
+        patch, = self.repo.patch( self.commits[0], 'HEAD' )
+        self.assertEqual( patch.path, 'otro espacio.txt' )
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import itertools
+import unittest
+from unittest.mock import patch
+
+from chibi.file.temp import Chibi_temp_path
+
+from chibi_git import Git
+from chibi_git.command import Git as Git_command
+from chibi_git.graph import Commit_graph
+
+
+class Test_commit_graph( unittest.TestCase ):
+    def setUp( self ):
+        self.path = Chibi_temp_path()
+        self.repo = Git( self.path )
+        self.repo.init()
+        self.commit( 'base' )
+        self.base = self.repo.head.commit
+        self.repo.branches.create( 'feature' ).checkout()
+        self.commit( 'feature 1' )
+        self.commit( 'feature 2' )
+        self.feature = self.repo.head.commit
+        self.repo.branches.local[ 'master' ].checkout()
+        self.commit( 'master 1' )
+        self.master = self.repo.head.commit
+        self.git( 'merge', '--no-edit', '-q', 'feature' )
+        self.merge = self.repo.head.commit
+        self.repo.branches.create( 'old', self.base )
+
+    def commit( self, message ):
+        self.repo.add( self.path.temp_file() )
+        self.repo.commit( message )
+
+    def git( self, *args ):
+        command = Git_command._build_command( *args, src=self.path )
+        command.raise_on_fail = False
+        return command.run()
+
+    def test_should_load_all_the_commits( self ):
+        graph = self.repo.graph
+        self.assertEqual( len( graph ), 5 )
+        self.assertIn( self.feature, graph )
+        self.assertIn( 'feature', graph )
+
+    def test_parents_and_children( self ):
+        graph = self.repo.graph
+        self.assertEqual( graph.parents( self.merge ), [
+            self.master, self.feature ] )
+        self.assertEqual( len( graph.children( self.base ) ), 2 )
+        self.assertEqual( self.merge.parents, [ self.master, self.feature ] )
+
+    def test_is_ancestor_should_be_the_same_of_git( self ):
+        graph = self.repo.graph
+        commits = list( self.repo.log() )
+        for a, b in itertools.product( commits, commits ):
+            result = self.git(
+                'merge-base', '--is-ancestor', str( a ), str( b ) )
+            self.assertEqual(
+                graph.is_ancestor( a, b ), bool( result ), ( a, b ) )
+
+    def test_merge_base_should_be_the_same_of_git( self ):
+        graph = self.repo.graph
+        commits = list( self.repo.log() )
+        for a, b in itertools.product( commits, commits ):
+            result = self.git( 'merge-base', '--all', str( a ), str( b ) )
+            expected = sorted( result.result.split() )
+            self.assertEqual(
+                sorted( str( c ) for c in graph.merge_bases( a, b ) ),
+                expected )
+
+    def test_ahead_behind_should_be_the_same_of_git( self ):
+        graph = self.repo.graph
+        result = self.git(
+            'rev-list', '--left-right', '--count',
+            f'{self.master}...{self.feature}' )
+        ahead, behind = map( int, result.result.split() )
+        self.assertEqual(
+            graph.ahead_behind( self.master, self.feature ),
+            ( ahead, behind ) )
+        master = self.repo.branches.local[ 'master' ]
+        self.assertEqual( master.ahead_behind( 'old' ), ( 4, 0 ) )
+
+    def test_topological_order( self ):
+        order = self.repo.graph.topological_order()
+        self.assertEqual( len( order ), 5 )
+        position = { c: i for i, c in enumerate( order ) }
+        for commit in order:
+            for parent in commit.parents:
+                self.assertLess( position[ commit ], position[ parent ] )
+
+    def test_branches_containing( self ):
+        names = sorted( b.name for b in self.feature.branches )
+        self.assertEqual( names, [ 'feature', 'master' ] )
+        names = sorted( b.name for b in self.base.branches )
+        self.assertEqual( names, [ 'feature', 'master', 'old' ] )
+        self.assertTrue(
+            self.repo.branches.local[ 'master' ].contains( self.feature ) )
+        self.assertFalse(
+            self.repo.branches.local[ 'old' ].contains( self.feature ) )
+
+    def test_queries_should_not_spawn_process( self ):
+        graph = self.repo.graph
+        self.repo.branches.index
+        with patch( 'chibi_git.command.Popen' ) as popen, \
+                patch( 'chibi_command.Popen' ) as popen_command:
+            self.assertIs( self.repo.graph, graph )
+            graph.merge_base( self.master, self.feature )
+            self.feature.branches
+        popen.assert_not_called()
+        popen_command.assert_not_called()
+
+    def test_should_rebuild_when_refs_change( self ):
+        graph = self.repo.graph
+        self.commit( 'nuevo' )
+        self.assertIsNot( self.repo.graph, graph )
+        self.assertEqual( len( self.repo.graph ), 6 )
+
+    def test_graph_with_revs( self ):
+        graph = Commit_graph( self.repo, 'old' )
+        self.assertEqual( len( graph ), 1 )
+        with self.assertRaises( KeyError ):
+            graph.is_ancestor( self.base, self.merge )
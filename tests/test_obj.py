@@ -1,7 +1,11 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import datetime
+import gc
+import weakref
 from unittest.mock import patch
-from chibi_git.obj import Commit, Branch
+from chibi_git.command import Git as Git_command
+from chibi_git.obj import Commit, Commit_author, Commit_info, Branch
 from tests.test_chibi_git import (
     Test_chibi_git_after_commit,
     Test_chibi_git_with_history,
@@ -15,6 +19,74 @@ class Test_chibi_commit( Test_chibi_git_after_commit ):
         self.assertTrue( str( commit ) )
 
 
+class Test_commit_identity( Test_chibi_git_with_history ):
+    def test_same_hash_should_be_the_same_object( self ):
+        commits = list( self.repo.log() )
+        again = list( self.repo.log( with_info=True ) )
+        for a, b in zip( commits, again ):
+            self.assertIs( a, b )
+        self.assertIs( Commit( self.repo, str( commits[0] ) ), commits[0] )
+
+    def test_info_should_be_fetched_once( self ):
+        commit = next( self.repo.log() )
+        with patch.object(
+                Commit, 'get_info', wraps=commit.get_info ) as get_info:
+            Commit( self.repo, str( commit ) ).author
+            Commit( self.repo, str( commit ) ).message
+        get_info.assert_called_once()
+
+    def test_commits_should_be_released( self ):
+        commit = next( self.repo.log() )
+        ref = weakref.ref( commit )
+        del commit
+        gc.collect()
+        self.assertIsNone( ref() )
+
+    def test_commit_should_not_have_dict( self ):
+        commit = next( self.repo.log( with_info=True ) )
+        self.assertFalse( hasattr( commit, '__dict__' ) )
+        self.assertFalse( hasattr( commit.info, '__dict__' ) )
+
+
+class Test_commit_info( Test_chibi_git_after_commit ):
+    def test_authors_should_be_shared( self ):
+        a = Commit_author( 'autor', 'a@b.c' )
+        b = Commit_author( ''.join( [ 'au', 'tor' ] ), 'a@b.c' )
+        self.assertIs( a, b )
+
+    def test_unused_authors_should_be_released( self ):
+        author = Commit_author( 'sin uso', 'sin@uso.c' )
+        ref = weakref.ref( author )
+        del author
+        gc.collect()
+        self.assertIsNone( ref() )
+        self.assertNotIn( ( 'sin uso', 'sin@uso.c' ), Commit_author._authors )
+
+    def test_date_should_be_built_from_the_timestamp( self ):
+        info = Commit_info( 'autor', 'a@b.c', 0, -360, 'mensaje' )
+        self.assertEqual( info.date.utcoffset(), datetime.timedelta(
+            hours=-6 ) )
+        self.assertEqual( info.date.timestamp(), 0 )
+
+    def test_deprecated_parse( self ):
+        commit = self.repo.head.commit
+        log = Git_command.log(
+            '-n', 1, '--date=iso8601-strict', str( commit ),
+            src=self.repo.src ).run()
+        raw = self.repo.objects.read( str( commit ) ).content.decode()
+        with self.assertWarns( DeprecationWarning ):
+            info = commit.parse( log.result )
+        self.assertEqual( info.author, commit.info.author )
+        self.assertEqual( info.date, commit.info.date )
+        self.assertEqual( info.message.strip(), commit.info.message.strip() )
+        with self.assertWarns( DeprecationWarning ):
+            self.assertEqual( commit.parse( raw ), commit.info )
+
+    def test_info_should_support_item_access( self ):
+        info = self.repo.head.commit.info
+        self.assertEqual( info[ 'author' ][ 'email' ], info.author.email )
+
+
 class Test_chibi_remote_wrapper( Test_chibi_git_after_commit ):
     def test_without_remotes_should_be_false( self ):
         remote = self.repo.remote
@@ -27,7 +99,7 @@ class Test_branch_obj( Test_chibi_git_with_history ):
         branch = Branch(
             repo=self.repo, name='master', is_remote=False )
         branch.checkout()
-        checkout.assert_called_once_with( 'master', src=self.repo.path )
+        checkout.assert_called_once_with( 'master', src=self.repo.src )
 
     @patch( 'chibi_git.command.Git.checkout' )
     def test_checkout_remote_should_not_try_track( self, checkout ):
@@ -35,4 +107,4 @@ class Test_branch_obj( Test_chibi_git_with_history ):
             repo=self.repo, name='origin/master', is_remote=True )
         branch.checkout()
         checkout.assert_called_once_with(
-            '--track', 'origin/master', src=self.repo.path )
+            '--track', 'origin/master', src=self.repo.src )
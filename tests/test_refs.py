@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from unittest.mock import patch, PropertyMock
+
+from chibi.file.temp import Chibi_temp_path
+
+from chibi_git import Git, Tracer
+from chibi_git.command import Git as Git_command
+from chibi_git.exception import Git_not_initiate
+from chibi_git.refs import Ref_reader, find_git_dir
+from tests.test_chibi_git import Test_chibi_git_with_history
+
+
+class Test_ref_reader( Test_chibi_git_with_history ):
+    def setUp( self ):
+        super().setUp()
+        self.commits = list( self.repo.log() )
+        self.repo.branches.create( 'new_branch', self.commits[-1] )
+        self.repo.tags.create( 'light', self.commits[-1] )
+        self.repo.tags.create( 'annotated', self.commits[-1], message='a' )
+
+    def for_each_ref( self ):
+        refs = Git_command.for_each_ref(
+            '--format=%(objectname) %(refname)', src=self.path ).run()
+        return { name: hash for hash, name in refs.result }
+
+    def test_should_read_the_same_of_for_each_ref( self ):
+        reader = Ref_reader( find_git_dir( self.path ) )
+        refs, peeled, head, symbolic = reader.read()
+        self.assertEqual( refs, self.for_each_ref() )
+        self.assertEqual( head, 'ref: refs/heads/master' )
+
+    def test_should_read_packed_refs_with_peeled( self ):
+        Git_command._build_command(
+            'pack-refs', '--all', '--prune', src=self.path ).run()
+        reader = Ref_reader( find_git_dir( self.path ) )
+        refs, peeled, head, symbolic = reader.read()
+        self.assertEqual( refs, self.for_each_ref() )
+        self.assertEqual(
+            peeled[ 'refs/tags/annotated' ], str( self.commits[-1] ) )
+        self.assertNotEqual(
+            refs[ 'refs/tags/annotated' ], str( self.commits[-1] ) )
+
+    def test_commits_should_not_spawn_process( self ):
+        Git_command._build_command(
+            'pack-refs', '--all', '--prune', src=self.path ).run()
+        self.repo.refs.refresh()
+        self.repo.tags.index
+        self.repo.branches.index
+        with Tracer() as tracer:
+            self.assertEqual( self.repo.head.commit, self.commits[0] )
+            branch = self.repo.branches.local[ 'new_branch' ]
+            self.assertEqual( branch.commit, self.commits[-1] )
+            for tag in self.repo.tags:
+                self.assertEqual( tag.commit, self.commits[-1] )
+        self.assertEqual( tracer.records, [] )
+
+    def test_detached_head( self ):
+        Git_command.checkout(
+            str( self.commits[-1] ), src=self.path ).run()
+        self.assertEqual( self.repo.head.name, 'HEAD' )
+        self.assertEqual( self.repo.head.commit, self.commits[-1] )
+
+    def test_unsupported_layout_should_use_git( self ):
+        with patch(
+                'chibi_git.refs.Ref_reader.is_supported',
+                new_callable=PropertyMock ) as is_supported:
+            is_supported.return_value = False
+            repo = Git( self.path )
+            self.assertEqual( repo.refs.refs, self.for_each_ref() )
+            self.assertEqual( repo.head.name, 'master' )
+            self.assertEqual(
+                str( repo.head.commit ), str( self.commits[0] ) )
+            for tag in repo.tags:
+                self.assertEqual(
+                    str( tag.commit ), str( self.commits[-1] ) )
+
+
+class Test_ref_reader_worktree( Test_chibi_git_with_history ):
+    def setUp( self ):
+        super().setUp()
+        self.worktree_path = Chibi_temp_path()
+        self.worktree_path.delete()
+        Git_command._build_command(
+            'worktree', 'add', '-b', 'other', self.worktree_path,
+            src=self.path ).run()
+        self.worktree = Git( self.worktree_path )
+
+    def test_should_resolve_the_head_of_the_worktree( self ):
+        self.assertEqual( self.worktree.head.name, 'other' )
+        self.assertEqual( self.repo.head.name, 'master' )
+        self.assertEqual(
+            str( self.worktree.head.commit ), str( self.repo.head.commit ) )
+
+    def test_should_share_the_refs( self ):
+        self.assertIn( 'other', self.repo.branches.local )
+        self.assertIn( 'master', self.worktree.branches.local )
+
+    def test_should_resolve_the_common_dir( self ):
+        self.assertEqual( self.worktree.common_dir, self.repo.git_dir )
+        self.assertNotEqual( self.worktree.git_dir, self.repo.git_dir )
+        self.assertEqual( self.worktree.work_tree, self.worktree_path )
+
+    def test_commands_should_use_the_resolved_dirs( self ):
+        command = Git_command.status( src=self.worktree.src )
+        arguments = list( map( str, command.build_tuple() ) )
+        self.assertIn( f'--git-dir={self.worktree.git_dir}', arguments )
+        self.assertIn(
+            f'--work-tree={self.worktree.work_tree}', arguments )
+        file = self.worktree_path.temp_file()
+        self.assertEqual( self.worktree.status.untrack, [ file ] )
+        self.assertFalse( self.repo.status.untrack )
+
+    def test_plain_paths_should_not_use_the_dirs_of_other_repo( self ):
+        self.worktree.git_dir
+        command = Git_command.status( src=self.worktree_path )
+        arguments = list( map( str, command.build_tuple() ) )
+        self.assertIn( f'--git-dir={self.worktree_path}/.git', arguments )
+
+
+class Test_discovery( Test_chibi_git_with_history ):
+    def test_subdirectory( self ):
+        sub = self.path + 'sub'
+        sub.mkdir()
+        repo = Git( sub )
+        self.assertEqual( repo.git_dir, self.repo.git_dir )
+        self.assertEqual( repo.work_tree, self.path )
+        self.assertEqual(
+            str( repo.head.commit ), str( self.repo.head.commit ) )
+
+    def test_bare( self ):
+        path = Chibi_temp_path()
+        Git_command._build_command(
+            'clone', '--bare', '-q', self.path, path + 'bare.git' ).run()
+        repo = Git( path + 'bare.git' )
+        self.assertEqual( repo.git_dir, path + 'bare.git' )
+        self.assertIsNone( repo.work_tree )
+        self.assertEqual(
+            str( repo.head.commit ), str( self.repo.head.commit ) )
+        self.assertEqual(
+            [ str( c ) for c in repo.log() ],
+            [ str( c ) for c in self.repo.log() ] )
+
+    def test_not_a_repo( self ):
+        with self.assertRaises( Git_not_initiate ):
+            Git( Chibi_temp_path() ).git_dir
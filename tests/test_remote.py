@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import patch
+
+from chibi.file.temp import Chibi_temp_path
+
+from chibi_git import Git
+from chibi_git.command import Git as Git_command
+from chibi_git.obj import Remote
+
+
+class Test_remote_wrapper( unittest.TestCase ):
+    def setUp( self ):
+        self.path = Chibi_temp_path()
+        self.repo = Git( self.path )
+        self.repo.init()
+
+    def git( self, *args ):
+        Git_command._build_command( *args, src=self.path ).run()
+
+    def test_access_should_not_spawn_process( self ):
+        with patch( 'chibi_command.Popen' ) as popen:
+            self.repo.remote
+        popen.assert_not_called()
+
+    def test_without_remotes( self ):
+        self.assertFalse( self.repo.remote )
+        self.assertEqual( list( self.repo.remote ), [] )
+
+    def test_should_have_urls_and_refspecs( self ):
+        self.repo.remote.append( 'origin', 'some_url' )
+        self.git( 'remote', 'set-url', '--add', '--push', 'origin', 'push_1' )
+        self.git( 'remote', 'set-url', '--add', '--push', 'origin', 'push_2' )
+        self.repo.remote.append( 'my.mirror', 'mirror_url' )
+        origin = self.repo.remote.origin
+        self.assertIsInstance( origin, Remote )
+        self.assertEqual( origin, 'some_url' )
+        self.assertEqual( origin.url, 'some_url' )
+        self.assertEqual( origin.push_urls, [ 'push_1', 'push_2' ] )
+        self.assertEqual(
+            origin.fetch, [ '+refs/heads/*:refs/remotes/origin/*' ] )
+        mirror = self.repo.remote[ 'my.mirror' ]
+        self.assertEqual( mirror.push_urls, [ 'mirror_url' ] )
+        self.assertEqual(
+            sorted( r.name for r in self.repo.remote ),
+            [ 'my.mirror', 'origin' ] )
+
+    def test_should_be_cached_until_the_config_change( self ):
+        self.repo.remote.append( 'origin', 'some_url' )
+        self.assertTrue( self.repo.remote )
+        with patch( 'chibi_command.Popen' ) as popen:
+            for i in range( 10 ):
+                self.assertEqual( self.repo.remote.origin, 'some_url' )
+        popen.assert_not_called()
+        self.git( 'remote', 'set-url', 'origin', 'other_url' )
+        self.assertEqual( self.repo.remote.origin, 'other_url' )
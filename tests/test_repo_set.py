@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import time
+import unittest
+
+from chibi.file.temp import Chibi_temp_path
+
+from chibi_git import Git, Repo_set
+from chibi_git.command import (
+    Git as Git_command, Line_result, deadline, watchdog )
+from chibi_git.exception import Git_not_initiate, Git_timeout
+
+
+class Test_repo_set( unittest.TestCase ):
+    def setUp( self ):
+        self.repos = []
+        self.paths = [ Chibi_temp_path() for i in range( 6 ) ]
+        for path in self.paths[:5]:
+            repo = Git( path )
+            repo.init()
+            self.repos.append( repo )
+        self.paths[2].temp_file()
+        self.repo_set = Repo_set( self.repos, max_workers=3 )
+
+    def test_status_should_return_a_result_per_repo( self ):
+        results = self.repo_set.status()
+        self.assertEqual( len( results ), 5 )
+        for repo, result in zip( self.repos, results ):
+            self.assertIs( result.repo, repo )
+            self.assertTrue( result.ok )
+        self.assertEqual( len( results[2].result.untrack ), 1 )
+        self.assertFalse( results[0].result.untrack )
+
+    def test_errors_should_not_stop_the_batch( self ):
+        repo_set = Repo_set( [ *self.repos, self.paths[5] ] )
+        results = repo_set.status()
+        self.assertTrue( all( r.ok for r in results[:-1] ) )
+        self.assertFalse( results[-1].ok )
+        self.assertIsInstance( results[-1].error, Git_not_initiate )
+
+    def test_progress( self ):
+        progress = []
+        repo_set = Repo_set(
+            self.repos, on_progress=lambda *a: progress.append( a[:2] ) )
+        repo_set.is_dirty()
+        self.assertEqual( progress, [ ( i, 5 ) for i in range( 1, 6 ) ] )
+
+    def test_run_with_callable( self ):
+        results = self.repo_set.run( lambda repo, x: ( repo, x ), 1 )
+        for repo, result in zip( self.repos, results ):
+            self.assertEqual( result.result, ( repo, 1 ) )
+
+    def test_timeout_should_kill_the_command( self ):
+        def slow( repo ):
+            Git_command._build_command(
+                '-c', 'alias.slow=!sleep 5', 'slow', src=repo.path ).run()
+
+        repo_set = Repo_set( self.repos[:2], timeout=0.2 )
+        start = time.monotonic()
+        results = repo_set.run( slow )
+        self.assertLess( time.monotonic() - start, 3 )
+        for result in results:
+            self.assertIsInstance( result.error, Git_timeout )
+
+
+class Test_deadline( unittest.TestCase ):
+    def test_deadline_should_not_affect_fast_commands( self ):
+        path = Chibi_temp_path()
+        repo = Git( path )
+        repo.init()
+        with deadline( 5 ):
+            self.assertFalse( repo.is_dirty )
+
+    def test_deadline_should_kill_the_streams( self ):
+        path = Chibi_temp_path()
+        repo = Git( path )
+        repo.init()
+        command = Git_command._build_command(
+            '-c', 'alias.slow=!sleep 5', 'slow', src=path,
+            result_class=Line_result )
+        start = time.monotonic()
+        with deadline( 0.2 ):
+            with self.assertRaises( Git_timeout ):
+                list( command.stream() )
+        self.assertLess( time.monotonic() - start, 3 )
+
+    def test_watchdog( self ):
+        killed = threading.Event()
+        timer = watchdog( killed.set )
+        self.assertFalse( timer.active )
+        with deadline( 0.05 ):
+            timer = watchdog( killed.set )
+        self.assertTrue( killed.wait( 2 ) )
+        self.assertTrue( timer.expired )
+        killed.clear()
+        with deadline( 5 ):
+            timer = watchdog( killed.set )
+        timer.cancel()
+        self.assertFalse( timer.expired )
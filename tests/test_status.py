@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+
+from chibi.madness.string import generate_string
+
+from chibi_git.command import Status_result
+from tests.test_chibi_git import Test_chibi_git_after_commit
+
+
+class Test_status_result( unittest.TestCase ):
+    def parse( self, *records ):
+        return Status_result(
+            '\0'.join( records ) + '\0', '', 0, command=None ).result
+
+    def test_should_separate_index_and_worktree( self ):
+        result = self.parse(
+            '1 M. N... 100644 100644 100644 aaa bbb index',
+            '1 .M N... 100644 100644 100644 aaa aaa worktree',
+            '1 AM N... 000000 100644 100644 000 bbb both',
+        )
+        self.assertEqual( result.index, { 'index': 'M', 'both': 'A' } )
+        self.assertEqual(
+            result.worktree, { 'worktree': 'M', 'both': 'M' } )
+        self.assertEqual( result.modified, [ 'index', 'worktree', 'both' ] )
+        self.assertEqual( result.added, [ 'both' ] )
+
+    def test_should_parse_paths_with_spaces_and_new_lines( self ):
+        result = self.parse(
+            '1 .D N... 100644 100644 000000 aaa aaa con espacio',
+            '? salto\nde linea',
+        )
+        self.assertEqual( result.deleted, [ 'con espacio' ] )
+        self.assertEqual( result.untrack, [ 'salto\nde linea' ] )
+
+    def test_should_parse_renamed_with_the_source( self ):
+        result = self.parse(
+            '2 R. N... 100644 100644 100644 aaa aaa R100 nuevo nombre',
+            'viejo nombre',
+            '? otro',
+        )
+        self.assertEqual( result.renamed, [ 'nuevo nombre' ] )
+        self.assertEqual(
+            result.renamed_from, { 'nuevo nombre': 'viejo nombre' } )
+        self.assertEqual( result.untrack, [ 'otro' ] )
+
+    def test_should_parse_unmerged( self ):
+        result = self.parse(
+            'u UU N... 100644 100644 100644 100644 a b c conflicto' )
+        self.assertEqual( result.update_no_merge, [ 'conflicto' ] )
+        self.assertFalse( result.modified )
+
+    def test_should_parse_the_branch_headers( self ):
+        result = self.parse(
+            '# branch.oid 1234', '# branch.head master',
+            '# branch.upstream origin/master', '# branch.ab +2 -3' )
+        self.assertEqual( result.branch.oid, '1234' )
+        self.assertEqual( result.branch.head, 'master' )
+        self.assertEqual( result.branch.upstream, 'origin/master' )
+        self.assertEqual( result.branch.ahead, 2 )
+        self.assertEqual( result.branch.behind, 3 )
+
+    def test_initial_and_detached( self ):
+        result = self.parse(
+            '# branch.oid (initial)', '# branch.head (detached)' )
+        self.assertIsNone( result.branch.oid )
+        self.assertIsNone( result.branch.head )
+
+
+class Test_status_porcelain( Test_chibi_git_after_commit ):
+    def test_worktree_change_should_not_be_in_index( self ):
+        self.file.open().append( generate_string() )
+        status = self.repo.status
+        self.assertEqual( status.worktree, { self.file: 'M' } )
+        self.assertFalse( status.index )
+        self.repo.add( self.file )
+        status = self.repo.status
+        self.assertEqual( status.index, { self.file: 'M' } )
+        self.assertFalse( status.worktree )
+
+    def test_files_with_new_lines( self ):
+        file = self.path + 'salto\nde linea'
+        file.open().append( generate_string() )
+        self.assertEqual( self.repo.status.untrack, [ file ] )
+
+    def test_renamed_should_have_the_source( self ):
+        new_file = self.file.dir_name + 'nuevo nombre'
+        self.file.move( new_file )
+        self.repo.add( [ self.file, new_file ] )
+        status = self.repo.status
+        self.assertEqual( status.renamed, [ new_file ] )
+        self.assertEqual( status.renamed_from, { new_file: self.file } )
+
+    def test_branch_header( self ):
+        status = self.repo.status
+        self.assertEqual( status.branch.head, 'master' )
+        self.assertEqual( status.branch.oid, str( self.repo.head.commit ) )
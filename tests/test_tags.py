@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import patch
+
+from chibi.file.temp import Chibi_temp_path
+
+from chibi_git import Git
+from chibi_git.tags import version_key
+
+
+class Test_tag_index( unittest.TestCase ):
+    def setUp( self ):
+        self.path = Chibi_temp_path()
+        self.repo = Git( self.path )
+        self.repo.init()
+        for i in range( 3 ):
+            self.repo.add( self.path.temp_file() )
+            self.repo.commit( f"commit {i}" )
+        self.commits = list( self.repo.log() )
+        self.repo.tags.create( 'v1.9', self.commits[-1] )
+        self.repo.tags.create( 'v1.10', self.commits[0], message='release' )
+        self.repo.tags.create( 'v1.2', self.commits[1] )
+
+    def test_should_have_the_peeled_commit( self ):
+        tags = self.repo.tags
+        self.assertEqual( tags[ 'v1.9' ].commit, self.commits[-1] )
+        self.assertEqual( tags[ 'v1.10' ].commit, self.commits[0] )
+        self.assertEqual( tags[ 'v1.10' ].peeled, str( self.commits[0] ) )
+        self.assertNotEqual( tags[ 'v1.10' ].hash, str( self.commits[0] ) )
+
+    def test_should_have_the_annotation( self ):
+        tags = self.repo.tags
+        self.assertTrue( tags[ 'v1.10' ].is_annotated )
+        self.assertEqual( tags[ 'v1.10' ].message.strip(), 'release' )
+        self.assertFalse( tags[ 'v1.9' ].is_annotated )
+        self.assertIsNone( tags[ 'v1.9' ].message )
+        self.assertEqual(
+            tags[ 'v1.9' ].timestamp, self.commits[-1].info.timestamp )
+        self.assertIsNotNone( tags[ 'v1.10' ].date )
+
+    def test_lookup_should_not_spawn_after_the_index( self ):
+        self.repo.tags.index
+        with patch( 'chibi_command.Popen' ) as popen:
+            tags = self.repo.tags
+            self.assertIn( 'v1.2', tags )
+            self.assertNotIn( 'v2.0', tags )
+            self.assertEqual( len( tags ), 3 )
+            for tag in tags:
+                tag.commit
+            with self.assertRaises( KeyError ):
+                tags[ 'v2.0' ]
+        popen.assert_not_called()
+
+    def test_index_should_reload_when_the_tags_change( self ):
+        self.assertEqual( len( self.repo.tags ), 3 )
+        self.repo.tags.create( 'v2.0' )
+        self.assertIn( 'v2.0', self.repo.tags )
+
+    def test_sorted_by_version( self ):
+        tags = self.repo.tags.sorted( by='version' )
+        self.assertEqual(
+            [ t.name for t in tags ], [ 'v1.2', 'v1.9', 'v1.10' ] )
+        tags = self.repo.tags.sorted( by='version', reverse=True )
+        self.assertEqual( tags[0].name, 'v1.10' )
+
+    def test_sorted_by_date( self ):
+        tags = self.repo.tags.sorted( by='date' )
+        timestamps = [ t.timestamp for t in tags ]
+        self.assertEqual( timestamps, sorted( timestamps ) )
+        with self.assertRaises( NotImplementedError ):
+            self.repo.tags.sorted( by='size' )
+
+    def test_version_key( self ):
+        self.assertLess( version_key( 'v1.9' ), version_key( 'v1.10' ) )
+        self.assertLess( version_key( '1.0.0' ), version_key( '1.0.0-rc1' ) )
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from chibi.file.temp import Chibi_temp_path
+
+from chibi_git import Async_git, Git, Tracer, trace
+from chibi_git.command import Git as Git_command
+
+
+class Test_tracer( unittest.TestCase ):
+    def setUp( self ):
+        self.path = Chibi_temp_path()
+        self.repo = Git( self.path )
+        self.repo.init()
+        for i in range( 3 ):
+            self.repo.add( self.path.temp_file() )
+            self.repo.commit( f"commit {i}" )
+
+    def test_should_record_the_process( self ):
+        with Tracer() as tracer:
+            self.repo.is_dirty
+        record = tracer.records[0]
+        self.assertEqual( record.operation, 'diff' )
+        self.assertEqual( record.api, 'Git.is_dirty' )
+        self.assertEqual( record.kind, 'run' )
+        self.assertEqual( record.cwd, str( self.path ) )
+        self.assertEqual( record.return_code, 0 )
+        self.assertIn( '--quiet', record.argv )
+        self.assertGreaterEqual( record.time, 0 )
+
+    def test_should_count_the_bytes( self ):
+        command = Git_command._build_command(
+            'cat-file', '-t', 'nothing', src=self.path )
+        command.raise_on_fail = False
+        with Tracer() as tracer:
+            command.run()
+            list( self.repo.log() )
+        failed, log = tracer.records
+        self.assertNotEqual( failed.return_code, 0 )
+        self.assertGreater( failed.stderr_bytes, 0 )
+        self.assertEqual( log.kind, 'stream' )
+        self.assertEqual( log.api, 'Git.log' )
+        self.assertEqual( log.stdout_bytes, 41 * 3 )
+
+    def test_commit_info_should_record_the_cat_file_spawn( self ):
+        repo = Git( self.path )
+        with Tracer() as tracer:
+            for commit in repo.log():
+                commit.info
+        stats = tracer.stats( by='kind' )
+        self.assertEqual( stats[ 'cat-file' ].count, 1 )
+        self.assertEqual( tracer.stats()[ 'Commit.info' ].count, 1 )
+
+    def test_stats_should_find_n_plus_1( self ):
+        with Tracer() as tracer:
+            for i in range( 5 ):
+                self.repo.status
+        stats = tracer.stats()
+        self.assertEqual( stats[ 'Git.status' ].count, 5 )
+        self.assertEqual(
+            tracer.stats( by='operation' )[ 'status' ].count, 5 )
+
+    def test_should_stop_recording_on_exit( self ):
+        with Tracer() as tracer:
+            self.repo.status
+        self.repo.status
+        self.assertEqual( len( tracer.records ), 1 )
+
+    def test_async_should_be_recorded( self ):
+        async_repo = Async_git( self.repo )
+        with Tracer() as tracer:
+            asyncio.run( async_repo.status() )
+        record, = tracer.records
+        self.assertEqual( record.kind, 'async' )
+        self.assertEqual( record.api, 'Async_git.status' )
+
+    def test_hooks_errors_should_not_break_the_command( self ):
+        def hook( record ):
+            raise ValueError( 'hook roto' )
+
+        trace.add_hook( hook )
+        try:
+            with self.assertLogs( 'chibi_git.trace' ):
+                self.assertFalse( self.repo.is_dirty )
+        finally:
+            trace.remove_hook( hook )
+
+
+class Test_qualname( unittest.TestCase ):
+    def frame( self, name, f_locals=None ):
+        # sin co_qualname como en python 3.10
+        return SimpleNamespace(
+            f_code=SimpleNamespace( co_name=name ), f_locals=f_locals or {} )
+
+    def test_without_qualname_should_use_the_class_of_self( self ):
+        frame = self.frame(
+            'status', { 'self': Git.__new__( Git ) } )
+        self.assertEqual( trace._qualname( frame ), 'Git.status' )
+
+    def test_without_qualname_should_use_cls( self ):
+        frame = self.frame( 'clone', { 'cls': Git } )
+        self.assertEqual( trace._qualname( frame ), 'Git.clone' )
+
+    def test_without_qualname_in_a_function( self ):
+        frame = self.frame( 'parse_blame' )
+        self.assertEqual( trace._qualname( frame ), 'parse_blame' )
+
+
+class Test_operation( unittest.TestCase ):
+    def test_should_skip_the_global_options( self ):
+        self.assertEqual( trace.operation( [ 'git', 'status' ] ), 'status' )
+        self.assertEqual(
+            trace.operation( [ 'git', '-C', '/repo', 'rev-parse' ] ),
+            'rev-parse' )
+        self.assertEqual(
+            trace.operation(
+                [ 'git', '--git-dir=/repo/.git', '-c', 'a.b=c', 'log' ] ),
+            'log' )
+        self.assertIsNone( trace.operation( [ 'git', '-C' ] ) )
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import patch
+
+from chibi.file.temp import Chibi_temp_path
+
+from chibi_git import Git
+from chibi_git.command import Git as Git_command
+from chibi_git.tree import Tree, parse_ls_tree
+
+
+class Test_parse_ls_tree( unittest.TestCase ):
+    def test_blob( self ):
+        record = '100644 blob ' + 'a' * 40 + '      12\tdir/file.txt'
+        self.assertEqual(
+            parse_ls_tree( record ),
+            ( '100644', 'blob', 'a' * 40, 12, 'dir/file.txt' ) )
+
+    def test_tree_has_no_size( self ):
+        record = '040000 tree ' + 'b' * 40 + '       -\tdir con espacio'
+        self.assertEqual(
+            parse_ls_tree( record ),
+            ( '040000', 'tree', 'b' * 40, None, 'dir con espacio' ) )
+
+
+class Test_commit_tree( unittest.TestCase ):
+    def setUp( self ):
+        self.path = Chibi_temp_path()
+        self.repo = Git( self.path )
+        self.repo.init()
+        ( self.path + 'dir' ).mkdir()
+        ( self.path + 'dir' + 'sub' ).mkdir()
+        files = [
+            self.path + 'root.txt',
+            self.path + 'dir' + 'a.txt',
+            self.path + 'dir' + 'sub' + 'b.txt',
+        ]
+        for f in files:
+            f.open().write( f'{f.base_name}\n' )
+        self.repo.add( files )
+        self.repo.commit( 'primero' )
+        self.commit = self.repo.head.commit
+
+    def test_root_should_have_the_entries( self ):
+        tree = self.commit.tree
+        self.assertIsInstance( tree, Tree )
+        self.assertEqual( sorted( tree.entries ), [ 'dir', 'root.txt' ] )
+        entry = tree[ 'root.txt' ]
+        self.assertEqual( entry.type, 'blob' )
+        self.assertEqual( entry.mode, '100644' )
+        self.assertEqual( entry.size, len( 'root.txt\n' ) )
+        self.assertEqual( entry.read(), b'root.txt\n' )
+        self.assertIsNone( tree[ 'dir' ].size )
+
+    def test_lookup_of_nested_path( self ):
+        entry = self.commit.tree[ 'dir/sub/b.txt' ]
+        self.assertEqual( entry.path, 'dir/sub/b.txt' )
+        self.assertEqual( entry.name, 'b.txt' )
+        self.assertIn( 'dir/a.txt', self.commit.tree )
+        self.assertNotIn( 'dir/no_existe.txt', self.commit.tree )
+        self.assertNotIn( 'root.txt/nada', self.commit.tree )
+        with self.assertRaises( KeyError ):
+            self.commit.tree[ 'no_existe' ]
+
+    def test_loaded_directories_should_be_cached( self ):
+        self.commit.tree[ 'dir/sub/b.txt' ]
+        with patch.object( Git_command, 'ls_tree' ) as ls_tree:
+            self.assertIs( self.repo.head.commit.tree, self.commit.tree )
+            self.commit.tree[ 'dir/sub/b.txt' ]
+            self.commit.tree[ 'dir/a.txt' ]
+        ls_tree.assert_not_called()
+
+    def test_walk_should_use_one_process( self ):
+        original = Git_command.ls_tree
+        with patch.object(
+                Git_command, 'ls_tree', side_effect=original ) as ls_tree:
+            paths = [ entry.path for entry in self.commit.tree.walk() ]
+            self.commit.tree[ 'dir/sub/b.txt' ]
+        self.assertEqual( ls_tree.call_count, 1 )
+        self.assertEqual(
+            sorted( paths ),
+            [ 'dir', 'dir/a.txt', 'dir/sub', 'dir/sub/b.txt', 'root.txt' ] )
+
+    def test_read_of_a_directory_should_fail( self ):
+        with self.assertRaises( IsADirectoryError ):
+            self.commit.tree[ 'dir' ].read()
+        with self.assertRaises( NotADirectoryError ):
+            self.commit.tree[ 'root.txt' ].tree